@@ -0,0 +1,58 @@
+"""
+Per-apply cost of a theme: plain rcParams.update versus the compiled delta apply.
+
+    python benchmarks/bench_theme_apply.py [--number 2000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib as mpl
+
+import pressplot
+
+
+def apply_with_update(theme):
+    """
+    The pre-compilation Theme.apply: validate and write every key on each call.
+    """
+    mpl.rcParams.update(theme.rc_params)
+    if theme.palette:
+        mpl.rcParams['axes.prop_cycle'] = mpl.cycler(color=theme.palette)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--theme", default="clean_modern")
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    theme = pressplot.get_theme(args.theme)
+    theme.apply()  # warm up: fonts, colormaps, compilation
+
+    results = {
+        "rcParams.update": lambda: apply_with_update(theme),
+        "Theme.apply (compiled)": theme.apply,
+    }
+    for label, func in results.items():
+        best = min(timeit.repeat(func, number=args.number, repeat=5)) / args.number
+        print(f"{label:<24} {best * 1e6:8.1f} us/apply")
+
+    # Switching back from the defaults writes every key.
+    def switch():
+        mpl.rcdefaults()
+        theme.apply()
+
+    def reset():
+        mpl.rcdefaults()
+
+    reset_cost = min(timeit.repeat(reset, number=200, repeat=3)) / 200
+    best = min(timeit.repeat(switch, number=200, repeat=3)) / 200
+    print(f"{'apply after rcdefaults':<24} {(best - reset_cost) * 1e6:8.1f} us/apply")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Overhead of switching themes per chart: matplotlib's rc_context versus pressplot.theme_context.
+
+    python benchmarks/bench_theme_context.py [--number 2000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib as mpl
+
+import pressplot
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--theme", default="clean_modern")
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    theme = pressplot.get_theme(args.theme)
+    theme.apply()  # warm up: fonts, colormaps, compilation
+    mpl.rcdefaults()
+
+    def with_rc_context():
+        with mpl.rc_context():
+            theme.apply()
+
+    context = pressplot.theme_context(theme)
+
+    def with_theme_context():
+        with context:
+            pass
+
+    for label, func in (("rc_context + apply", with_rc_context), ("theme_context", with_theme_context)):
+        best = min(timeit.repeat(func, number=args.number, repeat=5)) / args.number
+        print(f"{label:<20} {best * 1e6:8.1f} us/chart")
+
+
+if __name__ == "__main__":
+    main()
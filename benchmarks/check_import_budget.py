@@ -0,0 +1,67 @@
+"""
+Check that `import pressplot` stays cheap.
+
+Runs the import in fresh interpreters, takes the best wall time and fails
+(non-zero exit) when it exceeds the budget or when a heavy dependency is
+imported eagerly.
+
+    python benchmarks/check_import_budget.py [--budget-ms 30] [--repeat 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be loaded on first use.
+HEAVY_MODULES = ("matplotlib", "matplotlib.pyplot", "matplotlib.font_manager", "numpy", "PIL")
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import pressplot
+pressplot.list_themes()
+pressplot.themes.CLEAN_MODERN_PALETTE
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed * 1000)
+print(",".join(heavy))
+"""
+
+
+def measure(repeat=5):
+    """
+    Return (best import time in ms, heavy modules loaded) over *repeat* fresh interpreters.
+    """
+    code = _PROBE.format(heavy=HEAVY_MODULES)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+    best = float("inf")
+    heavy = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                             capture_output=True, text=True).stdout.splitlines()
+        best = min(best, float(out[0]))
+        heavy = [m for m in out[1].split(",") if m] if len(out) > 1 else []
+    return best, heavy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=30.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    elapsed, heavy = measure(args.repeat)
+    print(f"import pressplot: {elapsed:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if heavy:
+        print(f"FAIL: eagerly imported {', '.join(heavy)}")
+        return 1
+    if elapsed > args.budget_ms:
+        print("FAIL: import time over budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
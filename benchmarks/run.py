@@ -0,0 +1,183 @@
+"""
+Run the benchmark suite without asv.
+
+Every ``time_*`` benchmark is timed (best of ``repeat`` rounds of ``number``
+calls) and run once more under tracemalloc to record its peak memory.
+``timeraw_*`` benchmarks run in fresh interpreters and ``track_*`` values are
+recorded as returned. Results can be saved as JSON and compared with an
+earlier run to flag regressions.
+
+    python benchmarks/run.py -k Export --output results.json
+    python benchmarks/run.py --compare results.json --threshold 1.25
+"""
+import argparse
+import fnmatch
+import inspect
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import suite  # noqa: E402
+
+
+def _param_sets(cls):
+    params = getattr(cls, "params", None)
+    if params is None:
+        return [()]
+    if params and all(isinstance(p, (list, tuple)) for p in params):
+        return list(itertools.product(*params))
+    return [(p,) for p in params]
+
+
+def _label(cls, method, args):
+    name = f"{cls.__name__}.{method}"
+    return f"{name}({', '.join(map(repr, args))})" if args else name
+
+
+def _reset(bench, args):
+    if hasattr(bench, "teardown"):
+        bench.teardown(*args)
+    if hasattr(bench, "setup"):
+        bench.setup(*args)
+
+
+def _time_call(bench, func, args, number, repeat):
+    """
+    Best per-call time over *repeat* rounds; setup runs again before each round.
+    """
+    best = float("inf")
+    for i in range(repeat):
+        if i:
+            _reset(bench, args)
+        start = time.perf_counter()
+        for _ in range(number):
+            func(*args)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def _peak_memory(func, args):
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _timeraw(code, repeat):
+    wrapped = f"import time\n_start = time.perf_counter()\n{code}\nprint(time.perf_counter() - _start)"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.path.dirname(BENCH_DIR),
+                                                                    os.environ.get("PYTHONPATH")])))
+    runs = [float(subprocess.run([sys.executable, "-c", wrapped], check=True, capture_output=True,
+                                 text=True, env=env).stdout) for _ in range(repeat)]
+    return min(runs)
+
+
+def run(pattern="*", quick=False):
+    """
+    Run the benchmarks whose label matches *pattern* and return their results.
+    """
+    results = {}
+    for _, cls in inspect.getmembers(suite, inspect.isclass):
+        if cls.__module__ != suite.__name__:
+            continue
+        methods = [m for m in dir(cls) if m.startswith(("time_", "timeraw_", "track_"))]
+        for args in _param_sets(cls):
+            for method in methods:
+                label = _label(cls, method, args)
+                if not fnmatch.fnmatch(label, f"*{pattern}*"):
+                    continue
+                bench = cls()
+                try:
+                    if hasattr(bench, "setup"):
+                        bench.setup(*args)
+                except NotImplementedError as e:
+                    print(f"{label:<72} skipped ({e})")
+                    continue
+                func = getattr(bench, method)
+                repeat = 1 if quick else getattr(cls, "repeat", 5)
+                try:
+                    if method.startswith("timeraw_"):
+                        entry = {"time": _timeraw(func(*args), repeat)}
+                    elif method.startswith("track_"):
+                        entry = {"value": func(*args), "unit": getattr(func, "unit", "")}
+                    else:
+                        number = getattr(cls, "number", 1 if quick else 5)
+                        entry = {"time": _time_call(bench, func, args, number, repeat)}
+                        _reset(bench, args)
+                        entry["peakmem"] = _peak_memory(func, args)
+                finally:
+                    if hasattr(bench, "teardown"):
+                        bench.teardown(*args)
+                results[label] = entry
+                print(f"{label:<72} {_format(entry)}")
+    return results
+
+
+def _format(entry):
+    if "value" in entry:
+        return f"{entry['value']:.1f} {entry['unit']}"
+    text = f"{entry['time'] * 1e3:10.3f} ms"
+    if "peakmem" in entry:
+        text += f"  {entry['peakmem'] / 2 ** 20:8.2f} MiB peak"
+    return text
+
+
+def compare(results, baseline, threshold):
+    """
+    Return labels whose time or peak memory grew by more than *threshold* x.
+    """
+    regressions = []
+    for label, entry in results.items():
+        old = baseline.get(label)
+        if not old:
+            continue
+        for key in ("time", "peakmem", "value"):
+            if key in entry and old.get(key) and entry[key] > old[key] * threshold:
+                regressions.append(f"{label} {key}: {old[key]:.4g} -> {entry[key]:.4g}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-k", "--pattern", default="*", help="Only run benchmarks whose label matches.")
+    parser.add_argument("--quick", action="store_true", help="Single repeat, for smoke runs.")
+    parser.add_argument("--output", help="Write results to this JSON file.")
+    parser.add_argument("--compare", help="Baseline JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Allowed slowdown/growth factor.")
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, args.quick)
+
+    if args.output:
+        import matplotlib
+
+        import pressplot
+
+        meta = {"python": platform.python_version(), "matplotlib": matplotlib.__version__,
+                "pressplot": pressplot.__version__, "machine": platform.machine(), "timestamp": time.time()}
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
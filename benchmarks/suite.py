@@ -0,0 +1,750 @@
+"""
+pressplot benchmark suite.
+
+Written in asv's format (``time_*``, ``peakmem_*``, ``timeraw_*`` and
+``track_*`` members, ``params``/``setup``), so it runs under ``asv run``.
+benchmarks/run.py runs the same classes without asv, recording time and
+peak traced memory for every benchmark.
+"""
+import ast
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.colors as mcolors
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.path import Path
+from matplotlib.patches import PathPatch
+
+import pressplot
+from pressplot import utils
+from pressplot.batch import run_job
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples")
+EXAMPLES = sorted(f[:-3] for f in os.listdir(EXAMPLES_DIR) if f.startswith("reproduce_") and f.endswith(".py"))
+
+
+def _missing_imports(script):
+    """
+    Top-level third-party modules imported by *script* that are not installed.
+    """
+    with open(script, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    names = set()
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split(".")[0])
+    return sorted(name for name in names if importlib.util.find_spec(name) is None)
+
+
+def _line_figure():
+    fig, ax = plt.subplots(figsize=(10, 6))
+    x = np.linspace(2000, 2025, 300)
+    for i in range(5):
+        ax.plot(x, np.sin(x / (3 + i)) + i)
+    ax.set_title("Benchmark chart")
+    return fig
+
+
+def _random_polygons(n, vertices, rng, extent=(-180, 180, -60, 85)):
+    """
+    Star-shaped random polygons standing in for country outlines.
+    """
+    x0, x1, y0, y1 = extent
+    centers = np.column_stack([rng.uniform(x0, x1, n), rng.uniform(y0, y1, n)])
+    theta = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    radii = rng.uniform(2, 8, (n, 1)) * rng.uniform(0.6, 1.0, (n, vertices))
+    return np.stack([centers[:, :1] + radii * np.cos(theta), centers[:, 1:] + radii * np.sin(theta)], axis=-1)
+
+
+def synthetic_map():
+    """
+    Stand-in for reproduce_map.py: a bucketed choropleth of ~180 polygons
+    with a horizontal colorbar, without geopandas or world.geojson.
+    """
+    pressplot.load_theme("clean_modern")
+    rng = np.random.default_rng(42)
+    polygons = _random_polygons(177, 60, rng)
+    values = rng.integers(0, 49, len(polygons))
+
+    fig, ax = plt.subplots(figsize=(14, 8))
+    cmap = plt.get_cmap("clean_modern_reds_discrete")
+    norm = mcolors.BoundaryNorm([0, 10, 20, 30, 40, 50, 100], cmap.N)
+    ax.add_collection(PolyCollection(polygons, array=values, cmap=cmap, norm=norm,
+                                     edgecolor="white", linewidth=0.5))
+    ax.set_xlim(-190, 190)
+    ax.set_ylim(-70, 95)
+    ax.axis("off")
+    ax.set_title("Childhood obesity rates", fontsize=32, fontweight="bold", loc="center", pad=40)
+    cbar_ax = fig.add_axes((0.35, 0.88, 0.3, 0.015))
+    cb = plt.colorbar(plt.cm.ScalarMappable(norm=norm, cmap=cmap), cax=cbar_ax, orientation="horizontal", ticks=[])
+    cb.outline.set_linewidth(0)
+    pressplot.save_clean_modern_style(fig, "reproduce_map.png", border_width=0)
+
+
+def synthetic_greenland():
+    """
+    Stand-in for reproduce_greenland.py: polygons and graticule clipped to a
+    circular globe, saved at 300 dpi with a tight bbox, without cartopy.
+    """
+    pressplot.load_theme("clean_modern")
+    rng = np.random.default_rng(7)
+    fig = plt.figure(figsize=(10, 10))
+    ax = fig.add_subplot(1, 1, 1, aspect="equal")
+    ax.set_xlim(-1.05, 1.05)
+    ax.set_ylim(-1.05, 1.05)
+    ax.axis("off")
+
+    theta = np.linspace(0, 2 * np.pi, 100)
+    globe = PathPatch(Path(np.column_stack([np.cos(theta), np.sin(theta)])),
+                      facecolor="#F7F7F7", edgecolor="#888888", linewidth=1.0)
+    ax.add_patch(globe)
+    polygons = _random_polygons(177, 80, rng, extent=(-1, 1, -1, 1)) / 20
+    polygons += rng.uniform(-0.9, 0.9, (len(polygons), 1, 2))
+    land = PolyCollection(polygons, facecolor="#E6E6E6", edgecolor="none", zorder=2)
+    land.set_clip_path(globe)
+    ax.add_collection(land)
+    for offset in np.linspace(-0.9, 0.9, 7):
+        for line in (ax.axvline(offset), ax.axhline(offset)):
+            line.set(color="#D4D4D4", linewidth=1.5, alpha=0.6, zorder=4, clip_path=globe)
+    pressplot.save_clean_modern_style(fig, "reproduce_greenland.png", border_color="#F1F0EA", border_width=50,
+                                      dpi=300, bbox_inches="tight", facecolor="#F1F0EA")
+
+
+SYNTHETIC_EXAMPLES = {
+    "reproduce_map": synthetic_map,
+    "reproduce_greenland": synthetic_greenland,
+}
+
+
+class ImportSuite:
+    def timeraw_import_pressplot(self):
+        return "import pressplot"
+
+    def track_import_peakmem(self):
+        import subprocess
+
+        code = ("import tracemalloc; tracemalloc.start(); import pressplot; "
+                "print(tracemalloc.get_traced_memory()[1])")
+        # Import pressplot from wherever this process imports it.
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+        out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True, env=env)
+        return int(out.stdout) / 1024
+
+    track_import_peakmem.unit = "KiB"
+
+
+class ThemeSuite:
+    def setup(self):
+        self.theme = pressplot.get_theme("clean_modern")
+        self.data = self.theme.to_dict()
+        pressplot.get_theme("clean_modern_manufacturing").compile()
+        pressplot.load_theme("clean_modern")
+
+    def time_load_theme(self):
+        pressplot.load_theme("clean_modern")
+
+    def time_load_derived_theme(self):
+        pressplot.load_theme("clean_modern_manufacturing")
+
+    def time_dict_round_trip(self):
+        pressplot.Theme.from_dict(self.theme.to_dict())
+
+    def time_from_dict_compile(self):
+        pressplot.Theme.from_dict(self.data).compile()
+
+    peakmem_load_theme = time_load_theme
+    peakmem_load_derived_theme = time_load_derived_theme
+    peakmem_dict_round_trip = time_dict_round_trip
+    peakmem_from_dict_compile = time_from_dict_compile
+
+
+class ThemeFilesSuite:
+    params = [True, False]
+    param_names = ["use_cache"]
+
+    def setup(self, use_cache):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.theme_dir = os.path.join(self.tmp.name, "themes")
+        os.makedirs(self.theme_dir)
+        rc_params = pressplot.get_theme("clean_modern").rc_params
+        for i in range(40):
+            with open(os.path.join(self.theme_dir, f"theme_{i:02d}.json"), "w", encoding="utf-8") as f:
+                json.dump({"rc_params": dict(rc_params, **{"font.size": 8 + i % 8})}, f)
+        self.cache_dir = os.environ.get("PRESSPLOT_CACHE_DIR")
+        os.environ["PRESSPLOT_CACHE_DIR"] = self.tmp.name
+        # Warm the cache, so use_cache=True measures the hit path
+        pressplot.theme_files.load_theme_dir(self.theme_dir, use_cache=use_cache)
+
+    def teardown(self, use_cache):
+        if self.cache_dir is None:
+            os.environ.pop("PRESSPLOT_CACHE_DIR", None)
+        else:
+            os.environ["PRESSPLOT_CACHE_DIR"] = self.cache_dir
+        self.tmp.cleanup()
+
+    def time_load_theme_dir(self, use_cache):
+        pressplot.theme_files.load_theme_dir(self.theme_dir, use_cache=use_cache)
+
+    peakmem_load_theme_dir = time_load_theme_dir
+
+
+class ThemeDiscoverySuite:
+    params = [10, 1000]
+    param_names = ["n_themes"]
+
+    def setup(self, n_themes):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.names = [f"client_{i}" for i in range(n_themes)]
+        for name in self.names:
+            with open(os.path.join(self.tmp.name, f"{name}.json"), "w", encoding="utf-8") as f:
+                json.dump({"rc_params": {"font.size": 11}}, f)
+        self.theme_path = os.environ.get("PRESSPLOT_THEME_PATH")
+        os.environ["PRESSPLOT_THEME_PATH"] = self.tmp.name
+
+    def teardown(self, n_themes):
+        if self.theme_path is None:
+            os.environ.pop("PRESSPLOT_THEME_PATH", None)
+        else:
+            os.environ["PRESSPLOT_THEME_PATH"] = self.theme_path
+        for name in self.names:
+            pressplot.registry._providers.pop(name, None)
+            pressplot.registry._themes.pop(name, None)
+        self.tmp.cleanup()
+
+    def time_discover_and_list(self, n_themes):
+        pressplot.registry.discover()
+        pressplot.list_themes()
+
+    def time_first_get(self, n_themes):
+        pressplot.registry.discover()
+        pressplot.registry.register_path(os.path.join(self.tmp.name, "client_0.json"))
+        pressplot.get_theme("client_0")
+
+
+class FontSuite:
+    params = [True, False]
+    param_names = ["use_cache"]
+    number = 1
+    repeat = 10
+
+    def setup(self, use_cache):
+        import matplotlib.font_manager as fm
+
+        utils.register_fonts()  # make sure the manifest exists
+        fonts_dir = os.path.join(os.path.dirname(os.path.abspath(utils.__file__)), "fonts")
+        fm.fontManager.ttflist = [e for e in fm.fontManager.ttflist if not e.fname.startswith(fonts_dir)]
+        utils._fonts_registered = False
+
+    def time_register_fonts(self, use_cache):
+        utils.register_fonts(use_cache=use_cache)
+
+    peakmem_register_fonts = time_register_fonts
+
+
+class ExportSuite:
+    params = [["png", "pdf"], [72, 150, 300], [0, 80]]
+    param_names = ["format", "dpi", "border_width"]
+
+    def setup(self, fmt, dpi, border_width):
+        pressplot.load_theme("clean_modern")
+        self.fig = _line_figure()
+
+    def teardown(self, fmt, dpi, border_width):
+        plt.close(self.fig)
+
+    def time_save_clean_modern_style(self, fmt, dpi, border_width):
+        pressplot.save_clean_modern_style(self.fig, io.BytesIO(), format=fmt, dpi=dpi, border_width=border_width)
+
+    peakmem_save_clean_modern_style = time_save_clean_modern_style
+
+
+ENCODINGS = {
+    "png": {"format": "png"},
+    "png-quantized": {"format": "png", "quantize": True},
+    "png-quantized-rle": {"format": "png", "quantize": True, "zlib_strategy": "rle"},
+    "webp-lossless": {"format": "webp", "lossless": True},
+    "webp-lossless-quantized": {"format": "webp", "lossless": True, "quantize": True},
+}
+
+
+class EncodeSuite:
+    """
+    Encoder options of save_clean_modern_style: time and output size at 300 dpi.
+    """
+    params = list(ENCODINGS)
+    param_names = ["encoding"]
+
+    def setup(self, encoding):
+        pressplot.load_theme("clean_modern")
+        self.fig = _line_figure()
+
+    def teardown(self, encoding):
+        plt.close(self.fig)
+
+    def time_save(self, encoding):
+        pressplot.save_clean_modern_style(self.fig, io.BytesIO(), dpi=300, **ENCODINGS[encoding])
+
+    def track_size(self, encoding):
+        buf = io.BytesIO()
+        pressplot.save_clean_modern_style(self.fig, buf, dpi=300, **ENCODINGS[encoding])
+        return len(buf.getvalue()) / 1024
+
+    track_size.unit = "KiB"
+
+
+class ThreadThemeSuite:
+    params = [1, 4]
+    param_names = ["threads"]
+    number = 1
+
+    def setup(self, threads):
+        self.themes = ["clean_modern", "clean_modern_manufacturing", "clean_modern_tiktok"]
+        self.x = np.linspace(0, 10, 500)
+        self.pool = ThreadPoolExecutor(threads)
+
+    def teardown(self, threads):
+        self.pool.shutdown()
+
+    def _render(self, i):
+        with pressplot.thread_theme(self.themes[i % len(self.themes)]):
+            fig = pressplot.figure(figsize=(6, 4), dpi=72)
+            ax = fig.subplots()
+            ax.plot(self.x, np.sin(self.x + i))
+            ax.set_title("Mixed themes")
+        fig.savefig(io.BytesIO(), format="png")
+
+    def time_render_mixed_themes(self, threads):
+        list(self.pool.map(self._render, range(24)))
+
+
+class ServeSuite:
+    """
+    A chart rendered by a warm `pressplot serve` worker versus a fresh interpreter.
+    """
+    number = 1
+
+    def setup(self):
+        from pressplot.serve import RenderPool
+
+        self.job = {"chart": f"{__name__}:_line_figure", "format": "png", "dpi": 100}
+        self.pool = RenderPool(workers=1, allow=[self.job["chart"]])
+        self.pool.wait_ready(120)
+        self.pool.render(self.job)
+
+    def teardown(self):
+        self.pool.close()
+
+    def time_warm_worker_render(self):
+        self.pool.render(self.job)
+
+    def timeraw_cold_process_render(self):
+        return ("import io, matplotlib\n"
+                "matplotlib.use('Agg')\n"
+                "import matplotlib.pyplot as plt, numpy as np, pressplot\n"
+                "pressplot.load_theme('clean_modern')\n"
+                "fig, ax = plt.subplots(figsize=(10, 6))\n"
+                "x = np.linspace(2000, 2025, 300)\n"
+                "[ax.plot(x, np.sin(x / (3 + i)) + i) for i in range(5)]\n"
+                "ax.set_title('Benchmark chart')\n"
+                "pressplot.save_clean_modern_style(fig, io.BytesIO(), format='png', dpi=100)")
+
+
+# One small spec per chart type that needs no optional dependency
+SPECS = {
+    "lollipop": {"type": "lollipop", "title": "Net blame", "data": {
+        "categories": ["Republican", "Independent", "Democrat"], "values": [-65, 25, 78],
+        "left_label": "Blame Dems more", "right_label": "Blame Reps more"}},
+    "stacked_barh": {"type": "stacked_barh", "title": "Tariff rate, %", "data": {
+        "categories": ["Britain", "France", "Germany", "China"],
+        "series": [{"label": "2024", "values": [2.0, 2.5, 3.0, 12.0]},
+                   {"label": "Increase", "values": [9.0, 13.0, 15.0, 34.0]}]}},
+    "line": {"type": "line", "title": "Rent as % of salary", "data": {
+        "x": list(range(2014, 2026)),
+        "series": [{"label": f"City {i}", "values": [30 + i + (j % 4) for j in range(12)]} for i in range(4)]}},
+    "bubble": {"type": "bubble", "title": "Risk", "data": {
+        "x": list(range(200)), "y": [(i % 37) / 10 for i in range(200)], "size": [40 + i % 90 for i in range(200)],
+        "highlight": [{"label": "Milan", "x": 120, "y": 9 / 10}]}},
+    "treemap": {"type": "treemap", "title": "Posts by category", "data": {
+        "items": [{"label": f"Item {i}", "value": 30 / (i + 1)} for i in range(9)]}},
+    "butterfly": {"type": "butterfly", "title": "Savings and costs", "data": {
+        "categories": ["A", "B", "C", "D", "E"],
+        "left": {"label": "Savings", "values": [0.1, 1.0, 0.2, 0.5, 0.4]},
+        "right": {"label": "Costs", "values": [4.5, 0.4, 0.3, 0.2, 0.2]}}},
+}
+
+
+def _choropleth_spec(directory):
+    """
+    A choropleth spec over ~180 synthetic polygons written as GeoJSON to *directory*.
+    """
+    rng = np.random.default_rng(42)
+    polygons = _random_polygons(177, 60, rng)
+    features = [{"type": "Feature", "properties": {"name": f"R{i}"},
+                 "geometry": {"type": "Polygon", "coordinates": [np.vstack([p, p[:1]]).tolist()]}}
+                for i, p in enumerate(polygons)]
+    path = os.path.join(directory, "regions.geojson")
+    with open(path, "w") as f:
+        json.dump({"type": "FeatureCollection", "features": features}, f)
+    return {"type": "choropleth", "title": "Unemployment by region", "source": "Synthetic regions",
+            "data": {"geodata": path, "values": {f"R{i}": int(v) for i, v in enumerate(rng.integers(0, 49, 170))},
+                     "bins": [0, 10, 20, 30, 40, 50]}}
+
+
+class SpecSuite:
+    """
+    Declarative chart specs: one render per type, and a batch with duplicates.
+    """
+    params = list(SPECS) + ["choropleth"]
+    param_names = ["chart"]
+    number = 1
+
+    def setup(self, chart):
+        from pressplot.specs import render_spec
+
+        if chart == "choropleth":
+            if importlib.util.find_spec("geopandas") is None:
+                raise NotImplementedError("choropleth specs need geopandas")
+            self.tmp = tempfile.TemporaryDirectory()
+            self.spec = dict(_choropleth_spec(self.tmp.name), dpi=100)
+        else:
+            self.spec = dict(SPECS[chart], dpi=100)
+        render_spec(self.spec, io.BytesIO())
+
+    def teardown(self, chart):
+        if chart == "choropleth":
+            self.tmp.cleanup()
+
+    def time_render_spec(self, chart):
+        from pressplot.specs import render_spec
+
+        render_spec(self.spec, io.BytesIO())
+
+
+class SpecBatchSuite:
+    """
+    60 specs of which 6 are distinct, rendered in-process, then from the cache.
+    """
+    number = 1
+
+    def setup(self):
+        from pressplot.cache import RenderCache
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.specs = [dict(SPECS[chart], dpi=72, name=f"{chart}-{i}") for i in range(10) for chart in SPECS]
+        self.cache = RenderCache(os.path.join(self.tmp.name, "cache"))
+        pressplot.render_specs(self.specs, os.path.join(self.tmp.name, "warm"), processes=1, cache=self.cache)
+
+    def teardown(self):
+        self.tmp.cleanup()
+
+    def time_render_specs_deduped(self):
+        pressplot.render_specs(self.specs, os.path.join(self.tmp.name, "out"), processes=1)
+
+    def time_render_specs_cached(self):
+        pressplot.render_specs(self.specs, os.path.join(self.tmp.name, "out"), processes=1, cache=self.cache)
+
+
+def _lollipop_layout(fig):
+    """
+    The shutdown lollipop layout with empty data, as a FigureTemplate build function.
+    """
+    from pressplot.themes import CLEAN_MODERN_DIVERGING_PALETTE as colors
+
+    y = np.arange(3)[::-1]
+    ax = fig.add_axes((0.25, 0.1, 0.7, 0.5))
+    ax.axvspan(-100, 0, facecolor=colors["bg_left"], zorder=0)
+    ax.axvspan(0, 100, facecolor=colors["bg_right"], zorder=0)
+    ax.grid(axis="x", color="#d4d4d4", linewidth=1.5, zorder=1)
+    ax.axvline(0, color="black", linewidth=2.5, zorder=2)
+    stems = ax.hlines(y, 0, [0, 0, 0], color=colors["dot_color"], linewidth=3.5, zorder=3)
+    dots = ax.scatter([0, 0, 0], y, color=colors["dot_color"], s=250, zorder=4, edgecolors="none")
+    ax.set_yticks(y)
+    ax.set_yticklabels(["Republican", "Independent", "Democrat"], fontsize=20, fontweight="bold")
+    ax.tick_params(axis="y", labelleft=True, labelright=False, length=0)
+    ax.xaxis.tick_top()
+    ax.set_xlim(-80, 80)
+    ax.set_ylim(-0.5, 2.5)
+    return {"stems": stems, "dots": dots,
+            "title": fig.text(0.5, 0.96, "", ha="center", va="top", fontsize=24, fontweight="bold"),
+            "subtitle": fig.text(0.5, 0.88, "", ha="center", va="top", fontsize=20)}
+
+
+def _lollipop_values(i):
+    values = [-65 + i % 7, 25 - i % 5, 78 - i % 11]
+    y = [2, 1, 0]
+    return {"title": f"Country {i}", "subtitle": "Net blame, percentage points",
+            "dots": np.column_stack([values, y]), "stems": [[(0, b), (v, b)] for v, b in zip(values, y)]}
+
+
+class TemplateSuite:
+    """
+    20 per-country lollipop charts: a reused FigureTemplate versus rebuilding the figure.
+    """
+    number = 1
+
+    def setup(self):
+        self.template = pressplot.FigureTemplate(_lollipop_layout, figsize=(10, 7), dpi=100)
+        self.template.render(io.BytesIO(), savefig_kwargs={"format": "png"}, **_lollipop_values(0))
+
+    def time_template_render(self):
+        for i in range(20):
+            self.template.render(io.BytesIO(), savefig_kwargs={"format": "png"}, **_lollipop_values(i))
+
+    def time_rebuild_render(self):
+        for i in range(20):
+            with pressplot.thread_theme("clean_modern"):
+                fig = pressplot.figure(figsize=(10, 7), dpi=100)
+                slots = _lollipop_layout(fig)
+            for name, value in _lollipop_values(i).items():
+                pressplot.templates.update_artist(slots[name], value)
+            pressplot.save_clean_modern_style(fig, io.BytesIO(), format="png")
+
+
+class SmallMultiplesSuite:
+    """
+    A 20x20 dashboard of small line charts: SmallMultiples versus plt.subplots.
+    """
+    number = 1
+    timeout = 120
+
+    def setup(self):
+        rng = np.random.default_rng(0)
+        self.years = np.arange(1995, 2025)
+        self.series = rng.normal(0, 1, (400, len(self.years))).cumsum(axis=1)
+
+    def time_small_multiples(self):
+        grid = pressplot.SmallMultiples(20, 20, figsize=(24, 24), dpi=100)
+        for i, panel in enumerate(grid):
+            panel.plot(self.years, self.series[i])
+            panel.set_title(f"Country {i}")
+        pressplot.save_clean_modern_style(grid.figure, io.BytesIO(), format="png")
+
+    def time_subplots(self):
+        with pressplot.thread_theme("clean_modern"):
+            fig = pressplot.figure(figsize=(24, 24), dpi=100)
+            axes = fig.subplots(20, 20, sharex=True, sharey=True)
+            for i, ax in enumerate(axes.flat):
+                ax.plot(self.years, self.series[i])
+                ax.set_title(f"Country {i}")
+        pressplot.save_clean_modern_style(fig, io.BytesIO(), format="png")
+
+
+class DotGridSuite:
+    params = [[10, 100, 1000], [None, 10_000]]
+    param_names = ["n", "raster_threshold"]
+
+    def setup(self, n, raster_threshold):
+        pressplot.load_theme("clean_modern")
+        self.ticks = np.linspace(0, 1, n)
+
+    def teardown(self, n, raster_threshold):
+        plt.close("all")
+
+    def time_draw_dot_grid(self, n, raster_threshold):
+        fig, ax = plt.subplots(figsize=(8, 5))
+        pressplot.draw_dot_grid(ax, self.ticks, self.ticks, raster_threshold=raster_threshold)
+        fig.canvas.draw()
+        plt.close(fig)
+
+    def time_zoomed_redraw(self, n, raster_threshold):
+        fig, ax = plt.subplots(figsize=(8, 5))
+        pressplot.draw_dot_grid(ax, self.ticks, self.ticks, raster_threshold=raster_threshold)
+        ax.set_xlim(0.4, 0.5)
+        ax.set_ylim(0.4, 0.5)
+        fig.canvas.draw()
+        plt.close(fig)
+
+    peakmem_draw_dot_grid = time_draw_dot_grid
+    peakmem_zoomed_redraw = time_zoomed_redraw
+
+
+class LineSuite:
+    params = [[100_000, 1_000_000, 10_000_000], ["plot", "plot_line"]]
+    param_names = ["n", "method"]
+    number = 1
+
+    def setup(self, n, method):
+        pressplot.load_theme("clean_modern")
+        rng = np.random.default_rng(0)
+        self.x = np.linspace(0, 1000, n)
+        self.y = rng.normal(0, 1, n).cumsum()
+
+    def teardown(self, n, method):
+        plt.close("all")
+
+    def _draw(self, method, xlim=None):
+        fig, ax = plt.subplots(figsize=(10, 6))
+        if method == "plot":
+            ax.plot(self.x, self.y)
+        else:
+            pressplot.plot_line(ax, self.x, self.y)
+        if xlim:
+            ax.set_xlim(*xlim)
+        fig.canvas.draw()
+        plt.close(fig)
+
+    def time_render(self, n, method):
+        self._draw(method)
+
+    def time_render_zoomed(self, n, method):
+        self._draw(method, (400, 410))
+
+    peakmem_render = time_render
+    peakmem_render_zoomed = time_render_zoomed
+
+
+class DensityScatterSuite:
+    params = [[100_000, 1_000_000, 10_000_000], ["png", "pdf"]]
+    param_names = ["n", "format"]
+    number = 1
+
+    def setup(self, n, fmt):
+        pressplot.load_theme("clean_modern")
+        rng = np.random.default_rng(0)
+        self.x = rng.normal(0, 1, n)
+        self.y = self.x * 0.5 + rng.normal(0, 1, n)
+
+    def teardown(self, n, fmt):
+        plt.close("all")
+
+    def time_density_scatter(self, n, fmt):
+        fig, ax = plt.subplots(figsize=(10, 6))
+        pressplot.density_scatter(ax, self.x, self.y)
+        pressplot.save_clean_modern_style(fig, io.BytesIO(), format=fmt)
+        plt.close(fig)
+
+    peakmem_density_scatter = time_density_scatter
+
+
+class PaletteSuite:
+    params = [10_000, 1_000_000, 10_000_000]
+    param_names = ["n"]
+    weights = [[0.8, 0.2, 0.0, 0.0], [0.3, 0.6, 0.1, 0.0], [0.0, 0.4, 0.5, 0.1], [0.0, 0.0, 0.2, 0.8]]
+
+    def setup(self, n):
+        self.x = np.random.default_rng(0).uniform(0, 100, n)
+
+    def time_assign_colors(self, n):
+        pressplot.assign_colors(self.x, [20, 40, 60, 80], "clean_modern_map")
+
+    def time_assign_colors_weighted(self, n):
+        pressplot.assign_colors(self.x, [25, 45, 70], "clean_modern_temperature", weights=self.weights,
+                                palette_indices=[0, 2, 4, 6], rng=0)
+
+    peakmem_assign_colors = time_assign_colors
+    peakmem_assign_colors_weighted = time_assign_colors_weighted
+
+
+class ColormapSuite:
+    params = [[100_000, 10_000_000], [False, True]]
+    param_names = ["n", "bytes"]
+
+    def setup(self, n, as_bytes):
+        self.values = np.random.default_rng(0).normal(0, 1, n)
+        self.cmap = pressplot.themes.get_colormap("clean_modern_reds")
+        self.norm = mcolors.Normalize(-2, 2)
+        pressplot.colorize(self.values[:1], "clean_modern_reds", -2, 2, bytes=as_bytes)  # build the LUT
+
+    def time_colormap_call(self, n, as_bytes):
+        self.cmap(self.norm(self.values), bytes=as_bytes)
+
+    def time_colorize(self, n, as_bytes):
+        pressplot.colorize(self.values, "clean_modern_reds", -2, 2, bytes=as_bytes)
+
+    peakmem_colormap_call = time_colormap_call
+    peakmem_colorize = time_colorize
+
+
+class LabelLineSuite:
+    params = [1_000, 100_000, 1_000_000]
+    param_names = ["n"]
+
+    def setup(self, n):
+        self.fig, self.ax = plt.subplots()
+        x = np.linspace(0, 100, n)
+        self.line, = self.ax.plot(x, np.sin(x))
+        self.unsorted, = self.ax.plot(np.cos(x), np.sin(x))
+
+    def teardown(self, n):
+        plt.close(self.fig)
+
+    def time_label_line_end(self, n):
+        pressplot.label_line(self.ax, self.line, "end")
+
+    def time_label_line_interp(self, n):
+        pressplot.label_line(self.ax, self.line, "mid", x=50.5)
+
+    def time_label_line_frac(self, n):
+        pressplot.label_line(self.ax, self.line, "frac", frac=0.75)
+
+    def time_label_line_unsorted(self, n):
+        pressplot.label_line(self.ax, self.unsorted, "loop", x=0.5)
+
+    peakmem_label_line_end = time_label_line_end
+    peakmem_label_line_interp = time_label_line_interp
+    peakmem_label_line_frac = time_label_line_frac
+    peakmem_label_line_unsorted = time_label_line_unsorted
+
+
+class LabelLinesSuite:
+    params = [5, 40, 200]
+    param_names = ["n"]
+
+    def setup(self, n):
+        pressplot.load_theme("clean_modern")
+        rng = np.random.default_rng(0)
+        self.fig, self.ax = plt.subplots(figsize=(8, 10))
+        x = np.linspace(2000, 2025, 100)
+        self.lines = [self.ax.plot(x, rng.normal(0, 1) + rng.normal(0, 0.05, len(x)).cumsum(), label=f"c{i}")[0]
+                      for i in range(n)]
+
+    def teardown(self, n):
+        plt.close(self.fig)
+
+    def time_label_lines(self, n):
+        pressplot.label_lines(self.ax, self.lines)
+
+    peakmem_label_lines = time_label_lines
+
+
+class ExamplesSuite:
+    params = EXAMPLES
+    param_names = ["chart"]
+    number = 1
+    repeat = 3
+    timeout = 300
+
+    def setup(self, chart):
+        self.output_dir = tempfile.mkdtemp(prefix="pressplot-bench-")
+        if chart in SYNTHETIC_EXAMPLES:
+            self.job = SYNTHETIC_EXAMPLES[chart]
+            return
+        self.job = os.path.join(EXAMPLES_DIR, f"{chart}.py")
+        missing = _missing_imports(self.job)
+        if missing:
+            raise NotImplementedError(f"{chart} needs {', '.join(missing)}")
+
+    def teardown(self, chart):
+        import shutil
+
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def time_render(self, chart):
+        result = run_job(self.job, self.output_dir)
+        if not result.ok:
+            raise RuntimeError(result.error)
+
+    peakmem_render = time_render
@@ -23,19 +23,10 @@ def main():
     x = np.random.uniform(0, 100, n_points)
 
     # Y: Risk of death (Same curve as before)
-    y = []
-    for val in x:
-        if val < 35:
-            base = 0.2
-            noise = np.random.normal(0, 0.1)
-            y.append(max(0, base + noise))
-        else:
-            norm_x = (val - 35) / 65
-            base = 0.2 + 1.2 * (norm_x ** 2)
-            noise = np.random.normal(0, 0.1 + 0.2 * norm_x)
-            y.append(max(0, base + noise))
-
-    y = np.array(y)
+    norm_x = np.clip((x - 35) / 65, 0, None)
+    base = np.where(x < 35, 0.2, 0.2 + 1.2 * norm_x ** 2)
+    noise = np.random.normal(0, np.where(x < 35, 0.1, 0.1 + 0.2 * norm_x))
+    y = np.maximum(0, base + noise)
     sizes = np.random.uniform(30, 180, n_points)
 
     # 2. Discrete Color Stacking Logic
@@ -46,43 +37,15 @@ def main():
     c_pale_pink = "#F4C9C4"  # Light pink/beige for the middle-right
     c_red = "#D92E27"
 
-    # Assign colors
-    point_colors = []
-
-    for val in x:
-        # Random component for overlap
-        r = np.random.random()
-
-        if val < 25:
-            # Mostly Dark Blue, some Mid Blue
-            if r < 0.8:
-                color = c_dark_blue
-            else:
-                color = c_mid_blue
-        elif val < 45:
-            # Mix of Dark Blue and Mid Blue, slightly more Mid
-            if r < 0.3:
-                color = c_dark_blue
-            elif r < 0.9:
-                color = c_mid_blue
-            else:
-                color = c_pale_pink
-        elif val < 70:
-            # Transition from Mid Blue to Pale Pink
-            if r < 0.4:
-                color = c_mid_blue
-            elif r < 0.9:
-                color = c_pale_pink
-            else:
-                color = c_red
-        else:
-            # Mostly Red, some Pale Pink
-            if r < 0.2:
-                color = c_pale_pink
-            else:
-                color = c_red
-
-        point_colors.append(color)
+    # Assign colors: one row of color probabilities per X bucket
+    point_colors = pressplot.assign_colors(
+        x, bins=[25, 45, 70], palette=[c_dark_blue, c_mid_blue, c_pale_pink, c_red],
+        weights=[
+            [0.8, 0.2, 0.0, 0.0],  # Mostly Dark Blue, some Mid Blue
+            [0.3, 0.6, 0.1, 0.0],  # Mix of Dark Blue and Mid Blue, slightly more Mid
+            [0.0, 0.4, 0.5, 0.1],  # Transition from Mid Blue to Pale Pink
+            [0.0, 0.0, 0.2, 0.8],  # Mostly Red, some Pale Pink
+        ])
 
     # Shuffle the plotting order so colors mix naturally (not one on top of another)
     indices = np.arange(n_points)
@@ -91,7 +54,7 @@ def main():
     x_shuffled = x[indices]
     y_shuffled = y[indices]
     s_shuffled = sizes[indices]
-    c_shuffled = np.array(point_colors)[indices]
+    c_shuffled = point_colors[indices]
 
     # Plot background bubbles
     # No cmap, direct color list
@@ -19,10 +19,10 @@ def smooth_line(x, y, points=300):
 
 
 def main():
-    pressplot.load_theme("clean_modern")
+    pressplot.load_theme("clean_modern_manufacturing")
 
     # Colors
-    colors = pressplot.themes.CLEAN_MODERN_MANUFACTURING_PALETTE
+    colors = pressplot.get_theme("clean_modern_manufacturing").palette
     blue_germany = colors[0]
     pink_britain = colors[1]
     grey_us = colors[2]
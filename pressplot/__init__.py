@@ -1,19 +1,101 @@
-from typing import List, Optional
+import importlib
+from typing import List, Optional, Union
 
-from .core import Theme
+from .core import Theme, ThemeContext
 from .registry import registry
-from .themes import clean_modern_theme
-from .utils import label_line, save_clean_modern_style, register_fonts, draw_dot_grid
+from .themes import clean_modern_theme, variant_themes
 
+__version__ = "0.1.0"
 
-def register_theme(name: str, rc_params: dict, palette: Optional[List] = None):
+# Attributes resolved on first access, so that `import pressplot` does not
+# pull in matplotlib, numpy or Pillow.
+_LAZY_ATTRS = {
+    "label_line": "utils",
+    "label_lines": "utils",
+    "save_clean_modern_style": "utils",
+    "register_fonts": "utils",
+    "draw_dot_grid": "utils",
+    "plot_line": "utils",
+    "density_scatter": "utils",
+    "add_border": "utils",
+    "RenderCache": "cache",
+    "assign_colors": "palettes",
+    "get_palette": "palettes",
+    "colorize": "palettes",
+    "thread_theme": "thread_themes",
+    "figure": "thread_themes",
+    "ThemedFigure": "thread_themes",
+    "draw_spec": "specs",
+    "render_spec": "specs",
+    "render_specs": "specs",
+    "FigureTemplate": "templates",
+    "SmallMultiples": "small_multiples",
+}
+_LAZY_SUBMODULES = ("utils", "batch", "cache", "palettes", "theme_files", "thread_themes", "specs",
+                    "templates", "small_multiples")
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(f".{_LAZY_ATTRS[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS) | set(_LAZY_SUBMODULES))
+
+
+def register_theme(name: str, rc_params: dict, palette: Optional[List] = None,
+                   parent: Optional[Union[str, Theme]] = None):
     """
     Helper function to create and register a theme.
+
+    With *parent*, rc_params and palette only override the parent theme's.
     """
-    theme = Theme(name, rc_params, palette)
+    theme = Theme(name, rc_params, palette, parent=parent)
     registry.register(theme)
 
 
+def register_theme_file(path: str) -> Theme:
+    """
+    Read, validate and register a theme from a TOML, JSON or .mplstyle file.
+    """
+    from .theme_files import load_theme_file
+
+    theme = load_theme_file(path)
+    registry.register(theme, validate=False)
+    return theme
+
+
+def register_theme_dir(directory: str, use_cache: bool = True, lazy: bool = False) -> List[str]:
+    """
+    Register every theme file in a directory, through the compiled theme cache.
+
+    Each theme is registered under its file stem, and a ``name`` inside the
+    file must match it. With lazy=True the files are only listed: each theme
+    is read the first time it is requested, and a mismatched name is reported
+    then.
+
+    Returns:
+        List[str]: Names of the registered themes.
+    """
+    from .registry import theme_files
+    from .theme_files import load_theme_dir
+
+    if lazy:
+        return [registry.register_path(path) for path in theme_files(directory)]
+
+    themes = load_theme_dir(directory, use_cache=use_cache)
+    for theme in themes:
+        registry.register(theme, validate=False)
+    return [theme.name for theme in themes]
+
+
 def load_theme(name: str):
     """
     Apply a registered theme by name.
@@ -22,6 +104,19 @@ def load_theme(name: str):
     theme.apply()
 
 
+def theme_context(theme: Union[str, Theme]) -> ThemeContext:
+    """
+    Apply a theme only inside a with-block or a decorated function.
+
+    Example:
+        with pressplot.theme_context("clean_modern"):
+            fig, ax = plt.subplots()
+    """
+    if not isinstance(theme, Theme):
+        theme = registry.get(theme)
+    return ThemeContext(theme)
+
+
 def get_theme(name: str) -> Theme:
     """
     Get a registered theme object.
@@ -36,11 +131,13 @@ def list_themes() -> list:
     return registry.list_themes()
 
 
-# Register default themes
-registry.register(clean_modern_theme)
-
-# Automatically register local fonts
-register_fonts()
+# Register default themes (compiled on first apply to keep the import cheap)
+registry.register(clean_modern_theme, validate=False)
+for _theme in variant_themes:
+    registry.register(_theme, validate=False)
+del _theme
 
-__all__ = ["Theme", "register_theme", "load_theme", "get_theme", "list_themes", "label_line", "save_clean_modern_style",
-           "draw_dot_grid"]
+__all__ = ["Theme", "register_theme", "register_theme_file", "register_theme_dir", "load_theme", "theme_context", "get_theme", "list_themes", "label_line", "label_lines", "save_clean_modern_style",
+           "draw_dot_grid", "plot_line", "density_scatter", "assign_colors", "get_palette",
+           "colorize", "thread_theme", "figure", "ThemedFigure", "draw_spec", "render_spec", "render_specs",
+           "FigureTemplate", "SmallMultiples"]
@@ -0,0 +1,553 @@
+import functools
+
+import matplotlib.cm as cm
+import matplotlib.colors as mcolors
+import numpy as np
+from matplotlib.artist import Artist, allow_rasterization
+from matplotlib.collections import PathCollection
+from matplotlib.font_manager import FontProperties, findfont
+from matplotlib.lines import Line2D
+from matplotlib.markers import MarkerStyle
+from matplotlib.path import Path
+from matplotlib.textpath import TextPath
+from matplotlib.ticker import Locator
+from matplotlib.transforms import Affine2D, Bbox, IdentityTransform
+
+
+# Initial reduction used for autoscaling, before the axes size is known
+_PRELIMINARY_COLUMNS = 4096
+# Points binned per pass by DensityScatter; bounds its temporary arrays
+_DENSITY_CHUNK = 1 << 20
+# View key of a DecimatedLine whose drawn vertices predate its data
+_STALE = object()
+
+
+class DecimatedLine(Line2D):
+    """
+    A line that only draws the vertices which can change the rendered pixels.
+
+    At draw time the visible part of the series is split into narrow buckets
+    (a few per pixel column) and each bucket is reduced to its first, lowest,
+    highest and last point (M4 aggregation). A polyline through those points
+    covers the same pixels as the full series; the remaining antialiasing
+    differences are smaller than those of matplotlib's own path
+    simplification. Zooming or saving at another dpi re-decimates for the new
+    view.
+
+    Decimation needs x sorted in either direction, a linear x scale, no
+    markers, a solid line style and the default draw style; otherwise the full
+    series is drawn.
+    """
+
+    def __init__(self, xdata, ydata, subpixels=8, **kwargs):
+        """
+        Initialize a DecimatedLine.
+
+        Args:
+            xdata: X values (numbers or datetimes), kept without copying.
+            ydata: Y values.
+            subpixels: Buckets per pixel column. Higher values follow the
+                       antialiased full-resolution rendering more closely.
+            **kwargs: Additional Line2D properties.
+        """
+        self.subpixels = subpixels
+        self._axis_data = None
+        self._view_key = None
+        super().__init__([], [], **kwargs)
+        self._full_x = np.asarray(xdata)
+        self._full_y = np.asarray(ydata)
+
+    def get_xdata(self, orig=True):
+        """
+        Return the full x data if *orig* is True, else the drawn (decimated) x.
+        """
+        return self._full_x if orig else super().get_xdata(orig=False)
+
+    def get_ydata(self, orig=True):
+        """
+        Return the full y data if *orig* is True, else the drawn (decimated) y.
+        """
+        return self._full_y if orig else super().get_ydata(orig=False)
+
+    def set_data(self, *args):
+        """
+        Replace the full series, as Line2D.set_data. It is re-decimated for the current view.
+        """
+        x, y = args[0] if len(args) == 1 else args
+        self._full_x = np.asarray(x)
+        self._full_y = np.asarray(y)
+        self._data_changed()
+
+    def set_xdata(self, x):
+        """
+        Replace the full x data.
+        """
+        self._full_x = np.asarray(x)
+        self._data_changed()
+
+    def set_ydata(self, y):
+        """
+        Replace the full y data.
+        """
+        self._full_y = np.asarray(y)
+        self._data_changed()
+
+    def _data_changed(self):
+        """
+        Drop the converted data and the drawn vertices after a data change.
+        """
+        self._axis_data = None
+        self._view_key = _STALE
+        # Keep the drawn vertices usable for autoscaling until the next draw
+        if self.axes is not None and len(self._full_x) == len(self._full_y):
+            self.decimate()
+        self.stale = True
+
+    def _set_drawn(self, x, y):
+        """
+        Set the vertices that are drawn, leaving the full series alone.
+        """
+        Line2D.set_xdata(self, x)
+        Line2D.set_ydata(self, y)
+
+    def _data_in_axis_units(self):
+        """
+        Return (x, y, sorted) with x increasing, converted to axis units once.
+        """
+        if self._axis_data is None:
+            x = np.asarray(self.convert_xunits(self._full_x), dtype=float)
+            y = np.asarray(self.convert_yunits(self._full_y), dtype=float)
+            if len(x) > 1 and x[0] > x[-1]:
+                x, y = x[::-1], y[::-1]
+            self._axis_data = (x, y, len(x) < 2 or bool(np.all(x[1:] >= x[:-1])))
+        return self._axis_data
+
+    def _can_decimate(self):
+        return (self.get_marker() in (None, 'None', 'none', '', ' ')
+                and self.get_linestyle() == '-'
+                and self.get_drawstyle() == 'default'
+                and self.axes.name == 'rectilinear'
+                and self.axes.get_xscale() == 'linear')
+
+    def decimate(self, lo=None, hi=None, scale=None, offset=None):
+        """
+        Replace the drawn vertices by the M4 reduction of the data in [lo, hi].
+
+        Buckets are floor(x * scale + offset). With no arguments, the
+        whole series is reduced to a fixed number of columns, which keeps the
+        data limits exact for autoscaling before the first draw.
+        """
+        x, y, is_sorted = self._data_in_axis_units()
+        if not is_sorted or not len(x):
+            key = None
+            idx = slice(None)
+        else:
+            if lo is None:
+                lo, hi = x[0], x[-1]
+                scale = _PRELIMINARY_COLUMNS / (hi - lo) if hi > lo else 1.0
+                offset = -lo * scale
+            key = (lo, hi, scale, offset)
+            if key == self._view_key:
+                return
+            idx = _m4_indices(x, y, lo, hi, scale, offset)
+        self._view_key = key
+        self._set_drawn(x[idx], y[idx])
+
+    @allow_rasterization
+    def draw(self, renderer):
+        if self.get_visible() and self.axes is not None:
+            if self._can_decimate():
+                lo, hi = sorted(self.axes.get_xlim())
+                (p_lo, _), (p_hi, _) = self.axes.transData.transform([(lo, 0), (hi, 0)])
+                scale = (p_hi - p_lo) / (hi - lo) * self.subpixels
+                self.decimate(lo, hi, scale, p_lo * self.subpixels - lo * scale)
+            elif self._view_key is not None:
+                x, y, _ = self._data_in_axis_units()
+                self._view_key = None
+                self._set_drawn(x, y)
+        super().draw(renderer)
+
+
+def _first_in_bucket(mask, starts, default):
+    """
+    Index of the first True of *mask* in each bucket, or *default* where none.
+    """
+    hits = np.flatnonzero(mask)
+    bucket = np.searchsorted(starts, hits, side='right') - 1
+    first = np.ones(len(hits), dtype=bool)
+    first[1:] = bucket[1:] != bucket[:-1]
+    result = default.copy()
+    result[bucket[first]] = hits[first]
+    return result
+
+
+def _m4_indices(x, y, lo, hi, scale, offset):
+    """
+    Indices of the first, min, max and last point of every bucket
+    floor(x * scale + offset).
+
+    *x* must be sorted increasing. Points just outside [lo, hi] are kept so
+    the segments crossing the view edges are drawn.
+    """
+    n = len(x)
+    i0 = max(int(np.searchsorted(x, lo, side='left')) - 1, 0)
+    i1 = min(int(np.searchsorted(x, hi, side='right')) + 1, n)
+    if (i1 - i0) <= 4 * abs(scale * (hi - lo)) + 8:
+        return np.arange(i0, i1)
+
+    xs, ys = x[i0:i1], y[i0:i1]
+    # x is sorted, so bucket boundaries come from searching the bucket edges
+    # inside the view rather than from computing a bucket for every point
+    c_lo, c_hi = sorted((lo * scale + offset, hi * scale + offset))
+    edges = (np.arange(np.floor(c_lo) + 1, np.floor(c_hi) + 1) - offset) / scale
+    starts = np.unique(np.concatenate([[0], np.searchsorted(xs, np.sort(edges))]))
+    starts = starts[starts < len(xs)]
+    ends = np.append(starts[1:], len(xs)) - 1
+    counts = ends - starts + 1
+
+    # fmin/fmax skip NaNs; columns that are all NaN keep their NaN endpoints
+    lows = np.repeat(np.fmin.reduceat(ys, starts), counts)
+    highs = np.repeat(np.fmax.reduceat(ys, starts), counts)
+    argmin = _first_in_bucket(ys == lows, starts, starts)
+    argmax = _first_in_bucket(ys == highs, starts, starts)
+
+    idx = np.sort(np.column_stack([starts, argmin, argmax, ends]), axis=1).ravel()
+    keep = np.ones(len(idx), dtype=bool)
+    keep[1:] = idx[1:] != idx[:-1]
+    return idx[keep] + i0
+
+
+class DotGrid(Artist):
+    """
+    A grid of dots whose positions are computed at draw time.
+
+    Only the dots inside the current view are generated, so memory follows the
+    visible grid rather than the full tick product, and zooming or panning
+    picks up the new view (and, with locator-based ticks, the new tick
+    positions). Very dense grids can optionally be drawn as a single cached
+    raster tile instead of one marker per dot.
+    """
+
+    def __init__(self, x_ticks=None, y_ticks=None, color='#d4d4d4', size=10, raster_threshold=None, **kwargs):
+        """
+        Initialize a DotGrid.
+
+        Args:
+            x_ticks: X positions: an array, a matplotlib Locator, or None to
+                     follow the axes' major x tick locator.
+            y_ticks: Y positions, same options as x_ticks.
+            color: Color of the dots.
+            size: Marker area in points^2, as for ax.scatter.
+            raster_threshold: If set, grids with more visible dots than this
+                              are drawn as one raster tile.
+            **kwargs: Additional Artist properties (zorder, alpha, ...).
+        """
+        super().__init__()
+        self.x_ticks = x_ticks
+        self.y_ticks = y_ticks
+        self.color = color
+        self.size = size
+        self.raster_threshold = raster_threshold
+        self._tile_key = None
+        self._tile = None
+        self.update(kwargs)
+
+        marker = MarkerStyle('o')
+        path = marker.get_path().transformed(marker.get_transform())
+        self._dots = PathCollection((path,), sizes=[size], facecolors=color, edgecolors='none',
+                                    transform=IdentityTransform())
+
+    def _visible_ticks(self, ticks, axis, lo, hi):
+        if ticks is None:
+            ticks = axis.get_major_locator()()
+        elif isinstance(ticks, Locator):
+            ticks = ticks.tick_values(lo, hi)
+        ticks = np.asarray(ticks, dtype=float)
+        return ticks[(ticks >= lo) & (ticks <= hi)]
+
+    def get_offsets(self):
+        """
+        Return the (N, 2) data coordinates of the dots inside the current view.
+        """
+        xs, ys = self._view_ticks()
+        xx, yy = np.meshgrid(xs, ys)
+        return np.column_stack([xx.ravel(), yy.ravel()])
+
+    def _view_ticks(self):
+        ax = self.axes
+        x0, x1 = sorted(ax.get_xlim())
+        y0, y1 = sorted(ax.get_ylim())
+        return (self._visible_ticks(self.x_ticks, ax.xaxis, x0, x1),
+                self._visible_ticks(self.y_ticks, ax.yaxis, y0, y1))
+
+    @allow_rasterization
+    def draw(self, renderer):
+        if not self.get_visible() or self.axes is None:
+            return
+        xs, ys = self._view_ticks()
+        if not len(xs) or not len(ys):
+            return
+
+        if self.raster_threshold is not None and len(xs) * len(ys) > self.raster_threshold:
+            self._draw_tile(renderer, xs, ys)
+            return
+
+        xx, yy = np.meshgrid(xs, ys)
+        dots = self._dots
+        dots.set_offsets(np.column_stack([xx.ravel(), yy.ravel()]))
+        dots.set_offset_transform(self.axes.transData)
+        dots.set_figure(self.figure)
+        dots.set_clip_box(self.clipbox)
+        dots.set_clip_path(self.get_clip_path())
+        dots.set_alpha(self.get_alpha())
+        dots.draw(renderer)
+        self.stale = False
+
+    def _draw_tile(self, renderer, xs, ys):
+        """
+        Draw the grid as one antialiased RGBA image covering the axes.
+        """
+        bbox = self.axes.bbox
+        # Vector backends embed images at the figure dpi rather than at 72 dpi
+        magnification = renderer.get_image_magnification()
+        x0, y0 = int(np.floor(bbox.x0)), int(np.floor(bbox.y0))
+        width = int(np.ceil((np.ceil(bbox.x1) - x0) * magnification))
+        height = int(np.ceil((np.ceil(bbox.y1) - y0) * magnification))
+        if width <= 0 or height <= 0:
+            return
+
+        trans = self.axes.transData
+        px = (trans.transform(np.column_stack([xs, np.full(len(xs), ys[0])]))[:, 0] - x0) * magnification
+        py = (trans.transform(np.column_stack([np.full(len(ys), xs[0]), ys]))[:, 1] - y0) * magnification
+        radius = np.sqrt(self.size) / 2 * renderer.points_to_pixels(1.0) * magnification
+
+        key = (width, height, px.round(2).tobytes(), py.round(2).tobytes(), radius, self.color, self.get_alpha())
+        if key != self._tile_key:
+            self._tile = _dot_tile(width, height, np.sort(px), np.sort(py), radius, self.color, self.get_alpha())
+            self._tile_key = key
+
+        gc = renderer.new_gc()
+        gc.set_clip_rectangle(self.clipbox)
+        gc.set_clip_path(self.get_clip_path())
+        renderer.draw_image(gc, x0, y0, self._tile)
+        gc.restore()
+        self.stale = False
+
+
+def _nearest_distance(centers, n):
+    """
+    Distance from each pixel center 0..n-1 to the nearest of *centers*.
+    """
+    pixels = np.arange(n) + 0.5
+    idx = np.clip(np.searchsorted(centers, pixels), 1, len(centers) - 1) if len(centers) > 1 else None
+    if idx is None:
+        return np.abs(pixels - centers[0])
+    return np.minimum(np.abs(pixels - centers[idx - 1]), np.abs(pixels - centers[idx]))
+
+
+def _dot_tile(width, height, px, py, radius, color, alpha=None):
+    """
+    Render an antialiased dot grid at pixel centers px x py into an RGBA array
+    (first row at the bottom, as renderer.draw_image expects). Cost is O(width * height), independent of the
+    number of dots.
+    """
+    dx = _nearest_distance(px, width)
+    dy = _nearest_distance(py, height)
+    coverage = np.clip(radius + 0.5 - np.hypot(dx[np.newaxis, :], dy[:, np.newaxis]), 0.0, 1.0)
+
+    rgba = mcolors.to_rgba(color, alpha)
+    tile = np.empty((height, width, 4), dtype=np.uint8)
+    tile[..., :3] = np.round(np.array(rgba[:3]) * 255).astype(np.uint8)
+    tile[..., 3] = np.round(coverage * rgba[3] * 255).astype(np.uint8)
+    return tile
+
+
+class DensityScatter(Artist, cm.ScalarMappable):
+    """
+    A scatter plot aggregated onto the output pixel grid.
+
+    At draw time the points are binned per pixel (or per block of pixels)
+    inside the axes and the per-bin count, sum or mean is mapped through a
+    colormap into one image. Empty bins stay transparent. Points are binned in
+    fixed-size chunks, so memory is bounded by the pixel count, and vector
+    backends embed a single image instead of one marker per point.
+    """
+
+    def __init__(self, x, y, c=None, reduce='count', cmap='clean_modern_reds', norm=None,
+                 vmin=None, vmax=None, bin_size=1, **kwargs):
+        """
+        Initialize a DensityScatter.
+
+        Args:
+            x: X coordinates of the points.
+            y: Y coordinates of the points.
+            c: Per-point values aggregated by 'sum' and 'mean'.
+            reduce: 'count', 'sum' or 'mean'.
+            cmap: Colormap or colormap name, pressplot colormaps included.
+            norm: Normalize instance. Defaults to a log scale for counts and a
+                  linear one otherwise, rescaled to the visible bins on each
+                  draw unless vmin/vmax are given.
+            vmin: Lower color limit.
+            vmax: Upper color limit.
+            bin_size: Bin width and height in output pixels.
+            **kwargs: Additional Artist properties (zorder, alpha, ...).
+        """
+        if reduce not in ('count', 'sum', 'mean'):
+            raise ValueError(f"reduce must be 'count', 'sum' or 'mean', not {reduce!r}")
+        if reduce != 'count' and c is None:
+            raise ValueError(f"reduce={reduce!r} needs values c")
+        if isinstance(cmap, str):
+            from .themes import COLORMAP_SPECS, get_colormap
+            if cmap in COLORMAP_SPECS:
+                cmap = get_colormap(cmap)
+        if norm is None:
+            norm = mcolors.LogNorm() if reduce == 'count' else mcolors.Normalize()
+        Artist.__init__(self)
+        cm.ScalarMappable.__init__(self, norm, cmap)
+        self._autoscale = vmin is None and vmax is None
+        self.set_clim(vmin, vmax)
+
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self.c = None if c is None else np.asarray(c, dtype=float)
+        self.reduce = reduce
+        self.bin_size = bin_size
+        self.update(kwargs)
+
+    def aggregate(self, bbox, scale=1.0):
+        """
+        Bin the points inside display box *bbox* and return the reduced grid.
+
+        Args:
+            bbox: Display-space region to cover, usually the axes bbox.
+            scale: Bins per display unit.
+
+        Returns:
+            np.ma.MaskedArray: (rows, columns) grid, first row at the bottom,
+            with empty bins masked.
+        """
+        trans = self.axes.transData
+        affine = trans.get_matrix() if trans.is_affine else None
+        width = max(int(np.ceil(bbox.width * scale)), 1)
+        height = max(int(np.ceil(bbox.height * scale)), 1)
+        counts = np.zeros(width * height)
+        sums = np.zeros(width * height) if self.reduce != 'count' else None
+
+        for start in range(0, len(self.x), _DENSITY_CHUNK):
+            chunk = slice(start, start + _DENSITY_CHUNK)
+            x = np.asarray(self.convert_xunits(self.x[chunk]), dtype=float)
+            y = np.asarray(self.convert_yunits(self.y[chunk]), dtype=float)
+            if affine is not None:
+                # Rectilinear axes: display = matrix @ (x, y, 1), no temporary (N, 2) arrays
+                px = affine[0, 0] * x + affine[0, 1] * y + affine[0, 2]
+                py = affine[1, 0] * x + affine[1, 1] * y + affine[1, 2]
+            else:
+                px, py = trans.transform(np.column_stack([x, y])).T
+            col = np.floor((px - bbox.x0) * scale)
+            row = np.floor((py - bbox.y0) * scale)
+            inside = (col >= 0) & (col < width) & (row >= 0) & (row < height)
+            flat = (row[inside] * width + col[inside]).astype(np.intp)
+            counts += np.bincount(flat, minlength=width * height)
+            if sums is not None:
+                values = self.c[chunk][inside]
+                finite = np.isfinite(values)
+                sums += np.bincount(flat[finite], weights=values[finite], minlength=width * height)
+                if not finite.all():
+                    counts -= np.bincount(flat[~finite], minlength=width * height)
+
+        empty = counts == 0
+        if self.reduce == 'count':
+            grid = counts
+        elif self.reduce == 'sum':
+            grid = sums
+        else:
+            grid = np.divide(sums, counts, out=np.zeros_like(sums), where=~empty)
+        return np.ma.masked_array(grid, empty).reshape(height, width)
+
+    @allow_rasterization
+    def draw(self, renderer):
+        if not self.get_visible() or self.axes is None:
+            return
+        bbox = self.axes.bbox
+        # Vector backends embed images at the figure dpi rather than at 72 dpi
+        magnification = renderer.get_image_magnification()
+        x0, y0 = np.floor(bbox.x0), np.floor(bbox.y0)
+        region = Bbox.from_extents(x0, y0, np.ceil(bbox.x1), np.ceil(bbox.y1))
+        if region.width <= 0 or region.height <= 0:
+            return
+
+        grid = self.aggregate(region, magnification / self.bin_size)
+        self.set_array(grid)
+        if self._autoscale and grid.count():
+            self.norm.vmin = self.norm.vmax = None
+            self.autoscale_None()
+        image = self.to_rgba(grid, alpha=self.get_alpha(), bytes=True)
+        image[np.ma.getmaskarray(grid)] = 0
+        if self.bin_size != 1:
+            image = image.repeat(self.bin_size, axis=0).repeat(self.bin_size, axis=1)
+            image = image[:int(np.ceil(region.height * magnification)), :int(np.ceil(region.width * magnification))]
+
+        gc = renderer.new_gc()
+        gc.set_clip_rectangle(self.clipbox)
+        gc.set_clip_path(self.get_clip_path())
+        renderer.draw_image(gc, x0, y0, np.ascontiguousarray(image))
+        gc.restore()
+        self.stale = False
+
+
+@functools.lru_cache(maxsize=4096)
+def _label_path(text, font_file, size, ha, va):
+    """
+    Glyph outline of *text* in points, shifted so (0, 0) is its alignment anchor.
+
+    Keyed on the resolved font file rather than a FontProperties, whose
+    generic families ('sans-serif') resolve differently under each theme.
+    """
+    path = TextPath((0, 0), text, size=size, prop=FontProperties(fname=font_file))
+    if not len(path.vertices):
+        return path
+    # Bounds of the vertices, control points included: a close, cheap stand-in
+    # for the exact curve extents
+    (x0, y0), (x1, y1) = path.vertices.min(axis=0), path.vertices.max(axis=0)
+    dx = {'left': 0.0, 'center': -(x0 + x1) / 2, 'right': -x1}[ha]
+    dy = {'baseline': 0.0, 'bottom': -y0, 'center': -(y0 + y1) / 2, 'top': -y1}[va]
+    return Path(path.vertices + (dx, dy), path.codes)
+
+
+class LabelCollection(PathCollection):
+    """
+    Many short text labels drawn as one collection of glyph outlines.
+
+    Each distinct string is converted to a path once (and cached across
+    collections), and all labels are drawn in a single call, which is far
+    cheaper than one Text artist per label when there are hundreds of them.
+    Labels are not hinted like Text, and vector backends write them as paths.
+    """
+
+    def __init__(self, texts, offsets, offset_transform, size=10, fontproperties=None, ha='left',
+                 va='baseline', color='#1B1919', **kwargs):
+        """
+        Initialize a LabelCollection.
+
+        Args:
+            texts: Label strings.
+            offsets: (N, 2) anchor positions, in offset_transform coordinates.
+            offset_transform: Transform of the anchors (e.g. fig.transFigure).
+            size: Font size in points.
+            fontproperties: FontProperties of the labels. Defaults to the
+                            current rcParams font.
+            ha: Horizontal alignment: 'left', 'center' or 'right'.
+            va: Vertical alignment: 'baseline', 'bottom', 'center' or 'top'.
+            color: One color, or one per label.
+            **kwargs: Additional PathCollection properties (zorder, alpha, ...).
+        """
+        font_file = findfont(FontProperties() if fontproperties is None else fontproperties)
+        paths = [_label_path(str(text), font_file, size, ha, va) for text in texts]
+        super().__init__(paths, offsets=np.asarray(offsets, dtype=float).reshape(-1, 2),
+                         offset_transform=offset_transform, facecolors=color, edgecolors='none', **kwargs)
+
+    @allow_rasterization
+    def draw(self, renderer):
+        # Glyph outlines are in points; scale them to pixels at the output dpi
+        self.set_transform(Affine2D().scale(renderer.points_to_pixels(1.0)))
+        super().draw(renderer)
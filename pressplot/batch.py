@@ -0,0 +1,266 @@
+"""
+Parallel batch rendering of chart scripts and callables.
+
+Jobs run on a pool of warm worker processes: each worker imports matplotlib
+and pressplot, registers fonts and colormaps and compiles the themes once,
+then renders many charts.
+
+    pressplot batch examples/ --output-dir gallery/ --processes 8
+
+Chart spec files (.json/.jsonl, see pressplot.specs) are rendered through
+render_specs instead, which dedupes and optionally caches them.
+"""
+import argparse
+import fnmatch
+import glob
+import importlib
+import io
+import json
+import os
+import runpy
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext, redirect_stdout
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterable, List, Optional, Sequence, Union
+
+Job = Union[str, Callable[[], object]]
+
+# Files rendered as declarative chart specs (see pressplot.specs) instead of run
+SPEC_EXTENSIONS = (".json", ".jsonl")
+
+
+@dataclass
+class ChartResult:
+    """
+    Timing and status of one rendered chart.
+
+    Attributes:
+        name (str): Script stem or callable name.
+        ok (bool): Whether the job finished without raising.
+        wall (float): Seconds spent on the whole job.
+        render (float): Seconds spent rendering in save_clean_modern_style.
+        encode (float): Seconds spent encoding in save_clean_modern_style.
+        error (Optional[str]): Exception summary when the job failed.
+        cached (bool): Whether the output was copied from an earlier render
+                       instead of being rendered.
+    """
+    name: str
+    ok: bool
+    wall: float
+    render: float = 0.0
+    encode: float = 0.0
+    error: Optional[str] = None
+    cached: bool = False
+
+
+def discover(paths: Iterable[str], pattern: str = "*.py") -> List[str]:
+    """
+    Expand paths into batch jobs.
+
+    Directories contribute their files matching *pattern* (sorted), files are
+    used as-is and ``module:function`` strings name a callable to import.
+    """
+    jobs = []
+    for path in paths:
+        if os.path.isdir(path):
+            jobs.extend(sorted(p for p in glob.glob(os.path.join(path, "*"))
+                               if fnmatch.fnmatch(os.path.basename(p), pattern)))
+        else:
+            jobs.append(path)
+    return jobs
+
+
+def _job_name(job: Job) -> str:
+    if callable(job):
+        return getattr(job, "__qualname__", repr(job))
+    if ":" in job and not os.path.exists(job):
+        return job
+    return os.path.splitext(os.path.basename(job))[0]
+
+
+def _resolve_callable(spec: str) -> Callable[[], object]:
+    module_name, _, attr = spec.partition(":")
+    func = importlib.import_module(module_name)
+    for part in attr.split("."):
+        func = getattr(func, part)
+    return func
+
+
+def warm_themes(themes: Sequence[str] = ("clean_modern",)):
+    """
+    Register fonts and colormaps and compile *themes*, without applying any.
+
+    Only process-wide caches are filled: the backend and rcParams are left
+    alone, so this is safe to call in the caller's process.
+    """
+    from .registry import registry
+    from .themes import register_colormaps
+    from .utils import register_fonts
+
+    register_fonts()
+    register_colormaps()
+    for name in themes:
+        theme = registry.get(name)
+        theme.compile()
+        theme._prepare()
+
+
+def warm_worker(themes: Sequence[str] = ("clean_modern",)):
+    """
+    Prepare a worker process for rendering.
+
+    Selects the Agg backend, imports pyplot, warms *themes* (see warm_themes)
+    and leaves the first one applied.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: F401
+
+    from .registry import registry
+
+    warm_themes(themes)
+    registry.get(themes[0]).apply()
+
+
+def run_job(job: Job, output_dir: Optional[str] = None, quiet: bool = True) -> ChartResult:
+    """
+    Run one chart job in the current process and time it.
+
+    Scripts run as ``__main__`` with *output_dir* as the working directory.
+    rcParams are restored and all figures closed afterwards.
+    """
+    import matplotlib as mpl
+    import matplotlib.pyplot as plt
+
+    from .utils import collect_export_timings
+
+    name = _job_name(job)
+    cwd = os.getcwd()
+    error = None
+    start = time.perf_counter()
+    with mpl.rc_context(), collect_export_timings() as timings:
+        try:
+            if output_dir:
+                os.chdir(output_dir)
+            with redirect_stdout(io.StringIO()) if quiet else nullcontext():
+                if callable(job):
+                    job()
+                elif ":" in job and not os.path.exists(os.path.join(cwd, job)):
+                    _resolve_callable(job)()
+                else:
+                    runpy.run_path(os.path.join(cwd, job), run_name="__main__")
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                error = f"SystemExit: {e.code}"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            os.chdir(cwd)
+            plt.close("all")
+    wall = time.perf_counter() - start
+    return ChartResult(name, error is None, wall, timings["render"], timings["encode"], error)
+
+
+def run_batch(jobs: Sequence[Job], processes: Optional[int] = None, output_dir: Optional[str] = None,
+              themes: Sequence[str] = ("clean_modern",), quiet: bool = True) -> List[ChartResult]:
+    """
+    Render jobs on a pool of warm worker processes.
+
+    Args:
+        jobs: Script paths, ``module:function`` strings or picklable callables.
+        processes: Number of workers. Defaults to the CPU count; 1 runs in-process,
+                   restoring the caller's rcParams afterwards.
+        output_dir: Working directory for the jobs (where relative outputs land).
+        themes: Themes to compile in each worker; the first one is applied.
+        quiet: Discard what the jobs print to stdout.
+
+    Returns:
+        List[ChartResult]: One result per job, in input order.
+    """
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        output_dir = os.path.abspath(output_dir)
+    jobs = [os.path.abspath(job) if isinstance(job, str) and os.path.exists(job) else job for job in jobs]
+    processes = processes or os.cpu_count() or 1
+    processes = min(processes, max(len(jobs), 1))
+
+    if processes == 1:
+        # In-process: the first theme is applied for the jobs only, and the
+        # caller's backend is kept.
+        import matplotlib as mpl
+
+        from .registry import registry
+
+        warm_themes(themes)
+        with mpl.rc_context():
+            registry.get(themes[0]).apply()
+            return [run_job(job, output_dir, quiet) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=warm_worker, initargs=(tuple(themes),)) as pool:
+        futures = [pool.submit(run_job, job, output_dir, quiet) for job in jobs]
+        return [future.result() for future in futures]
+
+
+def format_report(results: Sequence[ChartResult], elapsed: float) -> str:
+    """
+    Format batch results as a plain-text table.
+    """
+    width = max([len(r.name) for r in results] + [5])
+    lines = [f"{'chart':<{width}}  {'wall':>8}  {'render':>8}  {'encode':>8}  status"]
+    for r in results:
+        status = ("cached" if r.cached else "ok") if r.ok else f"FAILED {r.error}"
+        lines.append(f"{r.name:<{width}}  {r.wall:8.3f}  {r.render:8.3f}  {r.encode:8.3f}  {status}")
+    total = sum(r.wall for r in results)
+    failed = sum(not r.ok for r in results)
+    lines.append(f"{len(results)} charts ({failed} failed) in {elapsed:.2f}s wall, "
+                 f"{total:.2f}s summed chart time")
+    return "\n".join(lines)
+
+
+def build_parser(parser: Optional[argparse.ArgumentParser] = None) -> argparse.ArgumentParser:
+    """
+    Add the batch command-line options to *parser* (or a new parser).
+    """
+    if parser is None:
+        parser = argparse.ArgumentParser(prog="pressplot batch", description="Render charts in parallel.")
+    parser.add_argument("paths", nargs="+",
+                        help="Chart scripts, chart spec files (.json/.jsonl), directories or module:function specs.")
+    parser.add_argument("-o", "--output-dir", default=None, help="Directory the charts are written to.")
+    parser.add_argument("-j", "--processes", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--pattern", default="*.py", help="File pattern used inside directories.")
+    parser.add_argument("--theme", action="append", dest="themes",
+                        help="Theme to pre-compile in workers (repeatable, first is applied).")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reuse earlier renders of unchanged chart specs (.json/.jsonl files).")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show what the charts print.")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None, args: Optional[argparse.Namespace] = None) -> int:
+    """
+    Entry point for ``pressplot batch``.
+    """
+    if args is None:
+        args = build_parser().parse_args(argv)
+    jobs = discover(args.paths, args.pattern)
+    spec_files = [job for job in jobs if job.lower().endswith(SPEC_EXTENSIONS)]
+    jobs = [job for job in jobs if job not in spec_files]
+    start = time.perf_counter()
+    results = []
+    if spec_files:
+        from .specs import load_specs, render_specs
+
+        specs = [spec for path in spec_files for spec in load_specs(path)]
+        results += render_specs(specs, args.output_dir or ".", processes=args.processes, cache=args.cache)
+    if jobs:
+        results += run_batch(jobs, processes=args.processes, output_dir=args.output_dir,
+                             themes=args.themes or ("clean_modern",), quiet=not args.verbose)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps({"elapsed": elapsed, "results": [asdict(r) for r in results]}, indent=2))
+    else:
+        print(format_report(results, elapsed))
+    return 0 if all(r.ok for r in results) else 1
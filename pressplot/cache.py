@@ -0,0 +1,260 @@
+"""
+Opt-in, content-addressed cache for rendered charts.
+
+A chart is identified by the source of the function that draws it, its
+inputs, the resolved theme, the border settings and the matplotlib and
+pressplot versions. When nothing changed, the stored bytes are copied to the
+output path and no figure is built.
+
+    cache = RenderCache(max_bytes=256 * 2**20)
+    cache.render(draw_sales_chart, "sales.png", years, values, theme="clean_modern")
+"""
+import hashlib
+import inspect
+import io
+import os
+import shutil
+from typing import Any, Callable, Dict, Optional, Union
+
+from .core import Theme, ThemeContext
+from .registry import registry
+
+_KEY_VERSION = b"pressplot-render-cache-1"
+
+
+def _update_hash(h, obj):
+    """
+    Feed *obj* into hash *h*. numpy arrays and buffers are hashed from their
+    memory without copying when they are contiguous.
+
+    Raises:
+        TypeError: If *obj* contains a type without a deterministic encoding.
+    """
+    if obj is None or isinstance(obj, (bool, int, float, complex, str)):
+        h.update(f"{type(obj).__name__}:{obj!r};".encode())
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        view = memoryview(obj)
+        h.update(f"buf:{view.nbytes};".encode())
+        h.update(view.cast("B") if view.c_contiguous else view.tobytes())
+    elif type(obj).__module__ == "numpy" and hasattr(obj, "dtype") and hasattr(obj, "shape"):
+        import numpy as np
+
+        arr = np.asarray(obj)
+        h.update(f"ndarray:{arr.dtype.str}:{arr.shape};".encode())
+        if arr.dtype.hasobject:
+            _update_hash(h, arr.tolist())
+        else:
+            h.update(memoryview(np.ascontiguousarray(arr)).cast("B"))
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}:{len(obj)}[".encode())
+        for item in obj:
+            _update_hash(h, item)
+        h.update(b"]")
+    elif isinstance(obj, dict):
+        h.update(f"dict:{len(obj)}{{".encode())
+        for key in sorted(obj, key=repr):
+            _update_hash(h, key)
+            _update_hash(h, obj[key])
+        h.update(b"}")
+    elif isinstance(obj, (set, frozenset)):
+        # Iteration order depends on string hash seeding, so the items are
+        # hashed one by one and fed in digest order.
+        digests = []
+        for item in obj:
+            item_hash = hashlib.blake2b(digest_size=20)
+            _update_hash(item_hash, item)
+            digests.append(item_hash.digest())
+        h.update(f"{type(obj).__name__}:{len(obj)}{{".encode())
+        for digest in sorted(digests):
+            h.update(digest)
+        h.update(b"}")
+    else:
+        raise TypeError(f"Cannot derive a cache key from {type(obj).__name__} values; pass numbers, strings, "
+                        "bytes, lists, tuples, dicts, sets or numpy arrays")
+
+
+def _function_source(func: Callable) -> str:
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        code = getattr(func, "__code__", None)
+        if code is None:
+            raise TypeError(f"Cannot derive a cache key for {func!r}: its source is unavailable")
+        return f"{func.__module__}.{func.__qualname__}:{code.co_code.hex()}:{code.co_consts!r}"
+
+
+class RenderCache:
+    """
+    Size-bounded LRU cache of rendered chart files.
+
+    Entries are files named by their key. Their modification time records the
+    last use, and the least recently used entries are evicted once the cache
+    grows beyond *max_bytes*.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 512 * 2 ** 20):
+        """
+        Initialize a RenderCache.
+
+        Args:
+            directory (Optional[str]): Where entries are stored. Defaults to
+                                       ``renders`` inside the pressplot cache dir.
+            max_bytes (int): Total size the cache is trimmed to after each store.
+        """
+        if directory is None:
+            from .utils import get_cache_dir
+            directory = os.path.join(get_cache_dir(), "renders")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, func: Callable, args: tuple, kwargs: Dict[str, Any], theme: Theme, fmt: str,
+            border_width: int, border_color: str, savefig_kwargs: Dict[str, Any]) -> str:
+        """
+        Compute the content key of a chart render.
+
+        Raises:
+            TypeError: If an input has no deterministic encoding (see _update_hash).
+        """
+        import matplotlib
+
+        from . import __version__
+
+        h = hashlib.blake2b(_KEY_VERSION, digest_size=20)
+        _update_hash(h, _function_source(func))
+        _update_hash(h, args)
+        _update_hash(h, kwargs)
+        _update_hash(h, theme.fingerprint())
+        _update_hash(h, (fmt, border_width, border_color))
+        _update_hash(h, savefig_kwargs)
+        _update_hash(h, (matplotlib.__version__, __version__))
+        return h.hexdigest()
+
+    def _path(self, key: str, fmt: str) -> str:
+        return os.path.join(self.directory, f"{key}.{fmt}")
+
+    def render(self, func: Callable, filename: Union[str, os.PathLike], *args,
+               theme: Union[str, Theme] = "clean_modern", border_width: int = 80, border_color: str = "#F1F0EA",
+               savefig_kwargs: Optional[Dict[str, Any]] = None, **kwargs) -> bool:
+        """
+        Render ``func(*args, **kwargs)`` to *filename*, reusing a cached file when possible.
+
+        Args:
+            func: Callable drawing the chart and returning its Figure.
+            filename: Output path; its extension selects the format.
+            *args, **kwargs: Inputs passed to *func*; they are part of the key.
+            theme: Theme name or object applied while drawing.
+            border_width: Border width passed to save_clean_modern_style.
+            border_color: Border color passed to save_clean_modern_style.
+            savefig_kwargs: Extra arguments for save_clean_modern_style/savefig.
+
+        Returns:
+            bool: True on a cache hit, False when the chart was rendered.
+
+        Raises:
+            TypeError: If an input is not plain data or a numpy array, since
+                       it could not be keyed reliably.
+        """
+        from .utils import _resolve_format, save_clean_modern_style
+
+        if not isinstance(theme, Theme):
+            theme = registry.get(theme)
+        savefig_kwargs = dict(savefig_kwargs or {})
+        fmt = _resolve_format(filename, savefig_kwargs.pop("format", None))
+        key = self.key(func, args, kwargs, theme, fmt, border_width, border_color, savefig_kwargs)
+
+        if self.fetch(key, fmt, filename):
+            return True
+
+        import matplotlib.pyplot as plt
+
+        with ThemeContext(theme):
+            fig = func(*args, **kwargs)
+            try:
+                buffer = io.BytesIO()
+                save_clean_modern_style(fig, buffer, border_width=border_width, border_color=border_color,
+                                        format=fmt, **savefig_kwargs)
+            finally:
+                plt.close(fig)
+
+        with open(filename, "wb") as f:
+            f.write(buffer.getbuffer())
+        self.store(key, fmt, filename)
+        return False
+
+    def fetch(self, key: str, fmt: str, filename: Union[str, os.PathLike]) -> bool:
+        """
+        Copy the entry stored under *key* to *filename*, if there is one.
+
+        Returns:
+            bool: True on a hit. Hits and misses are counted.
+        """
+        path = self._path(key, fmt)
+        if not os.path.exists(path):
+            self.misses += 1
+            return False
+        shutil.copyfile(path, filename)
+        os.utime(path)
+        self.hits += 1
+        return True
+
+    def store(self, key: str, fmt: str, filename: Union[str, os.PathLike], evict: bool = True):
+        """
+        Store a copy of the rendered file *filename* under *key*.
+
+        Args:
+            key (str): Content key of the render.
+            fmt (str): Output format, used as the entry's extension.
+            filename: The rendered file.
+            evict (bool): Trim the cache afterwards. Callers storing many
+                          entries can pass False and call evict() once.
+        """
+        path = self._path(key, fmt)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.copyfile(filename, tmp_path)
+        os.replace(tmp_path, path)
+        if evict:
+            self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits in max_bytes.
+        """
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """
+        Remove every cached entry and reset the counters.
+        """
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file():
+                    os.remove(entry.path)
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return hit/miss counters and the current cache size.
+        """
+        with os.scandir(self.directory) as it:
+            sizes = [entry.stat().st_size for entry in it if entry.is_file()]
+        return {"hits": self.hits, "misses": self.misses, "entries": len(sizes), "bytes": sum(sizes)}
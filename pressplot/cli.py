@@ -0,0 +1,26 @@
+"""
+Command-line interface: ``pressplot <command> ...``.
+"""
+import argparse
+import sys
+from typing import Optional, Sequence
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from . import batch, serve
+
+    parser = argparse.ArgumentParser(prog="pressplot")
+    commands = parser.add_subparsers(dest="command", required=True)
+    batch.build_parser(commands.add_parser("batch", help="Render chart scripts in parallel."))
+    serve.build_parser(commands.add_parser("serve", help="Run a daemon rendering chart jobs on warm workers."))
+
+    args = parser.parse_args(argv)
+    if args.command == "batch":
+        return batch.main(args=args)
+    if args.command == "serve":
+        return serve.main(args=args)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,26 @@
+from contextlib import ContextDecorator
 from copy import deepcopy
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Union
 
-import matplotlib as mpl
-import matplotlib.pyplot as plt
+
+def _rc_getter(rc):
+    """
+    Return a function reading rcParams values without the validation and
+    backend resolution of RcParams.__getitem__.
+    """
+    if hasattr(rc, '_get'):
+        return rc._get
+    return lambda key: dict.__getitem__(rc, key)
+
+
+def _rc_set(rc, key, value):
+    """
+    Write an already validated value into rcParams, skipping the validator.
+    """
+    if hasattr(rc, '_set'):
+        rc._set(key, value)
+    else:
+        dict.__setitem__(rc, key, value)
 
 
 class Theme:
@@ -11,9 +29,17 @@ class Theme:
     
     A Theme encapsulates matplotlib rcParams and a color cycle/palette.
     It allows for validation and application of these settings.
+
+    A theme may derive from a parent theme (see derive()): its rc_params and
+    palette then override the parent's, and the merged result is memoized.
     """
 
-    def __init__(self, name: str, rc_params: Dict[str, Any], palette: Optional[List[str]] = None):
+    # Bumped by the registry whenever a theme name is (re)bound, so derived
+    # themes re-check their parent chain before reusing their memoized compile.
+    _registry_generation = 0
+
+    def __init__(self, name: str, rc_params: Dict[str, Any], palette: Optional[List[str]] = None,
+                 parent: Optional[Union[str, 'Theme']] = None):
         """
         Initialize a Theme.
 
@@ -22,10 +48,19 @@ class Theme:
             rc_params (Dict[str, Any]): Dictionary of matplotlib rcParams.
             palette (Optional[List[str]]): List of color hex codes or names. 
                                            If provided, it overrides axes.prop_cycle.
+            parent (Optional[Union[str, Theme]]): Theme (or registered theme name)
+                                                  this theme inherits from.
         """
         self.name = name
+        self.parent = parent
         self._rc_params = deepcopy(rc_params)
         self._palette = deepcopy(palette) if palette else []
+        self._own = None
+        self._compiled = None
+        self._base = None
+        self._generation = -1
+        self._prepared = False
+        self._fingerprint = None
 
         self._validate()
 
@@ -40,32 +75,194 @@ class Theme:
 
     @property
     def rc_params(self) -> Dict[str, Any]:
+        """
+        The theme's own rcParams (for a derived theme, only its overrides).
+        """
         return self._rc_params
 
     @property
     def palette(self) -> List[str]:
-        return self._palette
+        """
+        The theme's palette, inherited from the parent when it has none.
+        """
+        if self._palette or self.parent is None:
+            return self._palette
+        return self._parent_theme().palette
+
+    @classmethod
+    def derive(cls, name: str, parent: Union[str, 'Theme'], overrides: Optional[Dict[str, Any]] = None,
+               palette: Optional[List[str]] = None) -> 'Theme':
+        """
+        Create a theme that inherits everything from *parent* except *overrides*.
+
+        The parent is resolved lazily, so it does not have to be registered
+        yet. The fully merged rcParams (and cycler) are computed on the first
+        compile and memoized; the memo is rebuilt only when a theme in the
+        parent chain is re-registered, so applying a derived theme costs the
+        same as applying a flat one.
+
+        Args:
+            name (str): The name of the new theme.
+            parent (Union[str, Theme]): Parent theme, or the name of a registered theme.
+            overrides (Optional[Dict[str, Any]]): rcParams that replace the parent's.
+            palette (Optional[List[str]]): Palette that replaces the parent's.
+
+        Returns:
+            Theme: The derived theme.
+
+        Example:
+            Theme.derive("clean_modern_dark", parent="clean_modern",
+                         overrides={"axes.facecolor": "#1B1919"})
+        """
+        return cls(name, overrides or {}, palette, parent=parent)
+
+    def _parent_theme(self) -> 'Theme':
+        if isinstance(self.parent, Theme):
+            return self.parent
+        from .registry import registry
+
+        return registry.get(self.parent)
+
+    def compile(self) -> Dict[str, Any]:
+        """
+        Validate every rcParam and the palette cycler once.
+
+        The validated values are cached and reused by apply(). Changes made to
+        rc_params after compiling are not picked up. For a derived theme the
+        result is the parent's compiled rcParams updated with this theme's.
+
+        Returns:
+            Dict[str, Any]: rcParams with validated values, including
+            axes.prop_cycle when the theme has a palette.
+
+        Raises:
+            ValueError: If a key is not a matplotlib rcParam or a value is
+                        invalid, or if the theme inherits from itself.
+            KeyError: If the parent theme is not registered.
+        """
+        return self._compile_chain(())
+
+    def _compile_chain(self, children: tuple) -> Dict[str, Any]:
+        if self._compiled is not None and (self.parent is None or
+                                           self._generation == Theme._registry_generation):
+            return self._compiled
+        if self.parent is None:
+            self._compiled = self._compile_own()
+            return self._compiled
+
+        if self in children:
+            raise ValueError(f"Theme '{self.name}' inherits from itself")
+        base = self._parent_theme()._compile_chain(children + (self,))
+        if self._compiled is None or base is not self._base:
+            compiled = dict(base)
+            compiled.update(self._compile_own())
+            self._compiled = compiled
+            self._base = base
+        self._generation = Theme._registry_generation
+        return self._compiled
+
+    def _compile_own(self) -> Dict[str, Any]:
+        """
+        Validate this theme's own rcParams and palette (not the parent's), once.
+        """
+        if self._own is not None:
+            return self._own
+
+        import matplotlib as mpl
+
+        validators = mpl.RcParams.validate
+        compiled = {}
+        for key, value in self._rc_params.items():
+            if key not in validators:
+                raise ValueError(f"Theme '{self.name}': '{key}' is not a valid rcParam")
+            try:
+                compiled[key] = validators[key](value)
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"Theme '{self.name}': invalid value {value!r} for '{key}': {e}") from e
+
+        if self._palette:
+            try:
+                compiled['axes.prop_cycle'] = validators['axes.prop_cycle'](mpl.cycler(color=self._palette))
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"Theme '{self.name}': invalid palette {self._palette!r}: {e}") from e
+
+        self._own = compiled
+        return compiled
 
     def apply(self):
         """
         Apply this theme to the current matplotlib session.
+
+        Only rcParams whose current value differs from the compiled theme are
+        written, and they bypass matplotlib's validators since compile() has
+        already checked them.
+
+        Bundled fonts are registered on the first apply of a theme that uses them,
+        and pressplot colormaps on the first apply of any theme.
         """
-        # 1. Update rcParams
-        plt.rcParams.update(self._rc_params)
+        import matplotlib as mpl
 
-        # 2. Apply color cycle if palette exists
-        if self._palette:
-            mpl.rcParams['axes.prop_cycle'] = mpl.cycler(color=self._palette)
+        compiled = self.compile()
+        self._prepare()
+
+        rc = mpl.rcParams
+        get = _rc_getter(rc)
+        for key, value in compiled.items():
+            if get(key) != value:
+                _rc_set(rc, key, value)
 
-    def to_dict(self) -> Dict[str, Any]:
+    def _prepare(self):
+        """
+        Register the bundled fonts (if the theme uses them) and the pressplot
+        colormaps, once per theme.
+        """
+        if self._prepared:
+            return
+        from .themes import register_colormaps
+        from .utils import register_fonts, uses_bundled_fonts
+
+        if uses_bundled_fonts(self.compile()):
+            register_fonts()
+        register_colormaps()
+        self._prepared = True
+
+    def to_dict(self, resolved: bool = False) -> Dict[str, Any]:
         """
         Serialize theme to a dictionary.
+
+        Args:
+            resolved (bool): Serialize the theme's full content instead of its
+                             definition: the compiled rcParams merged along the
+                             parent chain and the effective palette, with no
+                             parent reference. A derived theme otherwise holds
+                             only its overrides and its parent's name.
         """
-        return {
+        if resolved:
+            return {"name": self.name, "rc_params": dict(self.compile()), "palette": list(self.palette)}
+        data = {
             "name": self.name,
             "rc_params": self._rc_params,
             "palette": self._palette
         }
+        if self.parent is not None:
+            data["parent"] = self.parent.name if isinstance(self.parent, Theme) else self.parent
+        return data
+
+    def fingerprint(self) -> str:
+        """
+        Stable serialization of the resolved theme, for content keys.
+
+        Changes whenever anything the theme renders with changes, including a
+        parent theme being modified or re-registered. Memoized alongside the
+        compiled rcParams.
+        """
+        import json
+
+        compiled = self.compile()
+        if self._fingerprint is None or self._fingerprint[0] is not compiled:
+            text = json.dumps(self.to_dict(resolved=True), sort_keys=True, default=str)
+            self._fingerprint = (compiled, text)
+        return self._fingerprint[1]
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Theme':
@@ -75,5 +272,78 @@ class Theme:
         return cls(
             name=data.get("name", "unnamed"),
             rc_params=data.get("rc_params", {}),
-            palette=data.get("palette", None)
+            palette=data.get("palette", None),
+            parent=data.get("parent", None)
         )
+
+    @classmethod
+    def _restore(cls, data: Dict[str, Any], compiled: Dict[str, Any]) -> 'Theme':
+        """
+        Rebuild a theme from trusted data whose own rcParams are already
+        compiled, such as an entry of the theme file cache, without copying or
+        re-validating it.
+        """
+        theme = cls.__new__(cls)
+        theme.name = data["name"]
+        theme.parent = data.get("parent")
+        theme._rc_params = data["rc_params"]
+        theme._palette = data["palette"] or []
+        theme._own = compiled
+        theme._compiled = compiled if theme.parent is None else None
+        theme._base = None
+        theme._generation = -1
+        theme._prepared = False
+        theme._fingerprint = None
+        return theme
+
+    @classmethod
+    def from_file(cls, path: str, validate: bool = True) -> 'Theme':
+        """
+        Create a Theme from a TOML, JSON or .mplstyle file.
+
+        Args:
+            path (str): Path of the theme file.
+            validate (bool): Validate the file's rcParams and palette now, as
+                             register_theme_file and register_theme_dir do.
+
+        Raises:
+            ValueError: If the file type is unsupported or the theme is invalid.
+        """
+        from .theme_files import load_theme_file
+
+        return load_theme_file(path, validate=validate)
+
+
+class ThemeContext(ContextDecorator):
+    """
+    Apply a theme temporarily, as a context manager or a decorator.
+
+    Only the rcParams the theme touches (plus axes.prop_cycle) are saved on
+    enter and restored on exit, instead of the full rcParams copy made by
+    matplotlib's rc_context. Contexts nest, and the same instance may be
+    re-entered (e.g. a decorated function calling itself).
+    """
+
+    def __init__(self, theme: Theme):
+        self.theme = theme
+        self._saved = []
+
+    def __enter__(self) -> Theme:
+        import matplotlib as mpl
+
+        get = _rc_getter(mpl.rcParams)
+        keys = set(self.theme.compile())
+        keys.add('axes.prop_cycle')
+        self._saved.append({key: get(key) for key in keys})
+        self.theme.apply()
+        return self.theme
+
+    def __exit__(self, *exc_info):
+        import matplotlib as mpl
+
+        rc = mpl.rcParams
+        get = _rc_getter(rc)
+        for key, value in self._saved.pop().items():
+            if get(key) != value:
+                _rc_set(rc, key, value)
+        return False
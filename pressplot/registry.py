@@ -1,47 +1,257 @@
-from typing import Dict
+import os
+import sys
+import threading
+from typing import Callable, Dict, List, Optional
 
 from .core import Theme
 
+# Entry point group scanned for theme plugins. Each entry point is named after
+# its theme and points at a Theme or a zero-argument callable returning one:
+#
+#     [project.entry-points."pressplot.themes"]
+#     acme_dark = "acme_themes:dark_theme"
+ENTRY_POINT_GROUP = "pressplot.themes"
+
+# os.pathsep-separated theme files or directories of theme files, registered
+# lazily on discovery.
+THEME_PATH_ENV = "PRESSPLOT_THEME_PATH"
+
+THEME_FILE_EXTENSIONS = ('.toml', '.json', '.mplstyle')
+
+
+def theme_files(directory: str) -> List[str]:
+    """
+    Theme files directly inside *directory*, sorted by name.
+    """
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.lower().endswith(THEME_FILE_EXTENSIONS))
+
+
+def _entry_point_provider(entry_point) -> Callable[[], Theme]:
+    def load():
+        obj = entry_point.load()
+        return obj if isinstance(obj, Theme) else obj()
+    return load
+
+
+def _may_declare(group: str) -> bool:
+    """
+    Whether an installed distribution may declare entry points of *group*.
+
+    A conservative pre-check that spares the common no-plugin case the ~20 ms
+    import of importlib.metadata: it only answers False when every
+    *.dist-info / *.egg-info directory on sys.path has an entry_points.txt
+    that does not mention the group. Zip archives on sys.path and custom
+    distribution finders count as possible matches.
+    """
+    from importlib.machinery import PathFinder
+
+    if any(finder is not PathFinder and hasattr(finder, "find_distributions") for finder in sys.meta_path):
+        return True
+    for directory in sys.path:
+        if os.path.isfile(directory):
+            return True
+        try:
+            entries = os.scandir(directory or ".")
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if not entry.name.endswith((".dist-info", ".egg-info")):
+                    continue
+                try:
+                    with open(os.path.join(entry.path, "entry_points.txt"), encoding="utf-8") as f:
+                        if group in f.read():
+                            return True
+                except OSError:
+                    continue
+    return False
+
+
+def _entry_points(group: str) -> list:
+    """
+    Entry points of *group* declared by the installed distributions.
+    """
+    if not _may_declare(group):
+        return []
+    # Imported here: importlib.metadata is slow to import and discovery only
+    # runs on the first lookup of an unknown theme name.
+    from importlib import metadata
+
+    if sys.version_info >= (3, 10):
+        return list(metadata.entry_points(group=group))
+    return list(metadata.entry_points().get(group, ()))
+
+
+def _file_provider(path: str, name: str) -> Callable[[], Theme]:
+    def load():
+        from .theme_files import _check_name, load_theme_file
+
+        return _check_name(path, load_theme_file(path, validate=False), name)
+    return load
+
 
 class ThemeRegistry:
     """
     A central registry to manage available themes.
+
+    Besides built Theme objects, the registry holds lazy providers: factories
+    (entry points, theme files) that are only called when a theme is first
+    requested by name. Listing themes never loads a provider.
+
+    The registry is thread-safe: registration, discovery and provider
+    resolution hold a re-entrant lock (so a provider may register themes
+    itself), and each provider is called at most once. Lookups of already
+    built themes do not lock.
     """
     _instance = None
-    _themes: Dict[str, Theme] = {}
+    _instance_lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(ThemeRegistry, cls).__new__(cls)
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(ThemeRegistry, cls).__new__(cls)
+                    instance._themes: Dict[str, Theme] = {}
+                    instance._providers: Dict[str, Callable[[], Theme]] = {}
+                    instance._discovered = False
+                    instance._lock = threading.RLock()
+                    cls._instance = instance
         return cls._instance
 
-    def register(self, theme: Theme):
+    def register(self, theme: Theme, validate: bool = True):
         """
         Register a new theme.
+
+        Args:
+            theme (Theme): The theme to register.
+            validate (bool): Compile (validate) the theme now. When False it is
+                             compiled on its first apply instead.
         """
         if not isinstance(theme, Theme):
             raise TypeError("Argument must be an instance of Theme")
-        self._themes[theme.name] = theme
+        if validate:
+            theme.compile()
+        with self._lock:
+            self._providers.pop(theme.name, None)
+            self._themes[theme.name] = theme
+            Theme._registry_generation += 1
+
+    def register_provider(self, name: str, factory: Callable[[], Theme]):
+        """
+        Register a theme that is built on its first lookup.
+
+        Args:
+            name (str): Name of the theme the factory returns.
+            factory (Callable[[], Theme]): Zero-argument callable returning the
+                                           theme. Called at most once.
+        """
+        if not callable(factory):
+            raise TypeError("factory must be callable")
+        with self._lock:
+            self._themes.pop(name, None)
+            self._providers[name] = factory
+            Theme._registry_generation += 1
+
+    def register_path(self, path: str, name: Optional[str] = None) -> str:
+        """
+        Register a theme file (TOML, JSON or .mplstyle) without reading it.
+
+        Args:
+            path (str): Path of the theme file.
+            name (Optional[str]): Theme name. Defaults to the file stem. The
+                                  name inside the file must match it, which
+                                  is checked when the theme is first loaded.
+
+        Returns:
+            str: The name the theme was registered under.
+        """
+        if name is None:
+            name = os.path.splitext(os.path.basename(path))[0]
+        self.register_provider(name, _file_provider(path, name))
+        return name
+
+    def discover(self):
+        """
+        Register lazy providers for installed theme plugins and for the files
+        listed in $PRESSPLOT_THEME_PATH.
+
+        Only metadata is read: entry point modules are not imported and theme
+        files, registered under their file stem, are not opened until their
+        theme is requested. Names that are
+        already registered keep their current theme. Runs automatically on the
+        first lookup of an unknown name and on list_themes().
+        """
+        found = {}
+        for entry_point in _entry_points(ENTRY_POINT_GROUP):
+            found.setdefault(entry_point.name, _entry_point_provider(entry_point))
+
+        for entry in filter(None, os.environ.get(THEME_PATH_ENV, "").split(os.pathsep)):
+            if os.path.isdir(entry):
+                paths = theme_files(entry)
+            elif entry.lower().endswith(THEME_FILE_EXTENSIONS):
+                paths = [entry]
+            else:
+                continue
+            for path in paths:
+                name = os.path.splitext(os.path.basename(path))[0]
+                found.setdefault(name, _file_provider(path, name))
+
+        with self._lock:
+            self._discovered = True
+            for name, factory in found.items():
+                if name not in self._themes and name not in self._providers:
+                    self._providers[name] = factory
+
+    def _ensure_discovered(self):
+        if not self._discovered:
+            with self._lock:
+                if not self._discovered:
+                    self.discover()
 
     def get(self, name: str) -> Theme:
         """
-        Retrieve a theme by name.
+        Retrieve a theme by name, building it first if it has a provider.
         """
-        if name not in self._themes:
-            raise KeyError(f"Theme '{name}' not found. Available themes: {list(self._themes.keys())}")
-        return self._themes[name]
+        theme = self._themes.get(name)
+        if theme is not None:
+            return theme
+
+        with self._lock:
+            theme = self._themes.get(name)
+            if theme is not None:
+                return theme
+            if name not in self._providers:
+                self._ensure_discovered()
+                if name not in self._providers:
+                    raise KeyError(f"Theme '{name}' not found. Available themes: {self.list_themes()}")
+
+            theme = self._providers[name]()
+            if not isinstance(theme, Theme):
+                raise TypeError(f"Provider for theme '{name}' returned {type(theme).__name__}, not a Theme")
+            if theme.name != name:
+                raise ValueError(f"Provider for theme '{name}' returned a theme named '{theme.name}'")
+            del self._providers[name]
+            self._themes[name] = theme
+            return theme
 
     def list_themes(self) -> list:
         """
-        List all registered theme names.
+        List all registered theme names, including themes not loaded yet.
         """
-        return list(self._themes.keys())
+        self._ensure_discovered()
+        with self._lock:
+            return list(self._themes.keys()) + list(self._providers.keys())
 
     def clear(self):
         """
-        Clear all registered themes.
+        Clear all registered themes and providers.
         """
-        self._themes.clear()
+        with self._lock:
+            self._themes.clear()
+            self._providers.clear()
+            self._discovered = True
+            Theme._registry_generation += 1
 
 
 # Global instance
@@ -0,0 +1,581 @@
+"""
+Long-lived render daemon: ``pressplot serve``.
+
+Keeps a pool of warm worker processes (matplotlib imported, fonts and
+colormaps registered, themes compiled) and renders chart jobs sent over
+localhost HTTP or a Unix socket, returning the encoded image with the Clean
+Modern border, so a small chart costs tens of milliseconds instead of a fresh
+interpreter.
+
+    pressplot serve --socket /tmp/pressplot.sock --allow "reports.charts:*" -j 4
+
+A job is a JSON object POSTed to ``/render``:
+
+    {"chart": "reports.charts:revenue",      # module:function drawing a figure
+     "args": [...], "kwargs": {...},         # passed to the function
+     "theme": "clean_modern", "format": "png", "dpi": 150,
+     "border_width": 80, "border_color": "#F1F0EA", "timeout": 10,
+     "quantize": true}                       # encoder options, as in
+                                             # save_clean_modern_style
+
+The chart function returns its Figure (or leaves it as pyplot's current
+figure). Only functions matching an ``--allow`` pattern can be run. A job
+may instead carry a declarative chart spec, ``{"spec": {...}}`` (see
+pressplot.specs); specs are plain data, so they need no ``--allow``, except
+types that open files named in the spec (choropleth), which need ``--allow
+"spec:choropleth"``. A job's ``timeout`` must be a positive number of
+seconds and is capped at the server's ``--timeout``. The
+response body is the image; errors come back as JSON with status 400 (bad
+job), 403 (chart not allowed), 500 (chart raised), 503 (queue full or no
+live worker, retry later) or 504 (timed out; the worker is replaced).
+``GET /health`` returns pool statistics, with status 503 while no worker is
+live. request_chart() is a small client for both transports.
+"""
+import argparse
+import fnmatch
+import http.client
+import io
+import json
+import logging
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from .batch import _resolve_callable, warm_worker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+MAX_REQUEST_BYTES = 64 << 20
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "tif": "image/tiff",
+    "tiff": "image/tiff",
+    "svg": "image/svg+xml",
+    "pdf": "application/pdf",
+}
+
+
+class ServeError(RuntimeError):
+    """
+    A chart job that could not be rendered, with the HTTP status describing why.
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _render_job(job: Dict[str, Any]) -> Tuple[bytes, Dict[str, float]]:
+    """
+    Render one job in a warm worker and return the image bytes and timings.
+    """
+    import matplotlib as mpl
+    import matplotlib.pyplot as plt
+    from matplotlib.figure import Figure
+
+    from . import theme_context
+    from .utils import ENCODER_OPTIONS, collect_export_timings, save_clean_modern_style
+
+    buf = io.BytesIO()
+    start = time.perf_counter()
+    encoder = {key: job[key] for key in ENCODER_OPTIONS if key in job}
+    if "spec" in job:
+        from .specs import render_spec
+
+        with collect_export_timings() as timings:
+            render_spec(dict(job["spec"], format=job["format"], **encoder), buf)
+        return buf.getvalue(), {"wall": time.perf_counter() - start, "render": timings["render"],
+                                "encode": timings["encode"]}
+
+    func = _resolve_callable(job["chart"])
+    try:
+        with mpl.rc_context(), theme_context(job.get("theme", "clean_modern")), \
+                collect_export_timings() as timings:
+            fig = func(*job.get("args", ()), **job.get("kwargs", {}))
+            if not isinstance(fig, Figure):
+                fig = plt.gcf()
+            kwargs = {"dpi": job["dpi"]} if job.get("dpi") else {}
+            save_clean_modern_style(fig, buf, format=job["format"], border_width=job.get("border_width", 80),
+                                    border_color=job.get("border_color", "#F1F0EA"), **kwargs, **encoder)
+    finally:
+        plt.close("all")
+    return buf.getvalue(), {"wall": time.perf_counter() - start, "render": timings["render"],
+                            "encode": timings["encode"]}
+
+
+def _worker_main(conn, themes: Sequence[str], theme_dirs: Sequence[str]):
+    # Ctrl-C reaches the whole process group; the parent shuts workers down.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    from . import register_theme_dir
+
+    for directory in theme_dirs:
+        register_theme_dir(directory)
+    warm_worker(themes)
+    conn.send("ready")
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send(("ok",) + _render_job(job))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    def __init__(self, ctx, themes: Sequence[str], theme_dirs: Sequence[str]):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, tuple(themes), tuple(theme_dirs)),
+                                   daemon=True)
+        self.process.start()
+        child.close()
+        self.ready = False
+
+    def wait_ready(self, timeout: float) -> bool:
+        try:
+            return self.conn.poll(timeout) and self.conn.recv() == "ready"
+        except (EOFError, OSError):
+            return False
+
+    def stop(self, wait: bool = True):
+        self.conn.close()
+        if self.process.is_alive():
+            self.process.kill()
+        if wait:
+            self.process.join(5)
+
+
+class RenderPool:
+    """
+    Warm worker processes behind a bounded job queue.
+
+    At most ``workers + queue_size`` jobs are accepted at once; further jobs
+    are rejected immediately (ServeError 503) instead of piling up. A job that
+    exceeds its timeout gets ServeError 504 and its worker is killed and
+    replaced in the background. A worker that fails to warm up is retried
+    with exponential backoff, up to *start_attempts* times.
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue_size: int = 16,
+                 themes: Sequence[str] = ("clean_modern",), theme_dirs: Sequence[str] = (),
+                 allow: Sequence[str] = (), timeout: float = 30.0, start_timeout: float = 120.0,
+                 start_attempts: int = 3):
+        """
+        Args:
+            workers (Optional[int]): Number of worker processes. Defaults to the CPU count.
+            queue_size (int): Jobs that may wait for a free worker.
+            themes (Sequence[str]): Themes compiled in each worker; the first is applied.
+            theme_dirs (Sequence[str]): Theme file directories registered in each worker.
+            allow (Sequence[str]): fnmatch patterns of the ``module:function``
+                                   charts clients may run, and of
+                                   ``spec:<type>`` for FILE_SPEC_TYPES specs.
+            timeout (float): Default and maximum per-job timeout in seconds,
+                             queueing included.
+            start_timeout (float): Seconds a new worker may take to warm up.
+            start_attempts (int): Times a worker slot is started before giving up.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.themes = tuple(themes)
+        self.theme_dirs = tuple(theme_dirs)
+        self.allow = tuple(allow)
+        self.timeout = timeout
+        self.start_timeout = start_timeout
+        self.start_attempts = max(start_attempts, 1)
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._slots = threading.BoundedSemaphore(self.workers + queue_size)
+        self._all = set()
+        self._starting = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {"served": 0, "failed": 0, "rejected": 0, "timeouts": 0, "restarts": 0,
+                      "start_failures": 0}
+        for _ in range(self.workers):
+            self._start_worker()
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _start_worker(self):
+        with self._lock:
+            self._starting += 1
+        threading.Thread(target=self._run_worker_start, daemon=True).start()
+
+    def _run_worker_start(self):
+        """
+        Start one worker, retrying with backoff (1s, 2s, 4s, ... up to 30s)
+        while it fails to warm up.
+        """
+        try:
+            for attempt in range(self.start_attempts):
+                if attempt:
+                    time.sleep(min(2 ** (attempt - 1), 30))
+                if self._closed:
+                    return
+                try:
+                    worker = _Worker(self._ctx, self.themes, self.theme_dirs)
+                except Exception as e:
+                    reason = f"{type(e).__name__}: {e}"
+                else:
+                    with self._lock:
+                        self._all.add(worker)
+                    if worker.wait_ready(self.start_timeout) and not self._closed:
+                        worker.ready = True
+                        self._idle.put(worker)
+                        return
+                    worker.process.join(1)
+                    reason = f"exit code {worker.process.exitcode}" if worker.process.exitcode is not None \
+                        else f"not ready within {self.start_timeout:g}s"
+                    self._discard(worker)
+                if self._closed:
+                    return
+                self._count("start_failures")
+                logger.error("Render worker failed to start (%s, attempt %d of %d)", reason, attempt + 1,
+                             self.start_attempts)
+            logger.error("Giving up on a render worker after %d failed starts", self.start_attempts)
+        finally:
+            with self._lock:
+                self._starting -= 1
+
+    def _discard(self, worker: _Worker):
+        with self._lock:
+            self._all.discard(worker)
+        worker.stop()
+
+    def _live(self) -> int:
+        with self._lock:
+            return sum(worker.ready for worker in self._all)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every worker has warmed up or given up (or *timeout*
+        seconds pass).
+
+        Returns:
+            bool: True if at least one worker is live, False on timeout or
+            when no worker could be started.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                starting = self._starting
+            if not starting:
+                return self._live() > 0
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+
+    def _job_timeout(self, job: Dict[str, Any]) -> float:
+        """
+        The job's timeout: a positive number of seconds, capped at the pool's.
+        """
+        value = job.get("timeout")
+        if value is None:
+            return self.timeout
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or \
+                not math.isfinite(value) or value <= 0:
+            raise ServeError(400, f"'timeout' must be a positive number of seconds, got {value!r}")
+        return min(float(value), self.timeout)
+
+    def _check(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        if isinstance(job, dict) and "spec" in job:
+            from .specs import FILE_SPEC_TYPES, spec_format, validate_spec
+
+            try:
+                validate_spec(job["spec"])
+            except ValueError as e:
+                raise ServeError(400, str(e)) from None
+            chart = f"spec:{job['spec']['type']}"
+            # These specs read client-named paths or URLs on the server
+            if job["spec"]["type"] in FILE_SPEC_TYPES and \
+                    not any(fnmatch.fnmatchcase(chart, pattern) for pattern in self.allow):
+                raise ServeError(403, f"'{chart}' jobs read server files and are not allowed (see --allow)")
+            fmt = str(job.get("format") or spec_format(job["spec"])).lower()
+            job = dict(job, chart=chart)
+        elif not isinstance(job, dict) or not isinstance(job.get("chart"), str):
+            raise ServeError(400, "job must be an object with a 'chart' module:function string or a 'spec'")
+        else:
+            chart = job["chart"]
+            if not any(fnmatch.fnmatchcase(chart, pattern) for pattern in self.allow):
+                raise ServeError(403, f"chart '{chart}' is not allowed (see --allow)")
+            fmt = str(job.get("format", "png")).lower()
+        if fmt not in CONTENT_TYPES:
+            raise ServeError(400, f"unsupported format '{fmt}', expected one of {sorted(CONTENT_TYPES)}")
+        return dict(job, format=fmt, timeout=self._job_timeout(job))
+
+    def render(self, job: Dict[str, Any]) -> Tuple[bytes, str, Dict[str, float]]:
+        """
+        Render a job on a free worker.
+
+        Returns:
+            Tuple[bytes, str, Dict[str, float]]: Image bytes, content type and
+            timings (wall, render, encode seconds in the worker).
+
+        Raises:
+            ServeError: 400/403 for invalid jobs, 500 if the chart raised,
+                        503 if the queue is full or no worker is running,
+                        504 on timeout.
+        """
+        job = self._check(job)
+        timeout = job["timeout"]
+        with self._lock:
+            running = bool(self._all) or self._starting > 0
+        if not running:
+            self._count("rejected")
+            raise ServeError(503, "no render worker is running")
+        if self._closed or not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            raise ServeError(503, "render queue is full")
+        try:
+            deadline = time.monotonic() + timeout
+            try:
+                worker = self._idle.get(timeout=timeout)
+            except queue.Empty:
+                self._count("timeouts")
+                raise ServeError(504, f"no worker became free within {timeout:g}s") from None
+            try:
+                worker.conn.send(job)
+                ready = worker.conn.poll(max(deadline - time.monotonic(), 0))
+                reply = worker.conn.recv() if ready else None
+            except (EOFError, OSError) as e:
+                self._replace(worker, "restarts")
+                raise ServeError(500, f"render worker died: {e}") from e
+            if reply is None:
+                self._replace(worker, "timeouts")
+                raise ServeError(504, f"chart '{job['chart']}' timed out after {timeout:g}s")
+            self._idle.put(worker)
+        finally:
+            self._slots.release()
+
+        if reply[0] != "ok":
+            self._count("failed")
+            raise ServeError(500, reply[1])
+        self._count("served")
+        return reply[1], CONTENT_TYPES[job["format"]], reply[2]
+
+    def _replace(self, worker: _Worker, reason: str):
+        self._count(reason)
+        self._discard(worker)
+        if not self._closed:
+            self._start_worker()
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Pool statistics: worker counts and served/failed/rejected/timeout totals.
+
+        ``healthy`` is False while no worker is live (warmed up).
+        """
+        with self._lock:
+            live = sum(worker.ready for worker in self._all)
+            return dict(self.stats, workers=len(self._all), live=live, idle=self._idle.qsize(),
+                        starting=self._starting, healthy=live > 0)
+
+    def close(self):
+        """
+        Stop all workers.
+        """
+        self._closed = True
+        with self._lock:
+            workers = list(self._all)
+            self._all.clear()
+        for worker in workers:
+            worker.stop(wait=False)
+        for worker in workers:
+            worker.process.join(5)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _reply_json(self, status: int, data: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        self._reply(status, json.dumps(data).encode(), "application/json", headers)
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._reply_json(404, {"error": f"unknown path {self.path}"})
+        health = self.server.pool.health()
+        self._reply_json(200 if health["healthy"] else 503, health)
+
+    def do_POST(self):
+        if self.path != "/render":
+            return self._reply_json(404, {"error": f"unknown path {self.path}"})
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_REQUEST_BYTES:
+            self.close_connection = True
+            return self._reply_json(413, {"error": f"job larger than {MAX_REQUEST_BYTES} bytes"})
+        try:
+            job = json.loads(self.rfile.read(length))
+            data, content_type, timings = self.server.pool.render(job)
+        except json.JSONDecodeError as e:
+            return self._reply_json(400, {"error": f"invalid JSON: {e}"})
+        except ServeError as e:
+            headers = {"Retry-After": "1"} if e.status == 503 else None
+            return self._reply_json(e.status, {"error": str(e)}, headers)
+        self._reply(200, data, content_type, {"X-Render-Time": f"{timings['wall']:.4f}"})
+
+    def address_string(self):
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class _UnixHTTPServer(ThreadingHTTPServer):
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        socketserver.TCPServer.server_bind(self)
+        os.chmod(self.server_address, 0o600)
+        self.server_name = "localhost"
+        self.server_port = 0
+
+
+def make_server(pool: RenderPool, socket_path: Optional[str] = None, host: str = "127.0.0.1",
+                port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """
+    Create the HTTP server for *pool* on a Unix socket or a TCP address.
+    """
+    if socket_path:
+        server = _UnixHTTPServer(socket_path, _Handler)
+    else:
+        server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.pool = pool
+    return server
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+def request_chart(job: Dict[str, Any], socket_path: Optional[str] = None, host: str = "127.0.0.1",
+                  port: int = DEFAULT_PORT, timeout: Optional[float] = None) -> bytes:
+    """
+    Send a job to a running ``pressplot serve`` and return the image bytes.
+
+    Args:
+        job (Dict[str, Any]): The chart job (see the module docstring).
+        socket_path (Optional[str]): Unix socket of the daemon; TCP otherwise.
+        host (str): Daemon host for TCP.
+        port (int): Daemon port for TCP.
+        timeout (Optional[float]): Socket timeout in seconds.
+
+    Returns:
+        bytes: The encoded image.
+
+    Raises:
+        ServeError: If the daemon could not render the job.
+    """
+    if socket_path:
+        conn = _UnixConnection(socket_path, timeout=timeout)
+    else:
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        conn.request("POST", "/render", body=json.dumps(job), headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        body = response.read()
+    finally:
+        conn.close()
+    if response.status != 200:
+        try:
+            message = json.loads(body)["error"]
+        except (ValueError, KeyError):
+            message = body.decode(errors="replace")
+        raise ServeError(response.status, message)
+    return body
+
+
+def build_parser(parser: Optional[argparse.ArgumentParser] = None) -> argparse.ArgumentParser:
+    """
+    Add the serve command-line options to *parser* (or a new parser).
+    """
+    if parser is None:
+        parser = argparse.ArgumentParser(prog="pressplot serve", description="Run the render daemon.")
+    parser.add_argument("--socket", help="Listen on this Unix socket instead of TCP.")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host (default 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"TCP port (default {DEFAULT_PORT}).")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--queue-size", type=int, default=16, help="Jobs that may wait for a worker.")
+    parser.add_argument("--timeout", type=float, default=30.0,
+                        help="Default and maximum per-job timeout in seconds.")
+    parser.add_argument("--theme", action="append", dest="themes",
+                        help="Theme to pre-compile in workers (repeatable, first is applied).")
+    parser.add_argument("--theme-dir", action="append", dest="theme_dirs", default=[],
+                        help="Directory of theme files to register in workers (repeatable).")
+    parser.add_argument("--allow", action="append", default=[],
+                        help="module:function pattern of charts clients may run, or spec:choropleth "
+                             "to accept choropleth specs (repeatable).")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None, args: Optional[argparse.Namespace] = None) -> int:
+    """
+    Entry point for ``pressplot serve``.
+    """
+    if args is None:
+        args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    # Shut down (and remove the socket) on SIGTERM as on Ctrl-C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    if not args.allow:
+        logger.warning("No --allow patterns given: only chart spec jobs (except choropleth) will be rendered")
+
+    pool = RenderPool(args.workers, args.queue_size, themes=args.themes or ("clean_modern",),
+                      theme_dirs=args.theme_dirs, allow=args.allow, timeout=args.timeout)
+    try:
+        server = make_server(pool, args.socket, args.host, args.port)
+        start = time.perf_counter()
+        if not pool.wait_ready():
+            logger.error("No render worker could be started")
+            server.server_close()
+            if args.socket and os.path.exists(args.socket):
+                os.unlink(args.socket)
+            return 1
+        where = args.socket or f"http://{args.host}:{args.port}"
+        logger.info("%d of %d warm workers ready in %.1fs, listening on %s", pool.health()["live"], pool.workers,
+                    time.perf_counter() - start, where)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if args.socket and os.path.exists(args.socket):
+                os.unlink(args.socket)
+    finally:
+        pool.close()
+    return 0
@@ -0,0 +1,320 @@
+"""
+Small multiples: many small Clean Modern panels in one figure, without Axes.
+
+A grid of standard Axes spends most of its time on per-Axes machinery
+(tick locators, formatters, one Text and one Line2D per tick, spines) that
+is identical from panel to panel. SmallMultiples lays out lightweight panels
+instead. Each panel is a rectangle in figure coordinates. Its data artists
+are placed there with a plain transform and clipped to it, and the
+decorations are built once for the whole figure:
+
+- tick positions and labels are computed once per shared axis;
+- all gridlines and baselines are one LineCollection;
+- all tick labels and panel titles are LabelCollections, one draw call each.
+
+    grid = pressplot.SmallMultiples(20, 20, figsize=(24, 24))
+    for panel, (country, series) in zip(grid, data.items()):
+        panel.plot(years, series)
+        panel.set_title(country)
+    pressplot.save_clean_modern_style(grid.figure, "dashboard.png")
+
+Panels share their x and y limits by default (sharex/sharey), so tick labels
+are drawn on the bottom row and the right column only; the y labels are on
+the right, as in the Clean Modern theme. The decorations are built when the
+figure is first drawn, after all the data has been added.
+"""
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.font_manager import FontProperties, findfont
+from matplotlib.lines import Line2D
+from matplotlib.ticker import MaxNLocator
+from matplotlib.transforms import Bbox, BboxTransformFrom, BboxTransformTo, IdentityTransform, TransformedBbox
+
+from .artists import LabelCollection
+from .core import Theme
+from .thread_themes import ThemedFigure, thread_theme
+
+
+def _format_tick(value: float) -> str:
+    return f"{value:g}"
+
+
+class Panel:
+    """
+    One panel of a SmallMultiples grid.
+
+    Attributes:
+        row (int): Row index, from the top.
+        col (int): Column index, from the left.
+        bbox (Bbox): The panel rectangle in figure coordinates.
+        transData (Transform): Data coordinates to display coordinates.
+    """
+
+    def __init__(self, grid: "SmallMultiples", row: int, col: int, bbox: Bbox):
+        self.grid = grid
+        self.row = row
+        self.col = col
+        self.bbox = bbox
+        self.title: Optional[str] = None
+        self.xlim: Optional[Tuple[float, float]] = None
+        self.ylim: Optional[Tuple[float, float]] = None
+        self.artists = []
+        self._data_bbox = Bbox.unit()
+        self._data_limits = Bbox.null()
+        self._clip_box = TransformedBbox(bbox, grid.figure.transFigure)
+        self.transData = BboxTransformFrom(self._data_bbox) + BboxTransformTo(self._clip_box)
+
+    def _add(self, artist, x, y, transform=None):
+        artist.set_transform(self.transData if transform is None else transform)
+        artist.set_clip_box(self._clip_box)
+        xy = np.column_stack([np.asarray(x, dtype=float).ravel(), np.asarray(y, dtype=float).ravel()])
+        self._data_limits.update_from_data_xy(xy[np.isfinite(xy).all(axis=1)], ignore=False)
+        self.grid.figure.add_artist(artist)
+        self.artists.append(artist)
+        self.grid._stale = True
+        return artist
+
+    def _next_color(self):
+        return self.grid.colors[sum(isinstance(a, Line2D) for a in self.artists) % len(self.grid.colors)]
+
+    def plot(self, x, y, color=None, **kwargs) -> Line2D:
+        """
+        Add a line to the panel.
+
+        Args:
+            x: X values.
+            y: Y values.
+            color: Line color. Defaults to the theme's color cycle.
+            **kwargs: Additional Line2D properties (linewidth, zorder, ...).
+
+        Returns:
+            Line2D: The line.
+        """
+        kwargs.setdefault("linewidth", self.grid.linewidth)
+        with thread_theme(self.grid.figure.theme):
+            line = Line2D(x, y, color=self._next_color() if color is None else color, **kwargs)
+        return self._add(line, x, y)
+
+    def scatter(self, x, y, s=12, color=None, **kwargs) -> PathCollection:
+        """
+        Add points to the panel.
+
+        Args:
+            x: X values.
+            y: Y values.
+            s: Marker area in points^2, one value or one per point.
+            color: Marker color. Defaults to the theme's first color.
+            **kwargs: Additional PathCollection properties (alpha, zorder, ...).
+
+        Returns:
+            PathCollection: The markers.
+        """
+        from matplotlib.markers import MarkerStyle
+
+        marker = MarkerStyle("o")
+        path = marker.get_path().transformed(marker.get_transform())
+        offsets = np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)])
+        with thread_theme(self.grid.figure.theme):
+            points = PathCollection((path,), sizes=np.atleast_1d(s), offsets=offsets,
+                                    facecolors=self.grid.colors[0] if color is None else color,
+                                    edgecolors="none", **kwargs)
+        points.set_offset_transform(self.transData)
+        return self._add(points, x, y, transform=IdentityTransform())
+
+    def set_title(self, title: str):
+        """
+        Set the panel title, drawn above its top left corner.
+        """
+        self.title = title
+        self.grid._stale = True
+
+    def set_xlim(self, left: float, right: float):
+        """
+        Fix the panel's x limits (with sharex, the limits of every panel).
+        """
+        self.xlim = (left, right)
+        self.grid._stale = True
+
+    def set_ylim(self, bottom: float, top: float):
+        """
+        Fix the panel's y limits (with sharey, the limits of every panel).
+        """
+        self.ylim = (bottom, top)
+        self.grid._stale = True
+
+
+class _SmallMultiplesFigure(ThemedFigure):
+    """
+    A ThemedFigure that (re)builds the grid decorations before drawing.
+    """
+
+    def draw(self, renderer):
+        self._grid._build()
+        super().draw(renderer)
+
+
+class SmallMultiples:
+    """
+    A grid of lightweight panels in one themed figure.
+    """
+
+    def __init__(self, nrows: int, ncols: int, figsize: Optional[Tuple[float, float]] = None,
+                 theme: Union[str, Theme] = "clean_modern", sharex: bool = True, sharey: bool = True,
+                 left: float = 0.03, right: float = 0.93, bottom: float = 0.05, top: float = 0.93,
+                 wspace: float = 0.25, hspace: float = 0.45, nticks: int = 3, fontsize: float = 9,
+                 title_size: Optional[float] = None, linewidth: float = 1.5,
+                 formatter: Callable[[float], str] = _format_tick, title: Optional[str] = None, **kwargs):
+        """
+        Initialize a SmallMultiples grid.
+
+        Args:
+            nrows (int): Number of panel rows.
+            ncols (int): Number of panel columns.
+            figsize (Optional[Tuple[float, float]]): Figure size in inches.
+                Defaults to 1.2 inches per panel.
+            theme (Union[str, Theme]): Theme the figure is built and drawn under.
+            sharex (bool): Give every panel the same x limits and ticks.
+            sharey (bool): Give every panel the same y limits and ticks.
+            left, right, bottom, top (float): Grid extent as figure fractions.
+            wspace, hspace (float): Gaps between panels, as fractions of the
+                                    panel width and height.
+            nticks (int): Target number of ticks per axis.
+            fontsize (float): Tick label size in points.
+            title_size (Optional[float]): Panel title size. Defaults to
+                                          fontsize + 2.
+            linewidth (float): Default line width of panel.plot.
+            formatter (Callable[[float], str]): Turns tick values into labels.
+            title (Optional[str]): Figure title.
+            **kwargs: Passed to the figure (dpi, ...).
+        """
+        if figsize is None:
+            figsize = (1.2 * ncols + 1, 1.2 * nrows + 1)
+        with thread_theme(theme) as resolved:
+            self.figure = _SmallMultiplesFigure(theme=resolved, figsize=figsize, **kwargs)
+            self.colors = mpl.rcParams["axes.prop_cycle"].by_key().get("color") or ["#E62A24"]
+            self.grid_color = mpl.rcParams["grid.color"]
+            self.spine_color = mpl.rcParams["axes.edgecolor"]
+            self.grid_width = min(mpl.rcParams["grid.linewidth"], 0.8)
+            self.margins = (mpl.rcParams["axes.xmargin"], mpl.rcParams["axes.ymargin"])
+            # Resolved to a font file now: labels are created while drawing
+            self.font = FontProperties(fname=findfont(FontProperties(weight=mpl.rcParams["font.weight"])))
+            if title:
+                self.figure.text(left, 0.99, title, ha="left", va="top", fontsize=fontsize * 2.4,
+                                 fontweight="bold")
+        self.figure._grid = self
+        self.nrows, self.ncols = nrows, ncols
+        self.sharex, self.sharey = sharex, sharey
+        self.nticks = nticks
+        self.fontsize = fontsize
+        self.title_size = fontsize + 2 if title_size is None else title_size
+        self.linewidth = linewidth
+        self.formatter = formatter
+        self._decorations = []
+        self._stale = True
+
+        width = (right - left) / (ncols + wspace * (ncols - 1))
+        height = (top - bottom) / (nrows + hspace * (nrows - 1))
+        self.panels: List[Panel] = []
+        for row in range(nrows):
+            for col in range(ncols):
+                x0 = left + col * width * (1 + wspace)
+                y1 = top - row * height * (1 + hspace)
+                self.panels.append(Panel(self, row, col, Bbox.from_bounds(x0, y1 - height, width, height)))
+
+    def __len__(self) -> int:
+        return len(self.panels)
+
+    def __iter__(self) -> Iterator[Panel]:
+        return iter(self.panels)
+
+    def __getitem__(self, index: Union[int, Tuple[int, int]]) -> Panel:
+        if isinstance(index, tuple):
+            row, col = index
+            return self.panels[row * self.ncols + col]
+        return self.panels[index]
+
+    def _limits(self, panels: Sequence[Panel], axis: int) -> Tuple[float, float]:
+        """
+        Limits of *panels* along one axis: fixed ones, else the data range plus margins.
+        """
+        fixed = [p.xlim if axis == 0 else p.ylim for p in panels]
+        fixed = [f for f in fixed if f is not None]
+        if fixed:
+            return fixed[-1]
+        lows = [p._data_limits.get_points()[0, axis] for p in panels if p.artists]
+        highs = [p._data_limits.get_points()[1, axis] for p in panels if p.artists]
+        if not lows:
+            return 0.0, 1.0
+        lo, hi = min(lows), max(highs)
+        if lo == hi:
+            return lo - 0.5, hi + 0.5
+        margin = (hi - lo) * self.margins[axis]
+        return lo - margin, hi + margin
+
+    def _ticks(self, lo: float, hi: float) -> Tuple[np.ndarray, List[str]]:
+        ticks = MaxNLocator(self.nticks, steps=[1, 2, 2.5, 5, 10]).tick_values(lo, hi)
+        ticks = ticks[(ticks >= min(lo, hi)) & (ticks <= max(lo, hi))]
+        return ticks, [self.formatter(t) for t in ticks]
+
+    def _build(self):
+        """
+        Resolve the limits and rebuild the gridlines, tick labels and titles.
+        """
+        if not self._stale:
+            return
+        for artist in self._decorations:
+            artist.remove()
+        self._decorations = []
+
+        shared = {0: self._limits(self.panels, 0) if self.sharex else None,
+                  1: self._limits(self.panels, 1) if self.sharey else None}
+        shared_ticks = {axis: self._ticks(*limits) for axis, limits in shared.items() if limits is not None}
+
+        grid_segments, base_segments, tick_segments = [], [], []
+        labels, label_xy = {"x": [], "y": []}, {"x": [], "y": []}
+        titles, title_xy = [], []
+        tick_len = 3 / 72 / self.figure.get_figheight()  # 3 points, as a figure fraction
+        for panel in self.panels:
+            (x0, y0), (x1, y1) = panel.bbox.get_points()
+            xlim = shared[0] or self._limits([panel], 0)
+            ylim = shared[1] or self._limits([panel], 1)
+            panel._data_bbox.set_points(np.array([[xlim[0], ylim[0]], [xlim[1], ylim[1]]], dtype=float))
+            xticks, xlabels = shared_ticks.get(0) or self._ticks(*xlim)
+            yticks, ylabels = shared_ticks.get(1) or self._ticks(*ylim)
+
+            # Tick values to figure fractions, for the whole panel at once
+            fx = x0 + (xticks - xlim[0]) / (xlim[1] - xlim[0]) * (x1 - x0)
+            fy = y0 + (yticks - ylim[0]) / (ylim[1] - ylim[0]) * (y1 - y0)
+            grid_segments.extend([(x0, y), (x1, y)] for y in fy)
+            base_segments.append([(x0, y0), (x1, y0)])
+
+            if not self.sharex or panel.row == self.nrows - 1:
+                tick_segments.extend([(x, y0), (x, y0 - tick_len)] for x in fx)
+                labels["x"].extend(xlabels)
+                label_xy["x"].extend((x, y0 - 1.6 * tick_len) for x in fx)
+            if not self.sharey or panel.col == self.ncols - 1:
+                labels["y"].extend(ylabels)
+                label_xy["y"].extend((x1 + 0.004, y) for y in fy)
+            if panel.title:
+                titles.append(panel.title)
+                title_xy.append((x0, y1 + 0.006))
+
+        fig = self.figure
+        self._decorations = [
+            LineCollection(grid_segments, colors=self.grid_color, linewidths=self.grid_width,
+                           transform=fig.transFigure, zorder=0.5),
+            LineCollection(base_segments + tick_segments, colors=self.spine_color, linewidths=1.0,
+                           transform=fig.transFigure, zorder=2.5),
+            LabelCollection(labels["x"], label_xy["x"], fig.transFigure, size=self.fontsize,
+                            fontproperties=self.font, ha="center", va="top", zorder=3),
+            LabelCollection(labels["y"], label_xy["y"], fig.transFigure, size=self.fontsize,
+                            fontproperties=self.font, ha="left", va="center", zorder=3),
+            LabelCollection(titles, title_xy, fig.transFigure, size=self.title_size,
+                            fontproperties=self.font, ha="left", va="baseline", zorder=3),
+        ]
+        for artist in self._decorations:
+            fig.add_artist(artist)
+        self._stale = False
@@ -0,0 +1,687 @@
+"""
+Declarative chart specs.
+
+A spec is a JSON object describing one chart of a type the gallery shows.
+It holds the data plus a few options, never code. That means specs can be
+hashed, deduplicated, cached and sent to worker processes cheaply.
+
+    {"type": "stacked_barh", "name": "tariffs",
+     "title": "United States, effective tariff rate, %",
+     "subtitle": "Weighted by 2024 imports",
+     "data": {"categories": ["Britain", "France", "China"],
+              "series": [{"label": "2024 rate", "values": [2.0, 2.5, 12.0]},
+                         {"label": "Increase in 2025", "values": [9.0, 13.0, 34.0]}]}}
+
+Keys shared by every type:
+``type``, ``data``, ``name`` (the output file stem), ``theme`` (default
+"clean_modern"), ``title``, ``subtitle``, ``source`` (a footnote),
+``title_size`` (default 28), ``figsize``, ``format`` (default "png"), ``dpi``, ``border_width``,
+``border_color`` and the encoder options of save_clean_modern_style (``quantize``,
+``compress_level``, ``zlib_strategy``, ``lossless``).
+
+``data`` depends on the type (see SPEC_TYPES):
+
+- ``lollipop``: ``categories``, ``values`` and optional ``xlim``, ``xticks``,
+  ``left_label`` and ``right_label``. When values have both signs, the chart
+  becomes diverging and gets shaded halves.
+- ``stacked_barh``: ``categories`` and ``series`` (a list of ``label``,
+  ``values``, optional ``color``), plus optional ``xlim`` and ``xticks``.
+- ``line``: ``x``, ``series`` (a list of ``label``, ``values``, optional
+  ``color``, ``linewidth``) and optional ``ylim``, ``yticks``, ``xticks``.
+  Each line is labelled at its end.
+- ``bubble``: ``x``, ``y``, optional ``size``, ``color`` (one color or one
+  per point), ``alpha``, ``highlight`` (a list of ``label``, ``x``, ``y``,
+  ``size``, ``color``), ``xlabel`` and ``ylabel``.
+- ``choropleth``: ``geodata`` (a file geopandas can read), ``values``
+  (mapping of region id to value), ``key`` (the region id column, default
+  "name"), ``bins``, optional ``bin_labels`` and ``cmap``. Needs geopandas.
+  geodata is opened as given, so pressplot serve requires ``--allow
+  "spec:choropleth"`` for these specs.
+- ``treemap``: ``items`` (a list of ``label``, ``value``, optional
+  ``color``), laid out as a squarified treemap.
+- ``butterfly``: ``categories``, ``left`` and ``right`` (each with ``label``,
+  ``values``, optional ``color``), drawn as mirrored horizontal bars.
+
+render_specs() renders many specs on warm worker processes. Identical specs
+are rendered once, and an optional RenderCache skips specs rendered before.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from .batch import ChartResult
+from .cache import RenderCache, _update_hash
+from .core import Theme
+from .registry import registry
+
+Spec = Dict[str, Any]
+
+_KEY_VERSION = b"pressplot-spec-1"
+_TEXT_COLOR = "#1B1919"
+_MISSING = object()
+
+DEFAULT_FIGSIZE = (12, 7)
+
+
+def _field(spec: Spec, data: Dict[str, Any], key: str, default: Any = _MISSING, where: str = "data") -> Any:
+    value = data.get(key, default) if isinstance(data, dict) else default
+    if value is _MISSING:
+        raise ValueError(f"{spec['type']} spec needs {where}['{key}']")
+    return value
+
+
+def _series_values(spec: Spec, series: Sequence[Dict[str, Any]], name: str = "series") -> Dict[str, Sequence]:
+    """
+    The ``values`` of each series item, by name, for _same_length.
+    """
+    return {f"{name}[{i}]": _field(spec, item, "values", where=f"data['{name}'][{i}]")
+            for i, item in enumerate(series)}
+
+
+def _same_length(spec: Spec, **columns: Sequence) -> int:
+    lengths = {name: len(values) for name, values in columns.items()}
+    if len(set(lengths.values())) > 1:
+        raise ValueError(f"{spec['type']} spec has columns of different lengths: {lengths}")
+    return next(iter(lengths.values()), 0)
+
+
+def _spec_theme(spec: Spec) -> Theme:
+    theme = spec.get("theme", "clean_modern")
+    return theme if isinstance(theme, Theme) else registry.get(theme)
+
+
+def _colors(theme: Theme, items: Sequence[Dict[str, Any]], start: int = 0) -> List[str]:
+    """
+    Each item's ``color``, falling back to the theme palette in order.
+    """
+    palette = list(theme.palette.values()) if isinstance(theme.palette, dict) else list(theme.palette)
+    palette = palette or ["#E62A24"]
+    return [item.get("color") or palette[(start + i) % len(palette)] for i, item in enumerate(items)]
+
+
+def _header(fig, spec: Spec, x: float = 0.05, ha: str = "left") -> float:
+    """
+    Draw the title, subtitle and source note in figure coordinates.
+
+    Returns:
+        float: The figure fraction left free above the plot area.
+    """
+    top = 0.92
+    if spec.get("title"):
+        fig.text(x, 0.95, spec["title"], ha=ha, va="top", fontsize=spec.get("title_size", 28), fontweight="bold",
+                 color=_TEXT_COLOR)
+        top = 0.84
+    if spec.get("subtitle"):
+        fig.text(x, 0.88, spec["subtitle"], ha=ha, va="top", fontsize=22, color=_TEXT_COLOR)
+        top = 0.76
+    if spec.get("source"):
+        fig.text(x, 0.02, spec["source"], ha=ha, va="bottom", fontsize=14, color="#555555")
+    return top
+
+
+def _hide_spines(ax):
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+
+
+def _draw_lollipop(fig, spec: Spec, theme: Theme):
+    import numpy as np
+
+    from .themes import CLEAN_MODERN_DIVERGING_PALETTE as colors
+
+    data = spec["data"]
+    categories = _field(spec, data, "categories")
+    values = _field(spec, data, "values")
+    n = _same_length(spec, categories=categories, values=values)
+    top = _header(fig, spec, x=0.5, ha="center")
+    diverging = min(values, default=0) < 0 < max(values, default=0)
+    headers = data.get("left_label") or data.get("right_label")
+
+    ax = fig.add_axes((0.25, 0.1, 0.7, top - 0.1 - (0.1 if headers else 0.04)))
+    limit = (max((abs(v) for v in values), default=0) or 1) * 1.15
+    xlim = data.get("xlim") or ((-limit, limit) if diverging else (0, limit))
+    if diverging:
+        ax.axvspan(xlim[0], 0, facecolor=colors["bg_left"], zorder=0)
+        ax.axvspan(0, xlim[1], facecolor=colors["bg_right"], zorder=0)
+    ax.grid(axis="x", color="#d4d4d4", linewidth=1.5, zorder=1)
+    ax.grid(axis="y", visible=False)
+    ax.axvline(0, color="black", linewidth=2.5, zorder=2)
+
+    y = np.arange(n)[::-1]
+    ax.hlines(y=y, xmin=0, xmax=values, color=colors["dot_color"], linewidth=3.5, zorder=3)
+    ax.scatter(values, y, color=colors["dot_color"], s=250, zorder=4, edgecolors="none")
+
+    ax.set_yticks(y)
+    ax.set_yticklabels(categories, fontsize=20, fontweight="bold")
+    ax.tick_params(axis="y", labelleft=True, labelright=False, length=0, pad=10)
+    ax.xaxis.tick_top()
+    ax.tick_params(axis="x", length=0, pad=10, labelsize=20)
+    ax.set_xlim(*xlim)
+    ax.set_ylim(-0.6, n - 0.4)
+    if data.get("xticks") is not None:
+        ax.set_xticks(data["xticks"])
+    for label in ax.get_xticklabels():
+        label.set_fontweight("bold")
+    _hide_spines(ax)
+
+    box = ax.get_position()
+    header_y = box.y1 + 0.08
+    middle = box.x0 + box.width * (0 - xlim[0]) / (xlim[1] - xlim[0])
+    if data.get("left_label"):
+        fig.text((box.x0 + middle) / 2, header_y, data["left_label"], color=colors["blue_text"],
+                 fontsize=20, fontweight="bold", ha="center", va="bottom")
+    if data.get("right_label"):
+        fig.text((middle + box.x1) / 2, header_y, data["right_label"], color=colors["red_text"],
+                 fontsize=20, fontweight="bold", ha="center", va="bottom")
+
+
+def _legend_swatches(fig, labels: Sequence[str], colors: Sequence[str], x: float, y: float = 0.04):
+    """
+    A row of square legend patches with labels, starting at (x, y) in figure
+    coordinates.
+    """
+    from matplotlib.patches import Rectangle
+
+    renderer = fig._get_renderer()
+    for label, color in zip(labels, colors):
+        fig.add_artist(Rectangle((x, y), 0.025, 0.04, color=color, transform=fig.transFigure, zorder=10))
+        text = fig.text(x + 0.035, y, label, fontsize=22, va="bottom", ha="left")
+        x = fig.transFigure.inverted().transform(text.get_window_extent(renderer))[1, 0] + 0.04
+
+
+def _draw_stacked_barh(fig, spec: Spec, theme: Theme):
+    import numpy as np
+
+    from .themes import CLEAN_MODERN_TARIFF_PALETTE
+
+    data = spec["data"]
+    categories = _field(spec, data, "categories")
+    series = _field(spec, data, "series")
+    if not series:
+        raise ValueError("stacked_barh spec needs at least one series")
+    _same_length(spec, categories=categories, **_series_values(spec, series))
+    top = _header(fig, spec)
+    fig.subplots_adjust(left=0.30, right=0.95, top=top - 0.06, bottom=0.16)
+    ax = fig.add_subplot()
+
+    if len(series) == 2 and not any("color" in s for s in series):
+        colors = [CLEAN_MODERN_TARIFF_PALETTE["2024_rate"], CLEAN_MODERN_TARIFF_PALETTE["increase"]]
+    else:
+        colors = _colors(theme, series)
+    y = np.arange(len(categories))[::-1]
+    left = np.zeros(len(categories))
+    for item, color in zip(series, colors):
+        values = np.asarray(item["values"], dtype=float)
+        ax.barh(y, values, left=left, color=color, height=0.65, zorder=3)
+        left += values
+        # White separators between segments
+        ax.vlines(left, y - 0.325, y + 0.325, color="white", linewidth=1, zorder=4)
+
+    ax.grid(axis="x", color="#d4d4d4", linewidth=1.5, zorder=0)
+    ax.grid(axis="y", visible=False)
+    ax.axvline(0, color="black", linewidth=2.5, zorder=5)
+    ax.set_xlim(*(data.get("xlim") or (0, float(left.max(initial=1)) * 1.1)))
+    if data.get("xticks") is not None:
+        ax.set_xticks(data["xticks"])
+    ax.xaxis.tick_top()
+    ax.tick_params(axis="x", labeltop=True, labelbottom=False, labelsize=24, length=0)
+    ax.set_yticks(y)
+    ax.set_yticklabels(categories, fontsize=24)
+    ax.tick_params(axis="y", length=0, labelleft=True, labelright=False, pad=10)
+    _hide_spines(ax)
+    _legend_swatches(fig, [s.get("label", "") for s in series], colors, x=0.30)
+
+
+def _draw_line(fig, spec: Spec, theme: Theme):
+    from matplotlib.transforms import ScaledTranslation
+
+    from .utils import label_lines
+
+    data = spec["data"]
+    x = _field(spec, data, "x")
+    series = _field(spec, data, "series")
+    _same_length(spec, x=x, **_series_values(spec, series))
+    top = _header(fig, spec)
+    ax = fig.add_axes((0.08, 0.15, 0.79, top - 0.19))
+
+    lines = []
+    for item, color in zip(series, _colors(theme, series)):
+        line, = ax.plot(x, item["values"], color=color, linewidth=item.get("linewidth", 5.0),
+                        solid_capstyle="round")
+        lines.append(line)
+
+    if data.get("xticks") is not None:
+        ax.set_xticks(data["xticks"])
+    if data.get("ylim") is not None:
+        ax.set_ylim(*data["ylim"])
+    if data.get("yticks") is not None:
+        ax.set_yticks(data["yticks"])
+    # Tick labels on the left, leaving the right edge to the line labels
+    ax.tick_params(axis="y", length=0, pad=10, labelsize=20, labelleft=True, labelright=False)
+    ax.tick_params(axis="x", length=8, width=2, color="black", labelsize=20)
+    for label in ax.get_xticklabels() + ax.get_yticklabels():
+        label.set_fontweight("bold")
+    ax.spines["bottom"].set_color("#000000")
+    ax.spines["bottom"].set_linewidth(2.5)
+
+    # End labels, packed so they do not overlap, nudged right of the last point
+    texts = label_lines(ax, lines, [s.get("label", "") for s in series], fontsize=22, fontweight="bold",
+                        ha="left")
+    nudge = ScaledTranslation(8 / 72, 0, fig.dpi_scale_trans)
+    for text in texts:
+        text.set_transform(text.get_transform() + nudge)
+
+
+def _draw_bubble(fig, spec: Spec, theme: Theme):
+    import numpy as np
+
+    data = spec["data"]
+    x = np.asarray(_field(spec, data, "x"), dtype=float)
+    y = np.asarray(_field(spec, data, "y"), dtype=float)
+    n = _same_length(spec, x=x, y=y)
+    size = data.get("size", 80)
+    color = data.get("color") or _colors(theme, [{}])[0]
+    top = _header(fig, spec)
+    ax = fig.add_axes((0.08, 0.12, 0.86, top - 0.2))
+
+    if not isinstance(size, (int, float)):
+        _same_length(spec, x=x, size=size)
+    if isinstance(color, str):
+        colors = {"color": color}
+    else:
+        _same_length(spec, x=x, color=color)
+        colors = {"c": color}
+        color = _TEXT_COLOR
+    ax.scatter(x, y, s=size, alpha=data.get("alpha", 0.75), edgecolors="none", **colors)
+    for point in data.get("highlight", ()):
+        ax.scatter(point["x"], point["y"], s=point.get("size", 900), color=point.get("color", color),
+                   edgecolor=_TEXT_COLOR, linewidth=1.5, zorder=10)
+        ax.annotate(point.get("label", ""), (point["x"], point["y"]), xytext=(-14, 14),
+                    textcoords="offset points", ha="right", va="bottom", fontsize=24, color=_TEXT_COLOR,
+                    zorder=11)
+
+    ax.axis("off")
+    if n:
+        pad_x = (x.max() - x.min()) * 0.05 or 1
+        pad_y = (y.max() - y.min()) * 0.07 or 1
+        ax.set_xlim(x.min() - pad_x, x.max() + pad_x)
+        ax.set_ylim(y.min() - pad_y, y.max() + pad_y)
+    if data.get("ylabel"):
+        ax.text(1.0, 1.02, data["ylabel"], transform=ax.transAxes, ha="right", va="bottom",
+                fontsize=26, fontweight="bold", color=_TEXT_COLOR)
+    if data.get("xlabel"):
+        ax.text(0.0, -0.03, data["xlabel"], transform=ax.transAxes, ha="left", va="top",
+                fontsize=26, fontweight="bold", color="#333333")
+
+
+def _draw_choropleth(fig, spec: Spec, theme: Theme):
+    import matplotlib as mpl
+    import matplotlib.colors as mcolors
+
+    from .themes import get_colormap
+
+    try:
+        import geopandas as gpd
+    except ImportError:
+        raise ImportError("choropleth specs require the 'geopandas' package") from None
+
+    data = spec["data"]
+    regions = gpd.read_file(_field(spec, data, "geodata"))
+    key = data.get("key", "name")
+    values = _field(spec, data, "values")
+    bins = _field(spec, data, "bins")
+    regions = regions.assign(_value=regions[key].map(values))
+
+    cmap_name = data.get("cmap", "clean_modern_reds_discrete")
+    cmap = get_colormap(cmap_name) if cmap_name.startswith("clean_modern") else mpl.colormaps[cmap_name]
+    norm = mcolors.BoundaryNorm(bins, cmap.N)
+    top = _header(fig, spec, x=0.5, ha="center")
+    ax = fig.add_axes((0.02, 0.04, 0.96, top - 0.14))
+    regions.plot(column="_value", ax=ax, cmap=cmap, norm=norm, edgecolor="white", linewidth=0.5,
+                 missing_kwds={"color": "#D9D9D3", "edgecolor": "white", "linewidth": 0.5})
+    ax.set_axis_off()
+
+    # Horizontal color key centered under the header
+    cbar_ax = fig.add_axes((0.35, top - 0.06, 0.3, 0.015))
+    cb = fig.colorbar(mpl.cm.ScalarMappable(norm=norm, cmap=cmap), cax=cbar_ax, orientation="horizontal",
+                      ticks=[])
+    cb.outline.set_linewidth(0)
+    labels = data.get("bin_labels") or [f"{lo:g}-{hi:g}" for lo, hi in zip(bins[:-1], bins[1:])]
+    for i, label in enumerate(labels):
+        cbar_ax.text((i + 0.5) / len(labels), -0.5, label, ha="center", va="top", transform=cbar_ax.transAxes,
+                     fontsize=12)
+
+
+def squarify(values: Sequence[float], x: float, y: float, width: float, height: float) -> List[tuple]:
+    """
+    Lay out *values* as a squarified treemap filling a rectangle.
+
+    Values should be sorted in decreasing order for the most square cells.
+
+    Args:
+        values: Positive cell sizes.
+        x, y, width, height: The rectangle to fill.
+
+    Returns:
+        List[tuple]: One (x, y, width, height) cell per value, in order.
+    """
+    total = float(sum(values))
+    if total <= 0:
+        return [(x, y, 0.0, 0.0) for _ in values]
+    areas = [v * width * height / total for v in values]
+    cells = []
+    start = 0
+    while start < len(areas):
+        side = min(width, height)
+        row = [areas[start]]
+        # Grow the row while it makes the worst aspect ratio better
+        while start + len(row) < len(areas):
+            candidate = row + [areas[start + len(row)]]
+            if _worst_ratio(candidate, side) > _worst_ratio(row, side):
+                break
+            row = candidate
+        thickness = sum(row) / side
+        offset = 0.0
+        for area in row:
+            length = area / thickness
+            if width >= height:
+                cells.append((x, y + offset, thickness, length))
+            else:
+                cells.append((x + offset, y + height - thickness, length, thickness))
+            offset += length
+        if width >= height:
+            x, width = x + thickness, width - thickness
+        else:
+            height -= thickness
+        start += len(row)
+    return cells
+
+
+def _worst_ratio(row: Sequence[float], side: float) -> float:
+    total = sum(row)
+    return max(max(side * side * a / (total * total), total * total / (side * side * a)) for a in row)
+
+
+def _draw_treemap(fig, spec: Spec, theme: Theme):
+    from matplotlib.patches import Rectangle
+
+    from .themes import CLEAN_MODERN_TIKTOK_PALETTE
+
+    data = spec["data"]
+    items = _field(spec, data, "items")
+    for i, item in enumerate(items):
+        _field(spec, item, "value", where=f"data['items'][{i}]")
+    items = sorted(items, key=lambda item: -item["value"])
+    if any(item["value"] <= 0 for item in items):
+        raise ValueError("treemap spec values must be positive")
+    top = _header(fig, spec, x=0.5, ha="center")
+    ax = fig.add_axes((0.05, 0.05, 0.9, top - 0.09))
+    ax.set_xlim(0, 100)
+    ax.set_ylim(0, 100)
+    ax.axis("off")
+
+    cells = squarify([item["value"] for item in items], 0, 0, 100, 100)
+    for item, color, (cx, cy, w, h) in zip(items, _colors(theme, items), cells):
+        ax.add_patch(Rectangle((cx, cy), w, h, linewidth=2, edgecolor=CLEAN_MODERN_TIKTOK_PALETTE["border"],
+                               facecolor=color))
+        ax.text(cx + 1.5, cy + h - 1.5, item.get("label", ""), ha="left", va="top", fontsize=22,
+                fontweight="bold", color="black", clip_on=True)
+
+
+def _draw_butterfly(fig, spec: Spec, theme: Theme):
+    import numpy as np
+
+    data = spec["data"]
+    categories = _field(spec, data, "categories")
+    left = _field(spec, data, "left")
+    right = _field(spec, data, "right")
+    n = _same_length(spec, categories=categories, left=_field(spec, left, "values", where="data['left']"),
+                     right=_field(spec, right, "values", where="data['right']"))
+    top = _header(fig, spec, x=0.5, ha="center")
+    ax = fig.add_axes((0.22, 0.08, 0.73, top - 0.16))
+
+    left_color, right_color = left.get("color", "#5B84C4"), right.get("color", "#F48B82")
+    y = np.arange(n)[::-1]
+    lv = np.asarray(left["values"], dtype=float)
+    rv = np.asarray(right["values"], dtype=float)
+    ax.barh(y, -lv, height=0.7, color=left_color, zorder=3)
+    ax.barh(y, rv, height=0.7, color=right_color, zorder=3)
+    ax.axvline(0, color="black", linewidth=2, zorder=4)
+
+    limit = max(float(lv.max(initial=0)), float(rv.max(initial=0))) * 1.1 or 1
+    ax.set_xlim(-limit, limit)
+    ax.set_ylim(-0.6, n - 0.4)
+    ax.grid(axis="x", color="#d4d4d4", linewidth=1.5, zorder=0)
+    ax.grid(axis="y", visible=False)
+    ax.xaxis.tick_top()
+    ax.tick_params(axis="x", length=0, labelsize=18)
+    ax.xaxis.set_major_formatter(lambda value, _: f"{abs(value):g}")
+    ax.set_yticks(y)
+    ax.set_yticklabels(categories, fontsize=20)
+    ax.tick_params(axis="y", length=0, labelleft=True, labelright=False, pad=10)
+    _hide_spines(ax)
+
+    box = ax.get_position()
+    header_y = box.y1 + 0.06
+    middle = (box.x0 + box.x1) / 2
+    fig.text((box.x0 + middle) / 2, header_y, left.get("label", ""), color=left_color, fontsize=22,
+             fontweight="bold", ha="center", va="bottom")
+    fig.text((middle + box.x1) / 2, header_y, right.get("label", ""), color=right_color, fontsize=22,
+             fontweight="bold", ha="center", va="bottom")
+
+
+# Chart type -> function drawing a spec onto a fresh figure, under its theme
+SPEC_TYPES: Dict[str, Callable] = {
+    "lollipop": _draw_lollipop,
+    "stacked_barh": _draw_stacked_barh,
+    "line": _draw_line,
+    "bubble": _draw_bubble,
+    "choropleth": _draw_choropleth,
+    "treemap": _draw_treemap,
+    "butterfly": _draw_butterfly,
+}
+
+# Spec types that read files or URLs named in the spec (choropleth geodata).
+# pressplot serve only renders them for clients allowed "spec:<type>".
+FILE_SPEC_TYPES = ("choropleth",)
+
+
+def validate_spec(spec: Spec) -> Spec:
+    """
+    Check the fields shared by every spec type.
+
+    Returns:
+        Spec: The spec itself.
+
+    Raises:
+        ValueError: If the spec is not an object, its type is unknown or it
+                    has no data object.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError(f"A chart spec must be an object, not {type(spec).__name__}")
+    if spec.get("type") not in SPEC_TYPES:
+        raise ValueError(f"Unknown chart spec type {spec.get('type')!r}, expected one of {sorted(SPEC_TYPES)}")
+    if not isinstance(spec.get("data"), dict):
+        raise ValueError(f"{spec['type']} spec needs a 'data' object")
+    return spec
+
+
+def draw_spec(spec: Spec):
+    """
+    Draw a chart spec onto a new ThemedFigure bound to the spec's theme.
+
+    The figure is not attached to pyplot and only the calling thread sees the
+    theme, so specs can be drawn from several threads at once.
+
+    Returns:
+        ThemedFigure: The drawn figure.
+    """
+    from .thread_themes import figure, thread_theme
+
+    validate_spec(spec)
+    theme = _spec_theme(spec)
+    with thread_theme(theme):
+        fig = figure(theme, figsize=tuple(spec.get("figsize", DEFAULT_FIGSIZE)))
+        SPEC_TYPES[spec["type"]](fig, spec, theme)
+    return fig
+
+
+def spec_format(spec: Spec) -> str:
+    """
+    The output format of a spec (lowercase file extension).
+    """
+    return str(spec.get("format", "png")).lower()
+
+
+def render_spec(spec: Spec, filename) -> None:
+    """
+    Draw a spec and save it with the Clean Modern border.
+
+    Args:
+        spec (Spec): The chart spec.
+        filename: Output path or binary file-like object. The format comes
+                  from the spec, not the file extension.
+    """
+    from .utils import ENCODER_OPTIONS, save_clean_modern_style
+
+    fig = draw_spec(spec)
+    kwargs = {"dpi": spec["dpi"]} if spec.get("dpi") else {}
+    kwargs.update((key, spec[key]) for key in ENCODER_OPTIONS if key in spec)
+    save_clean_modern_style(fig, filename, border_width=spec.get("border_width", 80),
+                            border_color=spec.get("border_color", "#F1F0EA"), format=spec_format(spec), **kwargs)
+
+
+def spec_key(spec: Spec) -> str:
+    """
+    Content key of a spec's rendered output.
+
+    Covers everything that changes the image: the spec without its ``name``,
+    the resolved theme and the matplotlib and pressplot versions. Equal keys
+    mean byte-identical renders.
+    """
+    import matplotlib
+
+    from . import __version__
+
+    h = hashlib.blake2b(_KEY_VERSION, digest_size=20)
+    _update_hash(h, {k: v for k, v in spec.items() if k != "name"})
+    _update_hash(h, _spec_theme(spec).fingerprint())
+    _update_hash(h, (matplotlib.__version__, __version__))
+    return h.hexdigest()
+
+
+def load_specs(path: str) -> List[Spec]:
+    """
+    Read specs from a ``.json`` file (one spec or a list of specs) or a
+    ``.jsonl`` file (one spec per line).
+
+    Specs without a name are named after the file, numbered when the file
+    holds several.
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.lower().endswith(".jsonl"):
+            specs = [json.loads(line) for line in f if line.strip()]
+        else:
+            specs = json.load(f)
+    if isinstance(specs, dict):
+        specs = [specs]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    for i, spec in enumerate(specs):
+        validate_spec(spec)
+        if "name" not in spec:
+            spec["name"] = stem if len(specs) == 1 else f"{stem}-{i:04d}"
+    return specs
+
+
+def _render_spec_job(spec: Spec, path: str) -> ChartResult:
+    """
+    Render one spec to *path* in the current process and time it.
+    """
+    from .utils import collect_export_timings
+
+    error = None
+    start = time.perf_counter()
+    with collect_export_timings() as timings:
+        try:
+            render_spec(spec, path)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    return ChartResult(spec["name"], error is None, time.perf_counter() - start, timings["render"],
+                       timings["encode"], error)
+
+
+def render_specs(specs: Sequence[Spec], output_dir: str, processes: Optional[int] = None,
+                 cache: Optional[Union[RenderCache, bool]] = None) -> List[ChartResult]:
+    """
+    Render many specs to ``output_dir/<name>.<format>`` on warm worker processes.
+
+    Specs with the same content key are rendered once and copied to their
+    other outputs. With a cache, previously rendered specs are copied out of
+    it without starting a render.
+
+    Args:
+        specs: Chart specs. Unnamed specs are named after their key.
+        output_dir: Directory the charts are written to.
+        processes: Number of workers. Defaults to the CPU count; 1 renders in-process.
+        cache: A RenderCache, or True for the default one.
+
+    Returns:
+        List[ChartResult]: One result per spec, in input order.
+    """
+    from .batch import warm_themes, warm_worker
+
+    if cache is True:
+        cache = RenderCache()
+    os.makedirs(output_dir, exist_ok=True)
+
+    outputs = []  # (spec, key, path) per input spec
+    unique: Dict[str, int] = {}  # key -> index of its first spec
+    for spec in specs:
+        validate_spec(spec)
+        key = spec_key(spec)
+        spec = dict(spec, name=spec.get("name") or key[:16])
+        outputs.append((spec, key, os.path.join(output_dir, f"{spec['name']}.{spec_format(spec)}")))
+        unique.setdefault(key, len(outputs) - 1)
+
+    results: Dict[str, ChartResult] = {}
+    pending = []
+    for key, index in unique.items():
+        spec, _, path = outputs[index]
+        if cache and cache.fetch(key, spec_format(spec), path):
+            results[key] = ChartResult(spec["name"], True, 0.0, cached=True)
+        else:
+            pending.append((spec, key, path))
+
+    processes = min(processes or os.cpu_count() or 1, max(len(pending), 1))
+    themes = list(dict.fromkeys(spec.get("theme", "clean_modern") for spec, _, _ in pending)) or ["clean_modern"]
+    if processes == 1:
+        if pending:
+            warm_themes(themes)
+        rendered = [_render_spec_job(spec, path) for spec, _, path in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=warm_worker, initargs=(tuple(themes),)) as pool:
+            chunksize = max(1, len(pending) // (processes * 4))
+            rendered = list(pool.map(_render_spec_job, [spec for spec, _, _ in pending],
+                                     [path for _, _, path in pending], chunksize=chunksize))
+
+    for (spec, key, path), result in zip(pending, rendered):
+        results[key] = result
+        if cache and result.ok:
+            cache.store(key, spec_format(spec), path, evict=False)
+    if cache and pending:
+        cache.evict()
+
+    final = []
+    for i, (spec, key, path) in enumerate(outputs):
+        first = unique[key]
+        result = results[key]
+        if i != first:
+            if result.ok:
+                shutil.copyfile(outputs[first][2], path)
+            result = ChartResult(spec["name"], result.ok, 0.0, error=result.error, cached=result.ok)
+        final.append(result)
+    return final
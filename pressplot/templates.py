@@ -0,0 +1,206 @@
+"""
+Figure templates: build a themed chart layout once, render it many times.
+
+Report pipelines often draw the same layout hundreds of times with different
+data. A FigureTemplate builds the figure and its static artists (spans, grid,
+reference lines, axis decorations, fixed labels) once. For each chart it only
+updates the artists registered as *slots* and redraws those.
+
+    def build(fig):
+        ax = fig.add_axes((0.25, 0.1, 0.7, 0.5))
+        ax.axvspan(-100, 0, facecolor="#E8ECEF")
+        ax.set_xlim(-80, 80)
+        ax.set_ylim(-0.5, 2.5)
+        return {"dots": ax.scatter([0, 0, 0], [2, 1, 0], s=250),
+                "title": fig.text(0.5, 0.96, "", ha="center", va="top")}
+
+    template = pressplot.FigureTemplate(build, figsize=(10, 7))
+    for country, values in reports.items():
+        template.render(f"{country}.png", title=country,
+                        dots=list(zip(values, [2, 1, 0])))
+
+For raster output at the figure dpi, the static layer is rendered once and
+kept as a pixel buffer. Each chart restores that buffer, draws only the slot
+artists on top and encodes the result. So slot artists must be drawn above
+the static ones, and the axes limits must not depend on the data: set them in
+*build*. Call invalidate() after changing a static artist. Vector formats and
+other dpis fall back to a full save_clean_modern_style.
+
+Slot values are applied by artist type:
+
+- Text: the new string.
+- Line2D: new y values, or an ``(x, y)`` tuple.
+- PathCollection (scatter): an (N, 2) array of offsets.
+- LineCollection (hlines, vlines): a list of segments.
+- BarContainer: new bar lengths (widths for barh, heights for bar).
+- Any slot: a callable, called with the artist to update it in place.
+"""
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.container import BarContainer
+from matplotlib.lines import Line2D
+from matplotlib.text import Text
+
+from .core import Theme
+from .thread_themes import ThemedFigure, savefig_rc, thread_theme
+
+Slot = Union[Artist, BarContainer]
+
+
+def _slot_artists(slot: Slot) -> List[Artist]:
+    if isinstance(slot, BarContainer):
+        return list(slot.patches)
+    if isinstance(slot, Artist):
+        return [slot]
+    raise TypeError(f"Template slots must be artists or bar containers, not {type(slot).__name__}")
+
+
+def update_artist(slot: Slot, value: Any):
+    """
+    Set the data of a template slot in place (see the module docstring).
+
+    Raises:
+        TypeError: If the slot type has no update rule and *value* is not callable.
+    """
+    if callable(value):
+        value(slot)
+    elif isinstance(slot, Text):
+        slot.set_text(value)
+    elif isinstance(slot, Line2D):
+        if isinstance(value, tuple) and len(value) == 2:
+            slot.set_data(*value)
+        else:
+            slot.set_ydata(value)
+    elif isinstance(slot, PathCollection):
+        slot.set_offsets(value)
+    elif isinstance(slot, LineCollection):
+        slot.set_segments(value)
+    elif isinstance(slot, BarContainer):
+        values = np.asarray(value, dtype=float)
+        if len(values) != len(slot.patches):
+            raise ValueError(f"Expected {len(slot.patches)} bar values, got {len(values)}")
+        horizontal = slot.orientation == "horizontal"
+        for patch, length in zip(slot.patches, values):
+            if horizontal:
+                patch.set_width(length)
+            else:
+                patch.set_height(length)
+    else:
+        raise TypeError(f"No update rule for {type(slot).__name__} slots; pass a callable instead")
+
+
+class FigureTemplate:
+    """
+    A themed figure whose static layer is built and rendered once, and whose
+    slot artists are updated in place for each chart.
+
+    A template renders one chart at a time; use one template per thread.
+    """
+
+    def __init__(self, build: Callable[[ThemedFigure], Dict[str, Slot]],
+                 theme: Union[str, Theme] = "clean_modern", **figure_kwargs):
+        """
+        Initialize a FigureTemplate.
+
+        Args:
+            build: Function adding every artist to the figure and returning
+                   the slots (name -> artist or bar container) that change
+                   between charts.
+            theme (Union[str, Theme]): Theme the figure is built and drawn under.
+            **figure_kwargs: Passed to the figure (figsize, dpi, ...).
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        with thread_theme(theme) as resolved:
+            self.figure = ThemedFigure(theme=resolved, **figure_kwargs)
+            FigureCanvasAgg(self.figure)
+            self.slots: Dict[str, Slot] = dict(build(self.figure))
+        self._artists = sorted((a for slot in self.slots.values() for a in _slot_artists(slot)),
+                               key=lambda a: a.get_zorder())
+        self._background = None
+        self._set_animated(True)
+
+    def _set_animated(self, animated: bool):
+        for artist in self._artists:
+            artist.set_animated(animated)
+
+    def update(self, **values):
+        """
+        Update slots by name without rendering.
+        """
+        for name, value in values.items():
+            if name not in self.slots:
+                raise KeyError(f"Template has no slot '{name}'. Slots: {sorted(self.slots)}")
+            update_artist(self.slots[name], value)
+
+    def invalidate(self):
+        """
+        Drop the cached static layer, after a static artist was changed.
+        """
+        self._background = None
+
+    def _blit(self):
+        """
+        Render the static layer (once) plus the slots, and return the pixels.
+        """
+        canvas = self.figure.canvas
+        if self._background is None:
+            # Match what savefig would paint behind the figure
+            for key, setter in (("savefig.facecolor", self.figure.patch.set_facecolor),
+                                ("savefig.edgecolor", self.figure.patch.set_edgecolor)):
+                if savefig_rc(self.figure, key) != "auto":
+                    setter(savefig_rc(self.figure, key))
+            canvas.draw()
+            self._background = canvas.copy_from_bbox(self.figure.bbox)
+        else:
+            canvas.restore_region(self._background)
+        renderer = canvas.get_renderer()
+        for artist in self._artists:
+            artist.draw(renderer)
+        return np.array(canvas.buffer_rgba())
+
+    def _can_blit(self, fmt: str, kwargs: Dict[str, Any]) -> bool:
+        from .utils import ENCODER_OPTIONS, RASTER_FORMATS
+
+        dpi = kwargs.get("dpi", savefig_rc(self.figure, "savefig.dpi"))
+        return (fmt in RASTER_FORMATS and dpi in ("figure", self.figure.dpi)
+                and savefig_rc(self.figure, "savefig.bbox") in (None, "standard")
+                and kwargs.get("bbox_inches") in (None, "standard")
+                and not set(kwargs) - {"dpi", "metadata", "pil_kwargs", *ENCODER_OPTIONS})
+
+    def render(self, filename, border_width: int = 80, border_color: str = "#F1F0EA",
+               savefig_kwargs: Optional[Dict[str, Any]] = None, **values):
+        """
+        Update slots and save the chart with the Clean Modern border.
+
+        Args:
+            filename: Output path or binary file-like object.
+            border_width (int): Border width in pixels at the output dpi.
+            border_color (str): Border color.
+            savefig_kwargs (Optional[Dict[str, Any]]): Extra arguments for
+                save_clean_modern_style (format, dpi, metadata, quantize, ...).
+            **values: Slot updates, as for update().
+        """
+        import time
+
+        from .utils import ENCODER_OPTIONS, _resolve_format, _write_raster, save_clean_modern_style
+
+        self.update(**values)
+        kwargs = dict(savefig_kwargs or {})
+        fmt = _resolve_format(filename, kwargs.pop("format", None))
+        if self._can_blit(fmt, kwargs):
+            start = time.perf_counter()
+            encoder = {key: kwargs[key] for key in ENCODER_OPTIONS if key in kwargs}
+            _write_raster(self._blit(), filename, fmt, self.figure.dpi, border_width, border_color, start,
+                          metadata=kwargs.get("metadata"), pil_kwargs=kwargs.get("pil_kwargs"), **encoder)
+            return
+
+        self._set_animated(False)
+        try:
+            save_clean_modern_style(self.figure, filename, border_width=border_width,
+                                    border_color=border_color, format=fmt, **kwargs)
+        finally:
+            self._set_animated(True)
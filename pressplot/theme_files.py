@@ -0,0 +1,212 @@
+"""
+Themes stored as files.
+
+A theme file is TOML, JSON or a matplotlib ``.mplstyle`` file. TOML and JSON
+use the layout of Theme.to_dict (``name``, ``palette``, an optional
+``parent`` theme name and an ``rc_params`` table, which may also be nested:
+``[rc_params.axes] grid = true``); the name defaults to the file stem.
+``.mplstyle`` files become a theme named after the file. Themes registered
+from a directory or found on $PRESSPLOT_THEME_PATH are known by their file
+stem before the file is read, so a ``name`` in such a file must match it.
+
+    name = "house_dark"
+    palette = ["#E62A24", "#0C5DA5"]
+
+    [rc_params]
+    "axes.facecolor" = "#1B1919"
+    "font.size" = 12
+
+Directories of theme files are loaded through a compiled cache: the parsed
+and validated themes of a directory are pickled together, keyed on each
+file's mtime and size (then its content hash), so loading dozens of
+unchanged themes is one file read.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+from typing import Any, Dict, List, Optional
+
+from .core import Theme
+from .registry import THEME_FILE_EXTENSIONS, theme_files  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+_CACHE_VERSION = 1
+
+
+def _flatten(table: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """
+    Turn nested TOML tables into dotted rcParam keys.
+    """
+    flat = {}
+    for key, value in table.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def _parse_toml(data: bytes) -> Dict[str, Any]:
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise ImportError("Reading TOML themes requires Python 3.11+ or the 'tomli' package") from None
+    return tomllib.loads(data.decode("utf-8"))
+
+
+def _parse_mplstyle(path: str) -> Dict[str, Any]:
+    import matplotlib as mpl
+
+    rc = mpl.rc_params_from_file(path, fail_on_error=True, use_default_template=False)
+    return {"rc_params": dict(rc)}
+
+
+def _parse(path: str, data: bytes) -> Dict[str, Any]:
+    """
+    Parse theme file contents into a Theme.to_dict-style dictionary.
+    """
+    stem, ext = os.path.splitext(os.path.basename(path))
+    ext = ext.lower()
+    if ext == ".json":
+        parsed = json.loads(data.decode("utf-8"))
+    elif ext == ".toml":
+        parsed = _parse_toml(data)
+    elif ext == ".mplstyle":
+        parsed = _parse_mplstyle(path)
+    else:
+        raise ValueError(f"Unsupported theme file type '{ext}': {path}")
+    if not isinstance(parsed, dict):
+        raise ValueError(f"Theme file {path} must contain a table/object")
+
+    parsed.setdefault("name", stem)
+    parsed["rc_params"] = _flatten(parsed.get("rc_params", {}))
+    return parsed
+
+
+def _check_name(path: str, theme: Theme, name: Optional[str] = None) -> Theme:
+    """
+    Ensure the theme read from *path* is the one it was registered as: *name*,
+    or by default the file stem.
+    """
+    expected = name or os.path.splitext(os.path.basename(path))[0]
+    if theme.name != expected:
+        raise ValueError(f"Theme file {path} defines theme '{theme.name}' but is registered as '{expected}'; "
+                         "name the file after its theme")
+    return theme
+
+
+def load_theme_file(path: str, validate: bool = True) -> Theme:
+    """
+    Read a theme from a TOML, JSON or .mplstyle file.
+
+    Args:
+        path (str): Path of the theme file.
+        validate (bool): Validate the file's rcParams and palette now. A
+                         parent theme is only resolved when the theme is
+                         compiled or applied.
+
+    Returns:
+        Theme: The theme described by the file.
+
+    Raises:
+        ValueError: If the file type is unsupported or the theme is invalid.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    theme = Theme.from_dict(_parse(path, data))
+    if validate:
+        theme._compile_own()
+    return theme
+
+
+def _cache_path(directory: str) -> str:
+    from .utils import get_cache_dir
+
+    cache_dir = os.path.join(get_cache_dir(), "themes")
+    os.makedirs(cache_dir, exist_ok=True)
+    digest = hashlib.blake2b(os.path.abspath(directory).encode(), digest_size=10).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.pickle")
+
+
+def _cache_header():
+    import matplotlib
+
+    from . import __version__
+
+    return (_CACHE_VERSION, matplotlib.__version__, __version__)
+
+
+def _read_cache(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "rb") as f:
+            cache = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("header") != _cache_header():
+        return {}
+    return cache.get("entries", {})
+
+
+def _write_cache(path: str, entries: Dict[str, Any]):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"header": _cache_header(), "entries": entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug("Could not write theme cache %s: %s", path, e)
+
+
+def load_theme_dir(directory: str, use_cache: bool = True) -> List[Theme]:
+    """
+    Read and validate every theme file in a directory.
+
+    Args:
+        directory (str): Directory containing .toml, .json and .mplstyle files.
+        use_cache (bool): Read and update the compiled on-disk theme cache.
+
+    Returns:
+        List[Theme]: The compiled themes, in file name order.
+
+    Raises:
+        ValueError: If a theme file is invalid or its theme is not named after
+                    the file; the message names the file.
+    """
+    cache_path = _cache_path(directory) if use_cache else None
+    cached = _read_cache(cache_path) if cache_path else {}
+
+    entries = {}
+    themes = []
+    parsed = 0
+    changed = False
+    for path in theme_files(directory):
+        name = os.path.basename(path)
+        stat = os.stat(path)
+        entry: Optional[Dict[str, Any]] = cached.get(name)
+        if entry is None or entry["stat"] != (stat.st_mtime_ns, stat.st_size):
+            with open(path, "rb") as f:
+                data = f.read()
+            digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+            if entry is None or entry["digest"] != digest:
+                try:
+                    theme = Theme.from_dict(_parse(path, data))
+                    compiled = theme._compile_own()
+                except (ValueError, TypeError, KeyError) as e:
+                    raise ValueError(f"Invalid theme file {path}: {e}") from e
+                entry = {"theme": theme.to_dict(), "compiled": compiled, "digest": digest}
+                parsed += 1
+            entry = dict(entry, stat=(stat.st_mtime_ns, stat.st_size))
+            changed = True
+        entries[name] = entry
+        themes.append(_check_name(path, Theme._restore(entry["theme"], entry["compiled"])))
+
+    if cache_path and (changed or entries.keys() != cached.keys()):
+        _write_cache(cache_path, entries)
+    logger.info("Loaded %d themes from %s (%d parsed)", len(themes), directory, parsed)
+    return themes
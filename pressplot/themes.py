@@ -162,39 +162,122 @@ CLEAN_MODERN_TECH_PALETTE = {
     "text_color": "#1B1919"
 }
 
-# Register standard colormaps
-import matplotlib.colors
-from matplotlib.colors import LinearSegmentedColormap, ListedColormap
-
-# Continuous
-clean_modern_reds = LinearSegmentedColormap.from_list("clean_modern_reds", CLEAN_MODERN_MAP_PALETTE)
-# Handle different Matplotlib versions safely
-if hasattr(matplotlib, 'colormaps'):
-    try:
-        matplotlib.colormaps.register(clean_modern_reds)
-    except ValueError:
-        pass  # Already registered
-elif hasattr(matplotlib.cm, 'register_cmap'):
-    getattr(matplotlib.cm, 'register_cmap')(cmap=clean_modern_reds)
-
-# Discrete (for map buckets)
-clean_modern_reds_discrete = ListedColormap(CLEAN_MODERN_MAP_PALETTE, name="clean_modern_reds_discrete")
-if hasattr(matplotlib, 'colormaps'):
-    try:
-        matplotlib.colormaps.register(clean_modern_reds_discrete)
-    except ValueError:
-        pass
-elif hasattr(matplotlib.cm, 'register_cmap'):
-    getattr(matplotlib.cm, 'register_cmap')(cmap=clean_modern_reds_discrete)
-
-# Temperature Diverging
-clean_modern_temp = LinearSegmentedColormap.from_list("clean_modern_temp", CLEAN_MODERN_TEMPERATURE_PALETTE)
-if hasattr(matplotlib, 'colormaps'):
-    try:
-        matplotlib.colormaps.register(clean_modern_temp)
-    except ValueError:
-        pass
-elif hasattr(matplotlib.cm, 'register_cmap'):
-    getattr(matplotlib.cm, 'register_cmap')(cmap=clean_modern_temp)
+# Standard colormaps, built and registered with matplotlib on first use.
+# name -> (kind, colors)
+COLORMAP_SPECS = {
+    # Continuous
+    "clean_modern_reds": ("linear", CLEAN_MODERN_MAP_PALETTE),
+    # Discrete (for map buckets)
+    "clean_modern_reds_discrete": ("listed", CLEAN_MODERN_MAP_PALETTE),
+    # Temperature Diverging
+    "clean_modern_temp": ("linear", CLEAN_MODERN_TEMPERATURE_PALETTE),
+}
+
+_colormaps = {}
+_colormap_luts = {}
+
+
+def get_colormap(name: str):
+    """
+    Build (once) and register the named pressplot colormap.
+    """
+    if name in _colormaps:
+        return _colormaps[name]
+    if name not in COLORMAP_SPECS:
+        raise KeyError(f"Colormap '{name}' not found. Available colormaps: {list(COLORMAP_SPECS)}")
+
+    import matplotlib
+    from matplotlib.colors import LinearSegmentedColormap, ListedColormap
+
+    kind, colors = COLORMAP_SPECS[name]
+    if kind == "linear":
+        cmap = LinearSegmentedColormap.from_list(name, colors)
+    else:
+        cmap = ListedColormap(colors, name=name)
+
+    # Handle different Matplotlib versions safely
+    if hasattr(matplotlib, 'colormaps'):
+        try:
+            matplotlib.colormaps.register(cmap)
+        except ValueError:
+            pass  # Already registered
+    elif hasattr(matplotlib.cm, 'register_cmap'):
+        getattr(matplotlib.cm, 'register_cmap')(cmap=cmap)
+
+    _colormaps[name] = cmap
+    return cmap
+
+
+def get_colormap_lut(cmap, size=None, bytes=False):
+    """
+    Return a cached, contiguous RGBA lookup table for a colormap.
+
+    The table has size + 3 rows: the colormap sampled at size evenly spaced
+    points, then its over, bad and under colors (under last, so index -1
+    selects it), so values can be mapped with one np.take (see
+    pressplot.palettes.colorize).
+
+    Args:
+        cmap: A pressplot or matplotlib colormap name, or a Colormap.
+        size: Number of samples. Defaults to the colormap's own N, which
+              reproduces Colormap.__call__ exactly; larger values give a
+              finer gradient for linear colormaps.
+        bytes: Return uint8 rows instead of floats in [0, 1].
+
+    Returns:
+        np.ndarray: Read-only (size + 3, 4) table.
+    """
+    key = (cmap, size, bytes) if isinstance(cmap, str) else None
+    if key in _colormap_luts:
+        return _colormap_luts[key]
+
+    import matplotlib
+    import numpy as np
+
+    if isinstance(cmap, str):
+        cmap = get_colormap(cmap) if cmap in COLORMAP_SPECS else matplotlib.colormaps[cmap]
+    if size is not None and size != cmap.N:
+        # Colormap.resampled is matplotlib >= 3.6; 3.5 only has _resample
+        cmap = cmap.resampled(size) if hasattr(cmap, "resampled") else cmap._resample(size)
+    lut = np.ascontiguousarray(cmap(np.arange(cmap.N + 3), bytes=bytes))
+    lut[cmap.N:] = cmap([np.inf, np.nan, -np.inf], bytes=bytes)
+    lut.flags.writeable = False
+    if key is not None:
+        _colormap_luts[key] = lut
+    return lut
+
+
+def register_colormaps():
+    """
+    Make all pressplot colormaps available to matplotlib by name.
+    """
+    for name in COLORMAP_SPECS:
+        get_colormap(name)
+
+
+def __getattr__(name):
+    # Lazy module attributes: clean_modern_reds, clean_modern_reds_discrete, clean_modern_temp
+    if name in COLORMAP_SPECS:
+        return get_colormap(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 clean_modern_theme = Theme("clean_modern", CLEAN_MODERN_RC, CLEAN_MODERN_PALETTE)
+
+# Chart-specific variants of clean_modern that only swap the color cycle. Dict
+# palettes also hold text, background and border roles, so only their data
+# colors go into the cycle.
+CLEAN_MODERN_VARIANTS = {
+    "clean_modern_map": CLEAN_MODERN_MAP_PALETTE,
+    "clean_modern_manufacturing": CLEAN_MODERN_MANUFACTURING_PALETTE,
+    "clean_modern_diverging": [CLEAN_MODERN_DIVERGING_PALETTE[key] for key in ("blue_text", "red_text", "dot_color")],
+    "clean_modern_tiktok": [CLEAN_MODERN_TIKTOK_PALETTE[key] for key in ("red", "pink", "grey")],
+    "clean_modern_temperature": CLEAN_MODERN_TEMPERATURE_PALETTE,
+    "clean_modern_scatter": [CLEAN_MODERN_SCATTER_PALETTE[key] for key in ("dot_color", "line_color")],
+    "clean_modern_tariff": [CLEAN_MODERN_TARIFF_PALETTE[key] for key in ("2024_rate", "increase")],
+    "clean_modern_nobel": [CLEAN_MODERN_NOBEL_PALETTE[key] for key in ("line_color", "fill_color")],
+    "clean_modern_tech": [CLEAN_MODERN_TECH_PALETTE[key] for key in ("highlight_red", "light_red", "grey_dot")],
+}
+
+variant_themes = [Theme.derive(name, parent="clean_modern", palette=palette)
+                  for name, palette in CLEAN_MODERN_VARIANTS.items()]
@@ -0,0 +1,301 @@
+"""
+Per-thread themes, for rendering mixed-theme charts from a thread pool.
+
+Theme.apply() and theme_context() change the process-wide rcParams, so two
+threads rendering with different themes overwrite each other's styling.
+thread_theme() instead applies a theme for the duration of a block while
+holding a process-wide lock, so blocks of different threads never overlap:
+matplotlib code running in the block (artist creation, tick formatting) sees
+the theme, and the rcParams the theme sets are restored on exit.
+
+A ThemedFigure built in such a block has its theme baked into it when the
+block exits: its artists already carry their styling, and the few settings
+matplotlib would otherwise look up in the global rcParams while drawing
+(generic font families, the unicode minus, tick direction and padding, the
+savefig defaults) are resolved and stored on the figure. Drawing and saving
+it therefore takes no lock, and figures of different themes render in
+parallel:
+
+    def render(theme, data):
+        with pressplot.thread_theme(theme):
+            fig = pressplot.figure(figsize=(8, 5))
+            ax = fig.subplots()
+            ax.plot(data)
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png")
+        return buf.getvalue()
+
+    with ThreadPoolExecutor(8) as pool:
+        pngs = list(pool.map(render, ["clean_modern", "clean_modern_map"] * 50, datasets))
+
+Add artists to a ThemedFigure inside a thread_theme block or fig.themed(),
+never after it, and create figures with pressplot.figure() (or Figure
+directly), not pyplot, whose figure manager is shared between threads.
+Keep blocks to building: they run one at a time, so do not wait on other
+threads inside one. rcParams a theme does not set (path.simplify,
+text.hinting, backend options such as pdf.fonttype, ...) are still read
+from the process-wide values while drawing.
+"""
+import threading
+from contextlib import ContextDecorator
+from typing import Optional, Union
+
+import matplotlib as mpl
+from matplotlib.axis import Axis
+from matplotlib.figure import Figure
+from matplotlib.font_manager import font_family_aliases, fontManager
+from matplotlib.text import Text
+from matplotlib.ticker import Formatter
+
+from .core import Theme, ThemeContext
+from .registry import registry
+
+# Held while any thread_theme block is active; reentrant so blocks nest
+_rc_lock = threading.RLock()
+_local = threading.local()
+
+# rcParams Figure.savefig falls back to when the matching argument is omitted
+SAVEFIG_KEYS = ("savefig.dpi", "savefig.facecolor", "savefig.edgecolor", "savefig.transparent",
+                "savefig.bbox", "savefig.pad_inches")
+
+
+def _get_theme(theme: Union[str, Theme]) -> Theme:
+    return theme if isinstance(theme, Theme) else registry.get(theme)
+
+
+def current_theme() -> Optional[Theme]:
+    """
+    Return the innermost thread_theme active in the calling thread, if any.
+    """
+    stack = getattr(_local, "themes", None)
+    return stack[-1] if stack else None
+
+
+def _unicode_minus(s: str) -> str:
+    return s.replace("-", "\N{MINUS SIGN}")
+
+
+def _ascii_minus(s: str) -> str:
+    return s
+
+
+def _concrete_families(families, installed) -> list:
+    """
+    Replace generic font families (sans-serif, serif, ...) with the installed
+    fonts of the lists they currently stand for, as FontManager.findfont would.
+    """
+    resolved = []
+    for family in families:
+        generic = family.lower()
+        if generic in font_family_aliases:
+            generic = {"sans": "sans-serif", "sans serif": "sans-serif"}.get(generic, generic)
+            # Dropping missing fonts keeps findfont from warning about each one
+            resolved.extend(name for name in mpl.rcParams["font." + generic] if name.lower() in installed)
+        else:
+            resolved.append(family)
+    return resolved or [fontManager.defaultFamily["ttf"]]
+
+
+def _artists(artist):
+    """
+    *artist* and its descendants. Axes yield only the ticks they already
+    have, where get_children() would run their locators.
+    """
+    yield artist
+    if isinstance(artist, Axis):
+        children = [artist.label, artist.offsetText, *artist.majorTicks, *artist.minorTicks]
+    else:
+        children = artist.get_children()
+    for child in children:
+        yield from _artists(child)
+
+
+def _bake(fig: Figure):
+    """
+    Store on *fig* the current values of the rcParams matplotlib reads while
+    drawing and saving it.
+    """
+    fig._savefig_rc = {key: mpl.rcParams[key] for key in SAVEFIG_KEYS}
+    installed = {font.name.lower() for font in fontManager.ttflist}
+    for text in _artists(fig):
+        if not isinstance(text, Text):
+            continue
+        prop = text.get_fontproperties()
+        if prop.get_file() is None:
+            prop.set_family(_concrete_families(prop.get_family(), installed))
+
+    fix_minus = _unicode_minus if mpl.rcParams["axes.unicode_minus"] else _ascii_minus
+    for ax in fig.axes:
+        for axis in ax._axis_map.values():
+            for formatter in (axis.get_major_formatter(), axis.get_minor_formatter()):
+                if type(formatter).fix_minus is Formatter.fix_minus:
+                    formatter.fix_minus = fix_minus
+            # Ticks added while drawing copy their styling from the first
+            # one, but compute their label padding from rcParams, and so
+            # does the locator's label spacing. Stored as set_tick_params()
+            # would, without re-applying them to the existing ticks.
+            for tick_kw, ticks in ((axis._major_tick_kw, axis.majorTicks), (axis._minor_tick_kw, axis.minorTicks)):
+                tick = ticks[0]
+                tick_kw.update(size=tick._size, width=tick._width, pad=tick._base_pad, tickdir=tick._tickdir,
+                               labelsize=tick.label1.get_size())
+
+
+class ThreadThemeContext(ContextDecorator):
+    """
+    Apply a theme while holding the process-wide theme lock, as a context
+    manager or a decorator. Contexts nest, and one instance may be used from
+    several threads at once: all state lives in the thread.
+    """
+
+    def __init__(self, theme: Theme):
+        self.theme = theme
+
+    def __enter__(self) -> Theme:
+        self.theme.compile()
+        self.theme._prepare()
+
+        _rc_lock.acquire()
+        try:
+            if not hasattr(_local, "themes"):
+                _local.themes = []
+                _local.contexts = []
+                _local.figures = []
+            if _local.themes and _local.themes[-1] is self.theme:
+                # Already applied by the enclosing block of this thread
+                context = None
+                figures = _local.figures[-1]
+            else:
+                context = ThemeContext(self.theme)
+                context.__enter__()
+                figures = []
+        except BaseException:
+            _rc_lock.release()
+            raise
+        _local.themes.append(self.theme)
+        _local.contexts.append(context)
+        _local.figures.append(figures)
+        return self.theme
+
+    def __exit__(self, *exc_info):
+        _local.themes.pop()
+        context = _local.contexts.pop()
+        figures = _local.figures.pop()
+        try:
+            if context is not None:
+                try:
+                    for fig in figures:
+                        _bake(fig)
+                finally:
+                    context.__exit__(*exc_info)
+        finally:
+            _rc_lock.release()
+        return False
+
+
+def thread_theme(theme: Union[str, Theme]) -> ThreadThemeContext:
+    """
+    Apply a theme inside a with-block or a decorated function, without
+    other threads' thread_theme blocks running at the same time.
+
+    The rcParams the theme sets are restored on exit; other rcParams
+    changed inside the block are not.
+
+    Args:
+        theme (Union[str, Theme]): A Theme or the name of a registered theme.
+
+    Returns:
+        ThreadThemeContext: The context manager.
+    """
+    return ThreadThemeContext(_get_theme(theme))
+
+
+class ThemedFigure(Figure):
+    """
+    A Figure bound to a theme, which is baked into it when the thread_theme
+    block it was built in exits, so that it draws and saves the same from
+    any thread without holding the theme lock.
+    """
+
+    def __init__(self, *args, theme: Optional[Union[str, Theme]] = None, **kwargs):
+        """
+        Args:
+            *args: Passed to Figure.
+            theme (Optional[Union[str, Theme]]): The figure's theme. Defaults to
+                the thread_theme active in the calling thread.
+            **kwargs: Passed to Figure.
+
+        Raises:
+            ValueError: If no theme is given and no thread_theme is active.
+        """
+        theme = _get_theme(theme) if theme is not None else current_theme()
+        if theme is None:
+            raise ValueError("ThemedFigure needs a theme: pass theme= or create it inside thread_theme()")
+        self.theme = theme
+        with thread_theme(theme):
+            super().__init__(*args, **kwargs)
+            # Refreshed when the figure is baked; set now for saves inside the block
+            self._savefig_rc = {key: mpl.rcParams[key] for key in SAVEFIG_KEYS}
+            _local.figures[-1].append(self)
+
+    def themed(self) -> ThreadThemeContext:
+        """
+        Context manager applying the figure's theme (see thread_theme), for
+        adding artists to the figure outside the block it was created in.
+        The figure is baked again when it exits.
+        """
+        return _FigureThemeContext(self)
+
+    def savefig(self, *args, **kwargs):
+        # Fill in the theme's savefig defaults so the global ones are not read
+        rc = self._savefig_rc
+        for key in ("dpi", "transparent", "pad_inches"):
+            if kwargs.get(key) is None:
+                kwargs[key] = rc["savefig." + key]
+        if not kwargs["transparent"]:
+            for key in ("facecolor", "edgecolor"):
+                if kwargs.get(key) is None:
+                    kwargs[key] = rc["savefig." + key]
+        if kwargs.get("bbox_inches") is None:
+            # False also means the whole figure, but does not fall back to rcParams
+            kwargs["bbox_inches"] = rc["savefig.bbox"] or False
+        return super().savefig(*args, **kwargs)
+
+
+class _FigureThemeContext(ThreadThemeContext):
+    """
+    ThemedFigure.themed(): a thread_theme block that re-bakes its figure.
+    """
+
+    def __init__(self, fig: ThemedFigure):
+        super().__init__(fig.theme)
+        self.figure = fig
+
+    def __enter__(self) -> Theme:
+        theme = super().__enter__()
+        if self.figure not in _local.figures[-1]:
+            _local.figures[-1].append(self.figure)
+        return theme
+
+
+def savefig_rc(fig: Figure, key: str):
+    """
+    The savefig rcParam *key* that applies to *fig*: a ThemedFigure's baked
+    value, or the process-wide one for other figures.
+    """
+    rc = getattr(fig, "_savefig_rc", None)
+    return rc[key] if rc is not None else mpl.rcParams[key]
+
+
+def figure(theme: Optional[Union[str, Theme]] = None, **kwargs) -> ThemedFigure:
+    """
+    Create a ThemedFigure, detached from pyplot.
+
+    Args:
+        theme (Optional[Union[str, Theme]]): The figure's theme. Defaults to
+            the thread_theme active in the calling thread.
+        **kwargs: Passed to matplotlib.figure.Figure (figsize, dpi, ...).
+
+    Returns:
+        ThemedFigure: The new figure.
+    """
+    return ThemedFigure(theme=theme, **kwargs)
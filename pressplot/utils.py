@@ -1,35 +1,157 @@
+import dataclasses
+import json
+import logging
 import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 
+import matplotlib as mpl
+import matplotlib.colors as mcolors
+import matplotlib.dates as mdates
 import matplotlib.font_manager as fm
+import matplotlib.image as mimage
 import numpy as np
-from PIL import Image, ImageOps
+from matplotlib.patches import PathPatch
+from matplotlib.path import Path
+from matplotlib.ticker import Locator
+from matplotlib.transforms import Bbox
 
+logger = logging.getLogger(__name__)
+# Stay silent unless the application configures logging
+logging.getLogger('pressplot').addHandler(logging.NullHandler())
 
-def register_fonts():
+# Font families shipped in pressplot/fonts. Themes asking for one of these
+# trigger font registration when applied.
+BUNDLED_FONT_FAMILIES = ('Swift',)
+
+_FONT_FAMILY_KEYS = ('font.family', 'font.sans-serif', 'font.serif', 'font.monospace',
+                     'font.cursive', 'font.fantasy')
+_FONT_MANIFEST_VERSION = 1
+_fonts_registered = False
+_fonts_lock = threading.Lock()
+# Per-thread collect_export_timings state
+_export_state = threading.local()
+_monotonic_cache = weakref.WeakKeyDictionary()
+
+
+def get_cache_dir():
     """
-    Recursively loads all .ttf and .otf fonts from the plottheme/fonts directory.
+    Return the directory used for pressplot's on-disk caches.
+
+    Uses ``$PRESSPLOT_CACHE_DIR`` when set, otherwise a ``pressplot``
+    folder inside matplotlib's cache directory.
     """
+    cache_dir = os.environ.get('PRESSPLOT_CACHE_DIR') or os.path.join(mpl.get_cachedir(), 'pressplot')
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def _font_files(fonts_dir):
+    for root, dirs, files in os.walk(fonts_dir):
+        for file in sorted(files):
+            if file.lower().endswith(('.ttf', '.otf')):
+                yield os.path.join(root, file)
+
+
+def _load_font_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != _FONT_MANIFEST_VERSION or manifest.get('matplotlib') != mpl.__version__:
+        return {}
+    return manifest.get('fonts', {})
+
+
+def _write_font_manifest(path, fonts):
+    manifest = {'version': _FONT_MANIFEST_VERSION, 'matplotlib': mpl.__version__, 'fonts': fonts}
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug("Could not write font manifest %s: %s", path, e)
+
+
+def uses_bundled_fonts(rc_params):
+    """
+    Check whether a set of rcParams asks for one of the bundled font families.
+    """
+    for key in _FONT_FAMILY_KEYS:
+        value = rc_params.get(key)
+        if value is None:
+            continue
+        families = [value] if isinstance(value, str) else value
+        if any(family in BUNDLED_FONT_FAMILIES for family in families):
+            return True
+    return False
+
+
+def register_fonts(use_cache=True):
+    """
+    Recursively loads all .ttf and .otf fonts from the pressplot/fonts directory.
+
+    Registration happens once per process. Parsed font entries are stored in a
+    manifest keyed on file mtime and size, so later processes can skip the
+    FreeType parsing step.
+
+    Args:
+        use_cache: Read and update the on-disk font manifest.
+    """
+    if _fonts_registered:
+        return
+    with _fonts_lock:
+        if not _fonts_registered:
+            _register_fonts(use_cache)
+
+
+def _register_fonts(use_cache):
+    global _fonts_registered
+
     # Get the directory where this file is located
     current_dir = os.path.dirname(os.path.abspath(__file__))
     fonts_dir = os.path.join(current_dir, 'fonts')
 
     if not os.path.exists(fonts_dir):
         # If fonts directory doesn't exist (e.g. not installed correctly), skip
+        _fonts_registered = True
         return
 
-    fonts_found = []
-    for root, dirs, files in os.walk(fonts_dir):
-        for file in files:
-            if file.lower().endswith(('.ttf', '.otf')):
-                font_path = os.path.join(root, file)
-                try:
-                    fm.fontManager.addfont(font_path)
-                    fonts_found.append(file)
-                except Exception as e:
-                    print(f"Warning: Could not load font {file}: {e}")
+    manifest_path = os.path.join(get_cache_dir(), 'font_manifest.json') if use_cache else None
+    cached = _load_font_manifest(manifest_path) if manifest_path else {}
+    known = {entry.fname for entry in fm.fontManager.ttflist}
+
+    fonts = {}
+    parsed = 0
+    for font_path in _font_files(fonts_dir):
+        stat = os.stat(font_path)
+        record = cached.get(font_path)
+        if record is None or record['mtime'] != stat.st_mtime_ns or record['size'] != stat.st_size:
+            start = len(fm.fontManager.ttflist)
+            try:
+                fm.fontManager.addfont(font_path)
+            except Exception as e:
+                logger.warning("Could not load font %s: %s", font_path, e)
+                continue
+            entries = [dataclasses.asdict(entry) for entry in fm.fontManager.ttflist[start:]]
+            record = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'entries': entries}
+            parsed += 1
+        elif font_path not in known:
+            fm.fontManager.ttflist.extend(fm.FontEntry(**entry) for entry in record['entries'])
+        fonts[font_path] = record
+
+    if len(fonts) > parsed and hasattr(fm.fontManager, '_findfont_cached'):
+        fm.fontManager._findfont_cached.cache_clear()
+
+    if manifest_path and (parsed or fonts.keys() != cached.keys()):
+        _write_font_manifest(manifest_path, fonts)
 
-    if fonts_found:
-        print(f"Registered {len(fonts_found)} fonts from {fonts_dir}")
+    _fonts_registered = True
+    logger.info("Registered %d fonts from %s (%d parsed)", len(fonts), fonts_dir, parsed)
 
 
 def add_border(input_image, output_image, border_color='#F1F0EA', border_width=80):
@@ -42,6 +164,8 @@ def add_border(input_image, output_image, border_color='#F1F0EA', border_width=8
         border_color: Color of the border (hex or name). Default is beige.
         border_width: Width of the border in pixels.
     """
+    from PIL import Image, ImageOps
+
     try:
         img = Image.open(input_image)
         img_with_border = ImageOps.expand(img, border=border_width, fill=border_color)
@@ -51,29 +175,468 @@ def add_border(input_image, output_image, border_color='#F1F0EA', border_width=8
         print(f"Error adding border: {e}")
 
 
-def save_clean_modern_style(fig, filename, border_width=80, border_color='#F1F0EA', **kwargs):
+# Formats that are rasterized by the Agg canvas and encoded by Pillow.
+RASTER_FORMATS = ('png', 'jpg', 'jpeg', 'tif', 'tiff', 'webp')
+
+
+class _BufferSink:
+    """
+    Minimal file-like object that keeps the RGBA buffer written by the Agg
+    ``raw`` printer instead of serializing it.
+    """
+
+    def __init__(self):
+        self.buffer = None
+
+    def write(self, data):
+        self.buffer = data
+
+    def seek(self, offset, whence=0):
+        # Required by matplotlib to recognise the object as a file handle.
+        return 0
+
+
+def _resolve_format(filename, fmt=None):
+    """
+    Resolve the output format from an explicit format, the filename extension
+    or ``savefig.format``.
+    """
+    if fmt is None:
+        if isinstance(filename, (str, os.PathLike)):
+            ext = os.path.splitext(os.fspath(filename))[1]
+            fmt = ext[1:] if ext else None
+        if not fmt:
+            fmt = mpl.rcParams['savefig.format']
+    return fmt.lower()
+
+
+def _render_rgba(fig, **kwargs):
+    """
+    Render a figure on the Agg canvas and return its pixels.
+
+    Args:
+        fig: The matplotlib Figure object.
+        **kwargs: Additional arguments passed to fig.savefig (dpi, bbox_inches, ...).
+
+    Returns:
+        np.ndarray: A (height, width, 4) uint8 RGBA array.
+    """
+    sink = _BufferSink()
+    fig.savefig(sink, format='rgba', **kwargs)
+    return np.asarray(sink.buffer)
+
+
+def _pad_border(rgba, border_width, border_color):
+    """
+    Add a solid color border around an RGBA array.
+    """
+    if border_width <= 0:
+        return rgba
+    height, width, _ = rgba.shape
+    fill = np.array(mcolors.to_rgba(border_color), dtype=float) * 255
+    out = np.empty((height + 2 * border_width, width + 2 * border_width, 4), dtype=np.uint8)
+    out[...] = np.round(fill).astype(np.uint8)
+    out[border_width:border_width + height, border_width:border_width + width] = rgba
+    return out
+
+
+def _output_bbox_inches(fig, bbox_inches, pad_inches, bbox_extra_artists=None):
+    """
+    Resolve the region (in inches) that fig.savefig would write for the given
+    bbox_inches/pad_inches arguments.
+    """
+    if bbox_inches == 'tight':
+        if hasattr(fig, '_get_renderer'):
+            renderer = fig._get_renderer()
+        else:
+            renderer = fig.canvas.get_renderer()
+        if not isinstance(pad_inches, (int, float)):
+            pad_inches = 0.1
+        tight = fig.get_tightbbox(renderer, bbox_extra_artists=bbox_extra_artists)
+        return tight.padded(pad_inches)
+    if bbox_inches is None or bbox_inches == 'standard':
+        return fig.bbox_inches.frozen()
+    return Bbox(bbox_inches)
+
+
+def _border_patch(fig, inner, border, border_color):
+    """
+    Build a frame patch of width *border* (inches) around the *inner* bbox,
+    expressed in figure coordinates so it follows savefig's bbox adjustment.
+    """
+    width, height = fig.get_size_inches()
+    outer = inner.padded(border)
+
+    def ring(box, reverse=False):
+        corners = [(box.x0, box.y0), (box.x1, box.y0), (box.x1, box.y1), (box.x0, box.y1)]
+        if reverse:
+            corners = corners[::-1]
+        return [(x / width, y / height) for x, y in corners] + [(0, 0)]
+
+    codes = [Path.MOVETO, Path.LINETO, Path.LINETO, Path.LINETO, Path.CLOSEPOLY] * 2
+    path = Path(ring(outer) + ring(inner, reverse=True), codes)
+    return PathPatch(path, transform=fig.transFigure, facecolor=border_color,
+                     edgecolor='none', zorder=float('-inf'))
+
+
+def _save_vector_with_border(fig, filename, fmt, border, border_color, **kwargs):
+    """
+    Save a figure to a vector format, drawing the border as part of the figure.
+
+    The output bbox is grown by *border* inches and the extra area is filled
+    with a frame patch, so the file stays vector and never goes through Pillow.
+    """
+    if border <= 0:
+        fig.savefig(filename, format=fmt, **kwargs)
+        return
+
+    from .thread_themes import savefig_rc
+
+    inner = _output_bbox_inches(
+        fig,
+        kwargs.pop('bbox_inches', savefig_rc(fig, 'savefig.bbox')),
+        kwargs.pop('pad_inches', savefig_rc(fig, 'savefig.pad_inches')),
+        kwargs.get('bbox_extra_artists'),
+    )
+    frame = fig.add_artist(_border_patch(fig, inner, border, border_color))
+    try:
+        fig.savefig(filename, format=fmt, bbox_inches=inner.padded(border), **kwargs)
+    finally:
+        frame.remove()
+
+
+@contextmanager
+def collect_export_timings():
+    """
+    Accumulate the time spent in save_clean_modern_style while active.
+
+    Yields a dict with ``render`` and ``encode`` seconds and the number of
+    ``exports``. Vector exports render and encode in one pass and are counted
+    as render time. Only exports made by the calling thread are counted.
+    """
+    previous = getattr(_export_state, 'timings', None)
+    timings = _export_state.timings = {'render': 0.0, 'encode': 0.0, 'exports': 0}
+    try:
+        yield timings
+    finally:
+        _export_state.timings = previous
+
+
+def save_clean_modern_style(fig, filename, border_width=80, border_color='#F1F0EA', quantize=False,
+                            compress_level=None, zlib_strategy=None, lossless=False, **kwargs):
     """
     Saves a matplotlib figure with the Clean Modern style border.
-    
+
+    Raster formats (PNG, JPEG, TIFF, WebP) are rendered once to an in-memory
+    RGBA buffer, padded with the border and encoded a single time. Vector
+    formats (PDF, SVG, EPS, ...) get the border drawn into the figure itself,
+    so they stay vector. A ThemedFigure is saved with its theme's savefig
+    settings.
+
+    Clean Modern charts are a few flat colors plus their antialiased edges,
+    so PNG and WebP output can be reduced to an 8-bit palette (see
+    quantize_rgba), typically 2-3x smaller and faster to encode.
+
     Args:
         fig: The matplotlib Figure object.
-        filename: Output filename.
-        border_width: Width of the border in pixels.
+        filename: Output filename or a binary file-like object (e.g. BytesIO).
+        border_width: Width of the border in pixels at the output dpi.
         border_color: Color of the border.
+        quantize: PNG/WebP only. 'lossless' writes a palette image when the
+                  chart has at most 256 colors; True also reduces charts
+                  whose extra colors are antialiased edges. Images that do
+                  not qualify are written in full color.
+        compress_level: PNG zlib level, 0 (fastest) to 9 (smallest).
+        zlib_strategy: PNG zlib strategy: 'default', 'filtered', 'huffman',
+                       'rle' or 'fixed'.
+        lossless: WebP only. Encode lossless instead of lossy.
         **kwargs: Additional arguments passed to fig.savefig.
     """
-    # Save to a temporary file first if we are overwriting or just use the filename
-    # But add_border reads and writes. 
-    # If we write to filename, then read from filename, and write to filename, it works.
+    from .thread_themes import savefig_rc
+
+    fmt = _resolve_format(filename, kwargs.pop('format', None))
+    dpi = kwargs.get('dpi', savefig_rc(fig, 'savefig.dpi'))
+    if dpi == 'figure':
+        dpi = fig.dpi
+
+    start = time.perf_counter()
+    if fmt not in RASTER_FORMATS:
+        _save_vector_with_border(fig, filename, fmt, border_width / dpi, border_color, **kwargs)
+        _record_export(start, time.perf_counter())
+    else:
+        metadata = kwargs.pop('metadata', None)
+        pil_kwargs = kwargs.pop('pil_kwargs', None)
+        rgba = _render_rgba(fig, **kwargs)
+        _write_raster(rgba, filename, fmt, dpi, border_width, border_color, start,
+                      metadata=metadata, pil_kwargs=pil_kwargs, quantize=quantize,
+                      compress_level=compress_level, zlib_strategy=zlib_strategy, lossless=lossless)
+
+
+def _record_export(start, rendered, encoded=None):
+    """
+    Add one export's render and encode time to the active collect_export_timings.
+    """
+    timings = getattr(_export_state, 'timings', None)
+    if timings is not None:
+        if encoded is None:
+            encoded = rendered
+        timings['render'] += rendered - start
+        timings['encode'] += encoded - rendered
+        timings['exports'] += 1
+
+
+# Keyword arguments of save_clean_modern_style that tune the PNG/WebP encoder
+ENCODER_OPTIONS = ('quantize', 'compress_level', 'zlib_strategy', 'lossless')
+
+# zlib strategies by name, as accepted by Pillow's PNG ``compress_type``
+ZLIB_STRATEGIES = {'default': 0, 'filtered': 1, 'huffman': 2, 'rle': 3, 'fixed': 4}
+
+# Reduce to a palette only when the colors that do not fit cover at most this
+# fraction of the pixels: antialiased edges do, photos and smooth gradients don't
+_MAX_REMAPPED_FRACTION = 0.05
+
+
+def _nearest_colors(colors, palette):
+    """
+    Index of and squared distance to the closest palette entry of each color.
+    """
+    index = np.empty(len(colors), dtype=np.intp)
+    dist = np.empty(len(colors), dtype=np.float32)
+    palette = palette.astype(np.float32)
+    for i in range(0, len(colors), 4096):
+        d = ((colors[i:i + 4096, None, :].astype(np.float32) - palette[None]) ** 2).sum(axis=-1)
+        index[i:i + 4096] = d.argmin(axis=1)
+        dist[i:i + 4096] = d.min(axis=1)
+    return index, dist
+
+
+def _reduce_colors(colors, counts, ncolors):
+    """
+    Pick a palette for *colors* (sorted by decreasing pixel *counts*).
+
+    Half the entries go to the most frequent colors, which keeps the flat
+    fills and the commonest edge shades exact. The rest are added greedily
+    where they remove the most error (pixels x squared distance), so that
+    rare antialiasing shades map to a close color instead of the nearest
+    flat one.
+    """
+    base = ncolors // 2
+    palette = list(colors[:base])
+    rest, weights = colors[base:].astype(np.float32), counts[base:]
+    _, dist = _nearest_colors(rest, colors[:base])
+    for _ in range(ncolors - base):
+        pick = np.argmax(weights * dist)
+        palette.append(colors[base + pick])
+        dist = np.minimum(dist, ((rest - rest[pick]) ** 2).sum(axis=-1))
+    return np.array(palette)
+
+
+def quantize_rgba(rgba, lossless=False, ncolors=256):
+    """
+    Convert RGBA pixels to an 8-bit palette image, if they are flat enough.
+
+    With at most *ncolors* distinct colors the conversion is exact. Otherwise,
+    unless *lossless*, the palette is reduced (see _reduce_colors) when the
+    pixels outside the most frequent *ncolors* colors are few, as for
+    antialiased edges, and every pixel is mapped to its nearest palette color.
+
+    Args:
+        rgba: (height, width, 4) uint8 array.
+        lossless: Only convert when no pixel changes.
+        ncolors: Maximum palette size.
+
+    Returns:
+        Optional[PIL.Image.Image]: A 'P' mode image, or None when the pixels
+        do not qualify.
+    """
+    from PIL import Image
+
+    height, width, _ = rgba.shape
+    rgba = np.require(rgba, np.uint8, 'C')
+    image = Image.frombuffer('RGBA', (width, height), rgba, 'raw', 'RGBA', 0, 1)
+    limit = ncolors if lossless else width * height
+    found = image.getcolors(limit)
+    if found is None:
+        return None
+    counts = np.array([count for count, _ in found])
+    colors = np.array([color for _, color in found], dtype=np.uint8)
+    order = np.argsort(-counts, kind='stable')
+    counts, colors = counts[order], colors[order]
+    if len(colors) > ncolors and counts[ncolors:].sum() > _MAX_REMAPPED_FRACTION * width * height:
+        return None
+
+    opaque = bool((colors[:, 3] == 255).all())
+    channels = 3 if opaque else 4
+    if len(colors) <= ncolors:
+        palette, index = colors[:, :channels], np.arange(len(colors))
+    else:
+        palette = _reduce_colors(colors[:, :channels], counts, ncolors)
+        index, _ = _nearest_colors(colors[:, :channels], palette)
 
-    # We can just save directly to the target first
-    fig.savefig(filename, **kwargs)
+    # Look up each pixel's palette index by its packed (little-endian) color
+    packed = rgba.view(np.uint32).reshape(height, width)
+    keys = colors.astype(np.uint32) << np.array([0, 8, 16, 24], dtype=np.uint32)
+    keys = np.bitwise_or.reduce(keys, axis=1)
+    if opaque:
+        lut = np.zeros(1 << 24, dtype=np.uint8)
+        lut[keys & 0xFFFFFF] = index
+        pixels = lut[packed & 0xFFFFFF]
+    else:
+        order = np.argsort(keys)
+        pixels = index[order][np.searchsorted(keys[order], packed)].astype(np.uint8)
 
-    # Then add border and overwrite
-    add_border(filename, filename, border_color=border_color, border_width=border_width)
+    out = Image.frombuffer('L', (width, height), np.ascontiguousarray(pixels), 'raw', 'L', 0, 1).copy()
+    out.putpalette(np.ascontiguousarray(palette, dtype=np.uint8).tobytes(), 'RGB' if opaque else 'RGBA')
+    return out
 
 
-def label_line(ax, line, label, x=None, y=None, color=None, **kwargs):
+def _write_raster(rgba, filename, fmt, dpi, border_width, border_color, start, metadata=None, pil_kwargs=None,
+                  quantize=False, compress_level=None, zlib_strategy=None, lossless=False):
+    """
+    Pad rendered RGBA pixels with the border and encode them once.
+
+    *start* is when rendering began; the export is timed from there. The
+    encoder options are those of save_clean_modern_style.
+    """
+    rgba = _pad_border(rgba, border_width, border_color)
+    rendered = time.perf_counter()
+    pil_kwargs = dict(pil_kwargs or {})
+    if fmt == 'png':
+        if compress_level is not None:
+            pil_kwargs.setdefault('compress_level', compress_level)
+        if zlib_strategy is not None:
+            if zlib_strategy not in ZLIB_STRATEGIES:
+                raise ValueError(f"Unknown zlib strategy '{zlib_strategy}', "
+                                 f"expected one of {sorted(ZLIB_STRATEGIES)}")
+            pil_kwargs.setdefault('compress_type', ZLIB_STRATEGIES[zlib_strategy])
+    elif fmt == 'webp' and lossless:
+        pil_kwargs.setdefault('lossless', True)
+
+    image = None
+    if quantize and fmt in ('png', 'webp'):
+        image = quantize_rgba(rgba, lossless=quantize == 'lossless')
+    if image is None:
+        mimage.imsave(filename, rgba, format=fmt, dpi=dpi, metadata=metadata, pil_kwargs=pil_kwargs)
+    else:
+        _save_image(image, filename, fmt, dpi, metadata, pil_kwargs)
+    _record_export(start, rendered, time.perf_counter())
+
+
+def _save_image(image, filename, fmt, dpi, metadata, pil_kwargs):
+    """
+    Save a Pillow image the way matplotlib.image.imsave saves arrays.
+    """
+    from PIL import PngImagePlugin
+
+    if fmt == 'png' and 'pnginfo' not in pil_kwargs:
+        pnginfo = PngImagePlugin.PngInfo()
+        metadata = {'Software': f"Matplotlib version{mpl.__version__}, https://matplotlib.org/",
+                    **(metadata or {})}
+        for key, value in metadata.items():
+            if value is not None:
+                pnginfo.add_text(key, value)
+        pil_kwargs['pnginfo'] = pnginfo
+    elif fmt != 'png' and metadata is not None:
+        raise ValueError(f"metadata not supported for format {fmt!r}")
+    pil_kwargs.setdefault('format', fmt)
+    pil_kwargs.setdefault('dpi', (dpi, dpi))
+    image.save(os.fspath(filename) if isinstance(filename, os.PathLike) else filename, **pil_kwargs)
+
+
+def _monotonic_direction(line, xdata, key):
+    """
+    Return 1 if *xdata* is non-decreasing, -1 if non-increasing, 0 otherwise.
+
+    The result is cached per line for as long as the line keeps the same data
+    object *key* (set_xdata/set_data replace it).
+    """
+    cached = _monotonic_cache.get(line)
+    if cached is not None and cached[0] is key:
+        return cached[1]
+    if len(xdata) < 2 or np.all(xdata[1:] >= xdata[:-1]):
+        direction = 1
+    elif np.all(xdata[1:] <= xdata[:-1]):
+        direction = -1
+    else:
+        direction = 0
+    _monotonic_cache[line] = (key, direction)
+    return direction
+
+
+def _segment_index(line, xdata, target, key):
+    """
+    Index i of the segment [i, i + 1] of *line* that contains *target*.
+
+    Sorted data is searched with searchsorted; unsorted data uses the first
+    segment, in drawing order, that crosses target. Returns -1 or len(xdata)
+    when target lies outside the data.
+    """
+    direction = _monotonic_direction(line, xdata, key)
+    n = len(xdata)
+    if direction == 1:
+        return int(np.searchsorted(xdata, target)) - 1
+    if direction == -1:
+        return n - 1 - int(np.searchsorted(xdata[::-1], target))
+
+    above = xdata >= target
+    crossings = np.flatnonzero(above[1:] != above[:-1])
+    if len(crossings):
+        return int(crossings[0])
+    # No crossing: clamp to whichever end of the data is nearer
+    return n if above.all() == (xdata[-1] < xdata[0]) else -1
+
+
+def _label_anchor(line, x=None, frac=None):
+    """
+    Return the (x, y) data point a label for *line* is anchored to.
+
+    Reads the line's original data without converting or copying it, so the
+    cost does not grow with the series beyond one cached monotonicity check.
+
+    Args:
+        line: The line object.
+        x: Target x in data units (numbers or datetimes). If None and frac is
+           None, the last point of the line is used.
+        frac: Target x as a fraction of the visible x range (0 = left, 1 = right).
+    """
+    xorig = line.get_xdata(orig=True)
+    yorig = line.get_ydata(orig=True)
+    if x is None and frac is None:
+        return xorig[-1], yorig[-1]
+
+    xdata = np.asarray(xorig)
+    ydata = np.asarray(yorig)
+    converted = xdata.dtype.kind not in 'iufM'
+    if converted:
+        # Python datetimes, categories, ...: search the converted data instead
+        xdata = line.get_xdata(orig=False)
+
+    if frac is not None:
+        lo, hi = line.axes.get_xlim()
+        x = fx = lo + frac * (hi - lo)
+        target = np.datetime64(mdates.num2date(fx).replace(tzinfo=None)) if xdata.dtype.kind == 'M' else fx
+    elif xdata.dtype.kind == 'M':
+        target = np.datetime64(x)
+        fx = float(line.convert_xunits(target))
+    else:
+        target = fx = float(line.convert_xunits(x)) if converted else x
+
+    n = len(xdata)
+    i = _segment_index(line, xdata, target, xdata if converted else xorig)
+    if i < 0:
+        return x, ydata[0]
+    if i >= n - 1:
+        return x, ydata[-1]
+
+    # Interpolate on just the bracketing pair, in axis units
+    x0, x1 = np.asarray(line.convert_xunits(xdata[i:i + 2]), dtype=float)
+    y0, y1 = np.asarray(line.convert_yunits(ydata[i:i + 2]), dtype=float)
+    if x1 == x0:
+        return x, y0
+    return x, y0 + (fx - x0) / (x1 - x0) * (y1 - y0)
+
+
+def label_line(ax, line, label, x=None, y=None, color=None, frac=None, **kwargs):
     """
     Add a label to a line plot with matching color.
     
@@ -84,18 +647,13 @@ def label_line(ax, line, label, x=None, y=None, color=None, **kwargs):
         x: The x coordinate for the label. If None, uses the last x value of the line.
         y: The y coordinate for the label. If None, interpolates the y value at x.
         color: Text color. If None, uses the line's color.
+        frac: Place the label at this fraction of the visible x range instead of at x.
         **kwargs: Additional keyword arguments passed to ax.text.
     """
-    # Get line data
-    xdata = line.get_xdata()
-    ydata = line.get_ydata()
-
-    if x is None:
-        x = xdata[-1]
-        y = ydata[-1]
-    elif y is None:
-        # Simple interpolation (assuming sorted x)
-        y = np.interp(x, xdata, ydata)
+    if x is None or y is None or frac is not None:
+        x, anchor_y = _label_anchor(line, x, frac)
+        if y is None:
+            y = anchor_y
 
     if color is None:
         color = line.get_color()
@@ -103,18 +661,235 @@ def label_line(ax, line, label, x=None, y=None, color=None, **kwargs):
     ax.text(x, y, label, color=color, **kwargs)
 
 
-def draw_dot_grid(ax, x_ticks, y_ticks, color='#d4d4d4', size=10, zorder=0):
+def _isotonic(values):
+    """
+    Pool-adjacent-violators: the non-decreasing sequence closest (least
+    squares) to *values*.
+    """
+    blocks = []  # [mean, count]
+    for v in values:
+        blocks.append([v, 1])
+        while len(blocks) > 1 and blocks[-2][0] > blocks[-1][0]:
+            mean, count = blocks.pop()
+            prev = blocks[-1]
+            prev[0] = (prev[0] * prev[1] + mean * count) / (prev[1] + count)
+            prev[1] += count
+    return np.repeat([b[0] for b in blocks], [b[1] for b in blocks])
+
+
+def pack_intervals(targets, heights, pad=0.0, lower=None, upper=None):
+    """
+    Place 1D intervals as close as possible to their targets without overlap.
+
+    Solves min sum (y_i - t_i)^2 subject to consecutive centers (in target
+    order) being at least (h_i + h_j) / 2 + pad apart, optionally inside
+    [lower, upper].
+
+    Args:
+        targets: Desired interval centers.
+        heights: Interval sizes, same units as targets.
+        pad: Extra gap between neighbouring intervals.
+        lower: Lowest allowed interval edge, or None.
+        upper: Highest allowed interval edge, or None.
+
+    Returns:
+        np.ndarray: Packed centers, in the order of *targets*.
+    """
+    targets = np.asarray(targets, dtype=float)
+    heights = np.broadcast_to(np.asarray(heights, dtype=float), targets.shape)
+    if targets.size == 0:
+        return targets.copy()
+
+    order = np.argsort(targets, kind='stable')
+    t, h = targets[order], heights[order]
+    # Cumulative minimum distance of each center from the first one
+    gaps = np.concatenate([[0.0], np.cumsum((h[:-1] + h[1:]) / 2 + pad)])
+    z = _isotonic(t - gaps)
+    # The shifted solution is monotone, so bounds only bind at the ends
+    if upper is not None:
+        z = np.minimum(z, upper - h[-1] / 2 - gaps[-1])
+    if lower is not None:
+        z = np.maximum(z, lower + h[0] / 2)
+
+    packed = np.empty_like(targets)
+    packed[order] = z + gaps
+    return packed
+
+
+def label_lines(ax, lines, labels=None, x=None, pad=2.0, color=None, frac=None, **kwargs):
+    """
+    Label several lines at once, moving labels vertically so they do not overlap.
+
+    Each label starts where label_line would put it (the last point, or the
+    line's value at x); labels are then packed along the y axis using their
+    measured text heights. Call it after the axes limits are final.
+
+    Args:
+        ax: The axes object.
+        lines: Line objects (results of ax.plot).
+        labels: Label texts. If None, uses each line's label.
+        x: Common x coordinate for the labels. If None, uses each line's last x value.
+        pad: Minimum gap between labels, in points.
+        color: Text color. If None, each label uses its line's color.
+        frac: Common x as a fraction of the visible x range, instead of x.
+        **kwargs: Additional keyword arguments passed to ax.text.
+
+    Returns:
+        list: The created Text objects, in the order of *lines*.
+    """
+    lines = list(lines)
+    if labels is None:
+        labels = [line.get_label() for line in lines]
+    kwargs.setdefault('va', 'center')
+
+    texts = []
+    for line, label in zip(lines, labels):
+        lx, ly = _label_anchor(line, x, frac)
+        texts.append(ax.text(lx, ly, label, color=line.get_color() if color is None else color, **kwargs))
+    if len(texts) < 2:
+        return texts
+
+    fig = ax.figure
+    renderer = fig._get_renderer() if hasattr(fig, '_get_renderer') else fig.canvas.get_renderer()
+
+    # Measure one label per distinct font and line count; heights only vary with those.
+    measured = {}
+    heights = np.empty(len(texts))
+    for i, text in enumerate(texts):
+        key = (text.get_fontproperties(), text.get_text().count('\n'), text.get_rotation())
+        if key not in measured:
+            measured[key] = text.get_window_extent(renderer).height
+        heights[i] = measured[key]
+
+    # Settle pending autoscaling so transData reflects the final limits
+    ax.get_xlim()
+    ax.get_ylim()
+    anchors = np.array([text.get_unitless_position() for text in texts], dtype=float)
+    display = ax.transData.transform(anchors)
+    flipped = ax.yaxis_inverted()
+    targets = -display[:, 1] if flipped else display[:, 1]
+    bottom, top = (-ax.bbox.y1, -ax.bbox.y0) if flipped else (ax.bbox.y0, ax.bbox.y1)
+
+    packed = pack_intervals(targets, heights, pad=renderer.points_to_pixels(pad), lower=bottom, upper=top)
+    display[:, 1] = -packed if flipped else packed
+    positions = ax.transData.inverted().transform(display)
+    for text, (_, ty) in zip(texts, positions):
+        text.set_y(ty)
+    return texts
+
+
+def draw_dot_grid(ax, x_ticks=None, y_ticks=None, color='#d4d4d4', size=10, zorder=0, raster_threshold=None):
     """
     Draws a grid of dots instead of lines.
-    
+
+    The dots are generated at draw time for the visible part of the grid only,
+    so they follow zooming and panning.
+
     Args:
         ax: The axes object.
-        x_ticks: List or array of X coordinates for the dots.
-        y_ticks: List or array of Y coordinates for the dots.
+        x_ticks: List or array of X coordinates for the dots, a Locator, or None
+                 to follow the axis' major ticks.
+        y_ticks: List or array of Y coordinates for the dots, a Locator, or None
+                 to follow the axis' major ticks.
         color: Color of the dots.
         size: Size of the dots.
         zorder: Z-order of the grid (default 0, behind plots).
+        raster_threshold: If set, draw the grid as one cached raster tile when
+                          more than this many dots are visible.
+
+    Returns:
+        DotGrid: The artist added to the axes.
+    """
+    from .artists import DotGrid
+
+    grid = DotGrid(x_ticks, y_ticks, color=color, size=size, raster_threshold=raster_threshold, zorder=zorder)
+    ax.add_artist(grid)
+
+    # Explicit positions take part in autoscaling, like the scatter they replace
+    corners = [np.asarray(t, dtype=float) for t in (x_ticks, y_ticks)
+               if t is not None and not isinstance(t, Locator)]
+    if len(corners) == 2 and all(c.size for c in corners):
+        ax.update_datalim([(corners[0].min(), corners[1].min()), (corners[0].max(), corners[1].max())])
+        ax.autoscale_view()
+    return grid
+
+
+def plot_line(ax, x, y, **kwargs):
+    """
+    Plot a long series as a line that is downsampled to the output resolution at draw time.
+
+    Behaves like ax.plot(x, y) for a single line, but only the first, lowest,
+    highest and last point of each pixel column are drawn, so millions of
+    points render as fast as a few thousand without changing the image.
+
+    Args:
+        ax: The axes object.
+        x: X values, sorted in either direction (numbers or datetimes).
+        y: Y values.
+        **kwargs: Additional Line2D properties (color, linewidth, label, ...).
+
+    Returns:
+        DecimatedLine: The line added to the axes.
     """
-    # Create a meshgrid of points
-    xx, yy = np.meshgrid(x_ticks, y_ticks)
-    ax.scatter(xx, yy, color=color, s=size, zorder=zorder, marker='o', edgecolors='none')
+    from .artists import DecimatedLine
+
+    ax.xaxis.update_units(x)
+    ax.yaxis.update_units(y)
+    if 'color' not in kwargs and 'c' not in kwargs:
+        # Take the next color of the axes' cycle, as ax.plot would
+        placeholder, = ax.plot([], [])
+        kwargs['color'] = placeholder.get_color()
+        placeholder.remove()
+
+    line = DecimatedLine(x, y, **kwargs)
+    line.axes = ax
+    line.decimate()
+    ax.add_line(line)
+    ax.autoscale_view()
+    return line
+
+
+def density_scatter(ax, x, y, c=None, reduce=None, cmap='clean_modern_reds', norm=None, vmin=None, vmax=None,
+                    bin_size=1, zorder=1, **kwargs):
+    """
+    Draws a scatter of many points as one aggregated image.
+
+    Points are binned onto the output pixel grid at draw time and the per-bin
+    count (or sum/mean of c) is colored with a colormap, so millions of points
+    render and export (including to PDF/SVG) at the cost of one image.
+
+    Args:
+        ax: The axes object.
+        x: X coordinates of the points.
+        y: Y coordinates of the points.
+        c: Optional per-point values to aggregate instead of counting points.
+        reduce: 'count', 'sum' or 'mean'. Defaults to 'mean' when c is given,
+                'count' otherwise.
+        cmap: Colormap or colormap name (default 'clean_modern_reds').
+        norm: Normalize instance. Defaults to log for counts, linear otherwise.
+        vmin: Lower color limit.
+        vmax: Upper color limit.
+        bin_size: Bin size in output pixels.
+        zorder: Z-order of the image.
+        **kwargs: Additional Artist properties (alpha, label, ...).
+
+    Returns:
+        DensityScatter: The artist added to the axes; usable with fig.colorbar.
+    """
+    from .artists import DensityScatter
+
+    if reduce is None:
+        reduce = 'count' if c is None else 'mean'
+    ax.xaxis.update_units(x)
+    ax.yaxis.update_units(y)
+    artist = DensityScatter(x, y, c, reduce=reduce, cmap=cmap, norm=norm, vmin=vmin, vmax=vmax,
+                            bin_size=bin_size, zorder=zorder, **kwargs)
+    ax.add_artist(artist)
+
+    # The points take part in autoscaling, like the scatter they replace
+    xs = np.asarray(artist.convert_xunits(artist.x), dtype=float)
+    ys = np.asarray(artist.convert_yunits(artist.y), dtype=float)
+    if xs.size:
+        ax.update_datalim([(np.nanmin(xs), np.nanmin(ys)), (np.nanmax(xs), np.nanmax(ys))])
+        ax.autoscale_view()
+    return artist
@@ -0,0 +1,34 @@
+"""
+Tests for the content-addressed render cache.
+"""
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+
+from pressplot import Theme  # noqa: E402
+from pressplot.cache import RenderCache  # noqa: E402
+from pressplot.registry import registry  # noqa: E402
+
+
+def _draw(values):
+    fig, ax = plt.subplots(figsize=(2, 2))
+    ax.plot(values)
+    return fig
+
+
+def test_parent_theme_change_misses(tmp_path):
+    parent = Theme("test_cache_parent", {"axes.facecolor": "#FFFFFF"}, ["#E62A24"])
+    registry.register(parent)
+    child = Theme.derive("test_cache_child", parent="test_cache_parent", overrides={"axes.grid": True})
+    registry.register(child)
+    cache = RenderCache(str(tmp_path / "cache"))
+    output = str(tmp_path / "chart.png")
+
+    assert cache.render(_draw, output, [1, 3, 2], theme="test_cache_child") is False
+    assert cache.render(_draw, output, [1, 3, 2], theme="test_cache_child") is True
+
+    registry.register(Theme("test_cache_parent", {"axes.facecolor": "#1B1919"}, ["#E62A24"]))
+    assert cache.render(_draw, output, [1, 3, 2], theme="test_cache_child") is False
+    assert cache.stats()["hits"] == 1
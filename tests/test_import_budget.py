@@ -0,0 +1,14 @@
+"""
+Run benchmarks/check_import_budget.py as part of the test suite.
+"""
+import os
+import subprocess
+import sys
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks",
+                      "check_import_budget.py")
+
+
+def test_import_budget():
+    result = subprocess.run([sys.executable, SCRIPT], capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,20 @@
+"""
+Tests for declarative chart specs.
+"""
+from pressplot import Theme
+from pressplot.registry import registry
+from pressplot.specs import spec_key
+
+
+def _spec(theme):
+    return {"type": "line", "theme": theme, "data": {"x": [1, 2, 3], "series": [{"name": "a", "values": [1, 3, 2]}]}}
+
+
+def test_spec_key_follows_parent_theme():
+    registry.register(Theme("test_spec_parent", {"axes.facecolor": "#FFFFFF"}, ["#E62A24"]))
+    registry.register(Theme.derive("test_spec_child", parent="test_spec_parent", overrides={"axes.grid": True}))
+    key = spec_key(_spec("test_spec_child"))
+    assert spec_key(_spec("test_spec_child")) == key
+
+    registry.register(Theme("test_spec_parent", {"axes.facecolor": "#1B1919"}, ["#E62A24"]))
+    assert spec_key(_spec("test_spec_child")) != key
@@ -0,0 +1,56 @@
+"""
+Tests for per-thread themes.
+"""
+import io
+import threading
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+
+import pressplot  # noqa: E402
+from pressplot import Theme  # noqa: E402
+from pressplot.thread_themes import _rc_lock  # noqa: E402
+
+# Differs from clean_modern in every rcParam matplotlib reads while drawing
+OTHER = Theme("test_thread_themes_other", {
+    "axes.unicode_minus": True, "font.family": "monospace", "font.sans-serif": ["DejaVu Serif"],
+    "font.weight": "bold", "grid.color": "#00FF00", "lines.solid_capstyle": "round",
+    "savefig.dpi": 33, "savefig.facecolor": "#00FFFF", "xtick.direction": "inout",
+    "xtick.labelsize": 25, "xtick.major.pad": 20, "ytick.labelsize": 25,
+})
+
+
+def _build():
+    with pressplot.thread_theme("clean_modern"):
+        fig = pressplot.figure(figsize=(4, 3), dpi=72)
+        ax = fig.subplots()
+        x = np.linspace(-50, 50, 100)
+        ax.plot(x, -x ** 2)
+        ax.set_title("Title")
+    return fig
+
+
+def _png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    return buf.getvalue()
+
+
+def test_saving_ignores_global_rcparams():
+    expected = _png(_build())
+    fig = _build()
+    with pressplot.theme_context(OTHER):
+        assert _png(fig) == expected
+
+
+def test_saving_does_not_take_the_lock():
+    fig = _build()
+    pngs = []
+    with _rc_lock:
+        thread = threading.Thread(target=lambda: pngs.append(_png(fig)), daemon=True)
+        thread.start()
+        thread.join(30)
+    assert pngs